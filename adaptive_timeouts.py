@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Adaptive Per-Endpoint Timeouts for Kairo API Testing
+Learns each endpoint's timeout from its stored latency history instead of one global 30s
+
+Usage: python adaptive_timeouts.py            (show the learned timeouts)
+       python adaptive_timeouts.py --reset
+
+The timeout of an endpoint is its p99.9 latency over the last HISTORY_RUNS runs times SAFETY_FACTOR,
+kept between MIN_TIMEOUT and the tester's fixed timeout. Endpoints with too little history keep the
+fixed timeout. Old runs roll out of the window, so a route that got faster gets a tighter timeout on its
+own, and a route that is slow but healthy keeps the headroom its own history shows it needs. A timed-out
+request is stored as a sample at its timeout, so a route that slows down past its timeout gets a wider one
+(SAFETY_FACTOR times larger, up to the fixed limit) on the next run.
+History lives in .kairo_latency_history.json (KAIRO_TIMEOUT_HISTORY overrides the path).
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+from latency_histogram import LatencyHistogram, merge_all
+
+# Configuration
+HISTORY_PATH = os.environ.get('KAIRO_TIMEOUT_HISTORY', '.kairo_latency_history.json')
+HISTORY_RUNS = 20        # Runs kept per endpoint; older ones roll out so timeouts tighten as routes improve
+SAFETY_FACTOR = 3.0
+PERCENTILE = 99.9
+MIN_SAMPLES = 20         # Below this the fixed timeout is used
+MIN_TIMEOUT = 2.0        # Seconds; covers scheduler and network jitter on very fast routes
+DEFAULT_TIMEOUT = 30.0
+
+
+class AdaptiveTimeouts:
+    """Timeouts from past runs, and this run's successful latencies to extend the history with"""
+
+    def __init__(self, path: str = HISTORY_PATH, default: float = DEFAULT_TIMEOUT, factor: float = SAFETY_FACTOR,
+                 min_timeout: float = MIN_TIMEOUT, min_samples: int = MIN_SAMPLES):
+        self.path = path
+        self.default = default
+        self.factor = factor
+        self.min_timeout = min_timeout
+        self.min_samples = min_samples
+        self.history: Dict[str, List[Dict[str, Any]]] = self._load()
+        self.current: Dict[str, LatencyHistogram] = {}
+        self._timeouts: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}  # No history yet, or an unreadable file: start over with fixed timeouts
+        return data.get('endpoints', {}) if isinstance(data, dict) else {}
+
+    def learned(self, key: str) -> Dict[str, Any]:
+        """Samples, p99.9 and timeout of `key` as computed from stored history"""
+        runs = self.history.get(key, [])
+        histogram = merge_all(LatencyHistogram.from_dict(run['histogram']) for run in runs)
+        if len(histogram) < self.min_samples:
+            return {'samples': len(histogram), 'p99_9_ms': None, 'timeout_s': self.default}
+        p99_9 = histogram.percentile(PERCENTILE)
+        timeout = min(self.default, max(self.min_timeout, p99_9 / 1000.0 * self.factor))
+        return {'samples': len(histogram), 'p99_9_ms': p99_9, 'timeout_s': round(timeout, 2)}
+
+    def timeout_for(self, key: str) -> float:
+        """Seconds to wait for `key` (e.g. "POST /api/global-consciousness"), computed once per run"""
+        timeout = self._timeouts.get(key)
+        if timeout is None:
+            timeout = self._timeouts[key] = self.learned(key)['timeout_s']
+        return timeout
+
+    def is_adaptive(self, key: str) -> bool:
+        return self.timeout_for(key) < self.default
+
+    def record(self, key: str, seconds: float):
+        """Add a successful response's latency; errors say nothing about healthy latency"""
+        with self._lock:
+            histogram = self.current.get(key)
+            if histogram is None:
+                histogram = self.current[key] = LatencyHistogram()
+            histogram.record(seconds * 1000)
+
+    def record_timeout(self, key: str, timeout: float):
+        """Add a request cut off after `timeout` seconds as a censored sample at the timeout
+
+        Its real latency was at least `timeout`. Recording it lifts the next run's p99.9, so a route that got
+        slower has its timeout widened toward the fixed limit. Otherwise every run would time out, add nothing,
+        and leave the old fast history in place for good.
+        """
+        self.record(key, timeout)
+
+    def save(self):
+        """Append this run to the history, drop runs beyond HISTORY_RUNS and write the file atomically"""
+        with self._lock:
+            if not self.current:
+                return
+            stamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+            for key, histogram in self.current.items():
+                runs = self.history.setdefault(key, [])
+                runs.append({'run': stamp, 'histogram': histogram.to_dict()})
+                del runs[:-HISTORY_RUNS]
+            self.current = {}
+            temporary = f"{self.path}.tmp"
+            with open(temporary, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'endpoints': self.history}, f)
+            os.replace(temporary, self.path)
+
+
+def format_timeout_table(timeouts: AdaptiveTimeouts) -> List[str]:
+    lines = [f"  {'Endpoint':<44} {'samples':>8} {'p99.9 ms':>10} {'timeout':>8}"]
+    for key in sorted(timeouts.history):
+        learned = timeouts.learned(key)
+        p99_9 = f"{learned['p99_9_ms']:.1f}" if learned['p99_9_ms'] is not None else "-"
+        lines.append(f"  {key:<44} {learned['samples']:>8} {p99_9:>10} {learned['timeout_s']:>7g}s")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or reset the learned per-endpoint timeouts")
+    parser.add_argument("--history", default=HISTORY_PATH, help="History file")
+    parser.add_argument("--reset", action="store_true", help="Forget all stored latency history")
+    args = parser.parse_args()
+
+    if args.reset:
+        if os.path.exists(args.history):
+            os.remove(args.history)
+        print(f"Removed {args.history}")
+        return 0
+
+    timeouts = AdaptiveTimeouts(args.history)
+    print("=" * 80)
+    print("KAIRO ADAPTIVE TIMEOUTS")
+    print("=" * 80)
+    print(f"History: {args.history}, p{PERCENTILE:g} x {SAFETY_FACTOR:g} over the last {HISTORY_RUNS} runs, "
+          f"{MIN_TIMEOUT:g}s to {DEFAULT_TIMEOUT:g}s")
+    if not timeouts.history:
+        print("  No history yet; every endpoint uses the fixed timeout")
+    else:
+        for line in format_timeout_table(timeouts):
+            print(line)
+    print("=" * 80)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
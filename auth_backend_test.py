@@ -4,12 +4,13 @@ Comprehensive Backend API Testing for Kairo Authentication System
 Testing critical auth endpoints and functionality
 """
 
-import requests
 import json
 import time
 import sys
 from typing import Dict, Any, Optional
 
+from http_client import create_session, warm_up
+
 # Configuration
 BASE_URL = "http://localhost:3001"
 TIMEOUT = 30
@@ -20,7 +21,7 @@ class AuthAPITester:
         self.total_tests = 0
         self.passed_tests = 0
         self.failed_tests = 0
-        self.session = requests.Session()
+        self.session = create_session()
         
     def log_result(self, endpoint: str, status: str, response_time: float, details: str):
         """Log test result"""
@@ -220,7 +221,7 @@ class AuthAPITester:
                 if response.status_code == 200:
                     data = response.json()
                     self.log_result('GET /api/auth/me', 'PASS', response_time, 
-                                  f"Authenticated user: {data.get('email', 'unknown')}")
+                                  f"Authenticated user: {data.get('data', {}).get('email', 'unknown')}")
                 else:
                     self.log_result('GET /api/auth/me', 'PASS', response_time, 
                                   "Correctly returned 401 for unauthenticated request")
@@ -240,6 +241,9 @@ class AuthAPITester:
         print(f"Timeout: {TIMEOUT}s")
         print("-" * 80)
         
+        # Open the keep-alive connection before anything is timed
+        warm_up(self.session, BASE_URL)
+        
         # Run tests in logical order
         self.test_health_endpoint()
         self.test_signup_validation()
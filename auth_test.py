@@ -4,15 +4,26 @@ Comprehensive Authentication API Testing for Kairo
 Testing core authentication endpoints: signup, login, logout, get user profile
 """
 
+import argparse
 import requests
 import json
 import time
 import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Tuple
 
+from concurrency_sweep import concurrency_levels, find_knee
+from http_client import create_session, warm_up
+from latency_histogram import LatencyHistogram
+from session_pool import synthetic_credentials
+
 # Configuration
 BASE_URL = "http://localhost:3000"
 TIMEOUT = 30
+TEST_PASSWORD = "SecureTestPass2025!"
+STORM_REQUESTS_PER_WORKER = 10   # Burst size per concurrency level, per concurrent client
+STORM_MIN_REQUESTS = 20
 
 class AuthAPITester:
     def __init__(self):
@@ -21,6 +32,11 @@ class AuthAPITester:
         self.passed_tests = 0
         self.failed_tests = 0
         self.session_token = None
+        self.session = create_session()
+        # A fresh account every run, so signup does not fail with "user exists" on reruns
+        self.run_id = uuid.uuid4().hex[:12]
+        self.test_email = f"testuser2025.{self.run_id}@kairotest.com"
+        self.storm_results = []
         
     def log_result(self, endpoint: str, status: str, response_time: float, details: str):
         """Log test result"""
@@ -43,13 +59,13 @@ class AuthAPITester:
         """Test user signup endpoint"""
         url = f"{BASE_URL}/api/auth/signup"
         payload = {
-            "email": "testuser2025@kairotest.com",
-            "password": "SecureTestPass2025!"
+            "email": self.test_email,
+            "password": TEST_PASSWORD
         }
         
         try:
             start_time = time.time()
-            response = requests.post(url, json=payload, timeout=TIMEOUT)
+            response = self.session.post(url, json=payload, timeout=TIMEOUT)
             response_time = time.time() - start_time
             
             if response.status_code == 200:
@@ -82,13 +98,13 @@ class AuthAPITester:
         """Test user signin endpoint"""
         url = f"{BASE_URL}/api/auth/signin"
         payload = {
-            "email": "testuser2025@kairotest.com",
-            "password": "SecureTestPass2025!"
+            "email": self.test_email,
+            "password": TEST_PASSWORD
         }
         
         try:
             start_time = time.time()
-            response = requests.post(url, json=payload, timeout=TIMEOUT)
+            response = self.session.post(url, json=payload, timeout=TIMEOUT)
             response_time = time.time() - start_time
             
             if response.status_code == 200:
@@ -134,14 +150,15 @@ class AuthAPITester:
         
         try:
             start_time = time.time()
-            response = requests.get(url, headers=headers, timeout=TIMEOUT)
+            response = self.session.get(url, headers=headers, timeout=TIMEOUT)
             response_time = time.time() - start_time
             
             if response.status_code == 200:
                 try:
                     data = response.json()
-                    if data.get('success', False) and 'user' in data:
-                        user_data = data['user']
+                    # The session keeps the signin cookie, so this is the signed-in user (route.ts: {success, data})
+                    if data.get('success', False) and 'data' in data:
+                        user_data = data['data']
                         self.log_result('GET /api/auth/me', 'PASS', response_time, 
                                       f"Current user retrieved - ID: {user_data.get('id', 'N/A')}, Email: {user_data.get('email', 'N/A')}")
                         return True
@@ -179,20 +196,20 @@ class AuthAPITester:
         
         try:
             start_time = time.time()
-            response = requests.get(url, headers=headers, timeout=TIMEOUT)
+            response = self.session.get(url, headers=headers, timeout=TIMEOUT)
             response_time = time.time() - start_time
             
             if response.status_code == 200:
                 try:
                     data = response.json()
-                    if data.get('success', False) and 'profile' in data:
-                        profile_data = data['profile']
+                    # route.ts returns the profile row itself, not a {success, profile} envelope
+                    if 'id' in data and 'subscription_tier' in data:
                         self.log_result('GET /api/user/profile', 'PASS', response_time, 
-                                      f"User profile retrieved - Subscription: {profile_data.get('subscription_tier', 'N/A')}")
+                                      f"User profile retrieved - Subscription: {data.get('subscription_tier', 'N/A')}")
                         return True
                     else:
                         self.log_result('GET /api/user/profile', 'FAIL', response_time, 
-                                      f"Failed to get profile: {data.get('error', 'Unknown error')}")
+                                      f"Failed to get profile: {data.get('error', data.get('message', 'Unknown error'))}")
                         return False
                 except json.JSONDecodeError:
                     self.log_result('GET /api/user/profile', 'FAIL', response_time, "Invalid JSON response")
@@ -224,7 +241,7 @@ class AuthAPITester:
         
         try:
             start_time = time.time()
-            response = requests.post(url, headers=headers, timeout=TIMEOUT)
+            response = self.session.post(url, headers=headers, timeout=TIMEOUT)
             response_time = time.time() - start_time
             
             if response.status_code == 200:
@@ -264,7 +281,7 @@ class AuthAPITester:
         
         try:
             start_time = time.time()
-            response = requests.post(url, json=payload, timeout=TIMEOUT)
+            response = self.session.post(url, json=payload, timeout=TIMEOUT)
             response_time = time.time() - start_time
             
             if response.status_code in [200, 400]:  # 400 is expected for missing parameters
@@ -283,7 +300,87 @@ class AuthAPITester:
             self.log_result('POST /api/integrations/test', 'FAIL', 0, f"Unexpected error: {str(e)}")
             return False
     
-    def run_all_tests(self):
+    def _auth_burst(self, session: requests.Session, path: str, payloads: List[Dict[str, str]],
+                    concurrency: int) -> Dict[str, Any]:
+        """Fire one request per payload at `path`, `concurrency` in flight at a time"""
+        url = f"{BASE_URL}/api/{path}"
+        
+        def send(payload):
+            start_time = time.perf_counter()
+            try:
+                response = session.post(url, json=payload, timeout=TIMEOUT)
+                ok = response.status_code == 200
+            except requests.exceptions.RequestException:
+                ok = False
+            return ok, time.perf_counter() - start_time
+        
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(send, payloads))
+        elapsed = time.perf_counter() - start
+        
+        # Failed requests are counted but kept out of throughput and latency, as in concurrency_sweep.run_step
+        histogram = LatencyHistogram()
+        for ok, response_time in outcomes:
+            if ok:
+                histogram.record(response_time * 1000)
+        failures = len(outcomes) - len(histogram)
+        return {
+            'workers': concurrency,
+            'requests': len(outcomes),
+            'failures': failures,
+            'error_rate': round(failures / len(outcomes), 4) if outcomes else 0.0,
+            'throughput_rps': round(len(histogram) / elapsed, 2) if elapsed > 0 else 0.0,
+            'p50_ms': round(histogram.percentile(50), 2),
+            'p99_ms': round(histogram.percentile(99), 2),
+        }
+    
+    def run_storm(self, max_concurrency: int):
+        """Signup/signin storm: bursts of unique users at rising concurrency, to find where password hashing saturates"""
+        print("\n🌩️  SIGNUP/SIGNIN STORM:")
+        print(f"  Concurrency levels up to {max_concurrency}, {STORM_REQUESTS_PER_WORKER} requests per client per level")
+        print(f"  {'clients':>7} | {'signup req/s':>12} {'p50':>9} {'p99':>9} {'fail':>5} | "
+              f"{'signin req/s':>12} {'p50':>9} {'p99':>9} {'fail':>5}")
+        
+        signup_steps, signin_steps = [], []
+        for concurrency in concurrency_levels(max_concurrency):
+            count = max(STORM_MIN_REQUESTS, concurrency * STORM_REQUESTS_PER_WORKER)
+            credentials = synthetic_credentials(count, f"{self.run_id}c{concurrency}", prefix="storm")
+            session = create_session(max_per_host=concurrency)
+            # Open every connection up front so TCP setup does not land in the burst
+            warm_up(session, BASE_URL, connections=concurrency)
+            
+            signup = self._auth_burst(session, 'auth/signup', credentials, concurrency)
+            signin = self._auth_burst(session, 'auth/signin',
+                                      [{'email': c['email'], 'password': c['password']} for c in credentials],
+                                      concurrency)
+            session.close()
+            signup_steps.append(signup)
+            signin_steps.append(signin)
+            print(f"  {concurrency:>7} | {signup['throughput_rps']:>12.2f} {signup['p50_ms']:>7.2f}ms "
+                  f"{signup['p99_ms']:>7.2f}ms {signup['failures']:>5} | {signin['throughput_rps']:>12.2f} "
+                  f"{signin['p50_ms']:>7.2f}ms {signin['p99_ms']:>7.2f}ms {signin['failures']:>5}")
+        
+        for name, steps in (('signup', signup_steps), ('signin', signin_steps)):
+            analysis = find_knee(steps)
+            # Past the plateau requests only queue for the hashing worker, so 1/peak throughput is the cost per hash
+            cost_ms = 1000.0 / analysis['peak_rps'] if analysis['peak_rps'] else 0.0
+            if analysis['knee_workers'] is None:
+                print(f"  {name}: no level had successful requests")
+                self.storm_results.append({'operation': name, 'steps': steps, 'analysis': analysis})
+                continue
+            print(f"  {name}: peak {analysis['peak_rps']:.2f} req/s (~{cost_ms:.1f}ms of server time each), "
+                  f"knee at {analysis['knee_workers']} clients"
+                  + (f", plateau after {analysis['plateau_workers']}" if analysis['plateau_workers'] else "")
+                  + (f", p99 breaks away at {analysis['tail_break_workers']}" if analysis['tail_break_workers'] else ""))
+            self.storm_results.append({'operation': name, 'steps': steps, 'analysis': analysis})
+        
+        failures = sum(step['failures'] for step in signup_steps + signin_steps)
+        if failures:
+            print(f"  ⚠️  {failures} storm requests failed")
+        return failures == 0
+    
+    def run_all_tests(self, storm_concurrency: int = None):
         """Run all authentication and core API tests"""
         print("=" * 80)
         print("KAIRO CORE AUTHENTICATION & API TESTING")
@@ -292,6 +389,9 @@ class AuthAPITester:
         print(f"Timeout: {TIMEOUT}s")
         print("-" * 80)
         
+        # Open the keep-alive connection before anything is timed
+        warm_up(self.session, BASE_URL)
+        
         # Run authentication flow tests
         print("\n🔐 AUTHENTICATION FLOW TESTING:")
         self.test_signup()
@@ -304,6 +404,8 @@ class AuthAPITester:
         print("\n🔗 INTEGRATION SYSTEM TESTING:")
         self.test_integration_endpoints()
         
+        storm_ok = self.run_storm(storm_concurrency) if storm_concurrency else True
+        
         # Print summary
         print("-" * 80)
         print("TEST SUMMARY")
@@ -329,9 +431,14 @@ class AuthAPITester:
         print("=" * 80)
         
         # Return success status
-        return self.failed_tests == 0
+        return self.failed_tests == 0 and storm_ok
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kairo authentication API testing")
+    parser.add_argument("--storm", type=int, metavar="N",
+                        help="Signup/signin storm with unique users at 1, 2, 4 ... N concurrent clients")
+    args = parser.parse_args()
+    
     tester = AuthAPITester()
-    success = tester.run_all_tests()
+    success = tester.run_all_tests(args.storm)
     sys.exit(0 if success else 1)
\ No newline at end of file
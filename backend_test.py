@@ -4,22 +4,155 @@ Comprehensive Backend API Testing for Kairo God-Tier Endpoints
 Testing all 9 advanced "God-tier" API endpoints for functionality and performance
 """
 
+import argparse
 import requests
-import json
 import time
 import sys
-from typing import Dict, Any, List, Tuple
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+from adaptive_timeouts import AdaptiveTimeouts
+from circuit_breaker import CircuitOpenError
+from http_client import create_session, is_read_timeout, warm_up
+from json_stream import read_json_fields
+from load_engine import ScheduledSender, format_scheduled_report
+from response_schemas import route_fields, schema_for
+from result_sink import ResultSink
 
 # Configuration
 BASE_URL = "http://localhost:3001"
 TIMEOUT = 30
+MAX_RESULTS = 10000     # Results kept in memory for the summary; --results streams every one to a file
+
+QUANTUM_SIMULATION_PAYLOAD = {
+    "workflowData": {
+        "id": "workflow_quantum_test_001",
+        "name": "Advanced Quantum Workflow",
+        "nodes": [
+            {"id": "node_1", "type": "data_processor", "category": "quantum"},
+            {"id": "node_2", "type": "ml_predictor", "category": "ai"},
+            {"id": "node_3", "type": "result_aggregator", "category": "output"}
+        ]
+    },
+    "simulationParams": {
+        "accuracy_target": 99.1,
+        "quantum_coherence_required": True,
+        "timeline_analysis": True
+    }
+}
+
+HIPAA_COMPLIANCE_PAYLOAD = {
+    "workflowData": {
+        "id": "healthcare_workflow_001",
+        "name": "Patient Data Processing Workflow",
+        "nodes": [
+            {"id": "phi_collector", "type": "data_input", "category": "healthcare", "config": {"contains_phi": True}},
+            {"id": "phi_processor", "type": "data_transform", "category": "healthcare"},
+            {"id": "audit_logger", "type": "compliance", "category": "security"}
+        ]
+    },
+    "complianceLevel": "full"
+}
+
+REALITY_FABRICATOR_PAYLOAD = {
+    "action": "optimize_smart_building_climate",
+    "deviceId": "building_hvac_system_001",
+    "parameters": {
+        "deviceType": "smart_hvac",
+        "location": "Corporate Headquarters Floor 15",
+        "scope": "building_wide",
+        "target_temperature": 72,
+        "energy_efficiency_mode": True
+    }
+}
+
+AUTO_COMPLIANCE_PAYLOAD = {
+    "regulationText": "All financial transactions must maintain audit trails for 7 years with immutable storage and real-time monitoring capabilities",
+    "industry": "financial_services",
+    "jurisdiction": "US"
+}
+
+GLOBAL_CONSCIOUSNESS_PAYLOAD = {
+    "feedType": "real_time_global_intelligence",
+    "dataFilters": {
+        "geographic_scope": "worldwide",
+        "data_categories": ["iot_sensors", "social_signals", "economic_indicators"],
+        "intelligence_level": "collective_wisdom"
+    },
+    "aggregationLevel": "global_synthesis"
+}
+
+AI_PROPHET_CERTIFICATION_PAYLOAD = {
+    "candidateId": "prophet_candidate_sarah_johnson",
+    "certificationLevel": "master",
+    "specialization": "enterprise_automation_mastery"
+}
+
+NEURO_ADAPTIVE_PAYLOAD = {
+    "userId": "user_neuro_test_001",
+    "brainwaveData": {
+        "cognitive_load": 0.65,
+        "stress_indicators": 0.3,
+        "attention_span_minutes": 25,
+        "focus_level": 0.8
+    },
+    "uiInteractionPattern": {
+        "preferred_complexity": "advanced",
+        "interaction_speed": "fast",
+        "error_tolerance": "low"
+    }
+}
+
+FEDRAMP_COMPLIANCE_PAYLOAD = {
+    "assessmentType": "moderate",
+    "systemBoundary": "cloud_service_offering",
+    "securityControls": {
+        "nist_800_53_baseline": "moderate",
+        "control_families": ["AC", "AU", "CA", "CM", "CP", "IA", "IR", "PL", "RA", "SC", "SI", "PM"],
+        "implementation_status": "in_progress"
+    }
+}
+
+QUANTUM_WORKFLOW_DB_PAYLOAD = {
+    "operation": "store_quantum_workflow_state",
+    "workflowState": {
+        "workflow_id": "quantum_workflow_001",
+        "superposition_states": ["success", "partial_success", "retry_needed"],
+        "entangled_workflows": ["workflow_002", "workflow_003"],
+        "quantum_coherence": 0.94
+    },
+    "quantumParams": {
+        "quantum_bits": 512,
+        "error_correction": True,
+        "parallel_universes": 100,
+        "timeline_consistency": True
+    }
+}
+
+# Every god-tier endpoint: (endpoint, payload, expected_fields), the fields coming from the schema registry
+GOD_TIER_ENDPOINTS = [(endpoint, payload, route_fields(endpoint)) for endpoint, payload in [
+    ('quantum-simulation', QUANTUM_SIMULATION_PAYLOAD),
+    ('hipaa-compliance', HIPAA_COMPLIANCE_PAYLOAD),
+    ('reality-fabricator', REALITY_FABRICATOR_PAYLOAD),
+    ('auto-compliance', AUTO_COMPLIANCE_PAYLOAD),
+    ('global-consciousness', GLOBAL_CONSCIOUSNESS_PAYLOAD),
+    ('ai-prophet-certification', AI_PROPHET_CERTIFICATION_PAYLOAD),
+    ('neuro-adaptive', NEURO_ADAPTIVE_PAYLOAD),
+    ('fedramp-compliance', FEDRAMP_COMPLIANCE_PAYLOAD),
+    ('quantum-workflow-db', QUANTUM_WORKFLOW_DB_PAYLOAD),
+]]
 
 class GodTierAPITester:
-    def __init__(self):
-        self.results = []
+    def __init__(self, adaptive_timeouts: bool = True, results_path: Optional[str] = None):
+        self.results = deque(maxlen=MAX_RESULTS)
         self.total_tests = 0
         self.passed_tests = 0
         self.failed_tests = 0
+        self.session = create_session()
+        # Per-endpoint timeouts learned from earlier runs; None keeps the fixed TIMEOUT everywhere
+        self.timeouts = AdaptiveTimeouts(default=TIMEOUT) if adaptive_timeouts else None
+        # Every result as NDJSON, written off the request path; the console keeps its own synchronous lines
+        self.sink = ResultSink(results_path, console=False) if results_path else None
         
     def log_result(self, endpoint: str, status: str, response_time: float, details: str):
         """Log test result"""
@@ -29,6 +162,8 @@ class GodTierAPITester:
             'response_time_ms': round(response_time * 1000, 2),
             'details': details
         }
+        if self.sink:
+            self.sink.emit(dict(result))
         self.results.append(result)
         self.total_tests += 1
         if status == 'PASS':
@@ -38,220 +173,154 @@ class GodTierAPITester:
             
         print(f"[{status}] {endpoint} - {details} ({result['response_time_ms']}ms)")
     
-    def test_endpoint(self, endpoint: str, payload: Dict[Any, Any], expected_fields: List[str]) -> Tuple[bool, str, float]:
+    def test_endpoint(self, endpoint: str, payload: Dict[Any, Any], expected_fields: List[str],
+                      intended_start: Optional[float] = None) -> Tuple[bool, str, float]:
         """Test a single endpoint with given payload"""
         url = f"{BASE_URL}/api/{endpoint}"
+        # In scheduled-send mode the clock starts when the request was due, not when it actually went out
+        start_time = intended_start if intended_start is not None else time.perf_counter()
+        # Learned timeouts apply to functional checks; scheduled load keeps the fixed one, as latency under load is no baseline
+        key = f"POST /api/{endpoint}"
+        timeout = self.timeouts.timeout_for(key) if self.timeouts and intended_start is None else TIMEOUT
         
         try:
-            start_time = time.time()
-            response = requests.post(url, json=payload, timeout=TIMEOUT)
-            response_time = time.time() - start_time
+            response = self.session.post(url, json=payload, timeout=timeout, stream=True)
             
             # Check HTTP status code
             if response.status_code != 200:
-                return False, f"HTTP {response.status_code}: {response.text[:200]}", response_time
+                details = f"HTTP {response.status_code}: {response.text[:200]}"
+                return False, details, time.perf_counter() - start_time
             
-            # Parse JSON response
-            try:
-                data = response.json()
-            except json.JSONDecodeError:
+            # Stream the body: count its bytes and decode only the fields checked below
+            schema = schema_for(endpoint)
+            capture = (schema.scalar_fields if schema else ['success']) + ['error']
+            body = read_json_fields(response, capture=capture, required=['success'] + expected_fields)
+            response_time = time.perf_counter() - start_time
+            if body.scanner.error or (not body.scanner.complete and not body.scanner.has(['success'])):
                 return False, "Invalid JSON response", response_time
             
             # Check if success field exists and is true
-            if not data.get('success', False):
-                return False, f"API returned success=false: {data.get('error', 'Unknown error')}", response_time
-            
-            # Check for expected fields in response
-            missing_fields = []
-            for field in expected_fields:
-                if field not in data:
-                    missing_fields.append(field)
+            if not body.values.get('success', False):
+                return False, f"API returned success=false: {body.values.get('error', 'Unknown error')}", response_time
             
+            # Check the response shape: presence and kind of every schema field, values of the scalar ones
+            missing_fields = [field for field in expected_fields if field not in body.scanner.kinds]
             if missing_fields:
                 return False, f"Missing expected fields: {missing_fields}", response_time
+            problem = schema.validate_top_level(body.scanner.kinds, body.values) if schema else None
+            if problem:
+                return False, f"Schema mismatch: {problem}", response_time
             
             # Check response structure and data quality
-            response_size = len(json.dumps(data))
+            response_size = body.body_bytes
             if response_size < 100:
                 return False, f"Response too small ({response_size} bytes), may be incomplete", response_time
             
+            if self.timeouts and intended_start is None:
+                self.timeouts.record(key, response_time)
             return True, f"Success - Response size: {response_size} bytes", response_time
             
         except requests.exceptions.Timeout:
-            return False, f"Request timeout after {TIMEOUT}s", TIMEOUT
-        except requests.exceptions.ConnectionError:
-            return False, "Connection error - server may be down", 0
+            return self._timed_out(key, timeout, start_time, intended_start)
+        except CircuitOpenError as e:
+            return False, f"Not sent - {e}", 0
+        except requests.exceptions.ConnectionError as e:
+            # With stream=True, a timeout while reading the body surfaces as a ConnectionError
+            if is_read_timeout(e):
+                return self._timed_out(key, timeout, start_time, intended_start)
+            return False, "Connection error - server may be down", 0 if intended_start is None else time.perf_counter() - start_time
         except Exception as e:
-            return False, f"Unexpected error: {str(e)}", 0
+            return False, f"Unexpected error: {str(e)}", 0 if intended_start is None else time.perf_counter() - start_time
+    
+    def _timed_out(self, key: str, timeout: float, start_time: float,
+                   intended_start: Optional[float]) -> Tuple[bool, str, float]:
+        if self.timeouts and intended_start is None:
+            self.timeouts.record_timeout(key, timeout)
+        learned = f" (learned timeout, fixed limit {TIMEOUT}s)" if timeout < TIMEOUT else ""
+        return False, f"Request timeout after {timeout:g}s{learned}", timeout if intended_start is None else time.perf_counter() - start_time
     
     def test_quantum_simulation(self):
         """Test Quantum Simulation Engine"""
-        payload = {
-            "workflowData": {
-                "id": "workflow_quantum_test_001",
-                "name": "Advanced Quantum Workflow",
-                "nodes": [
-                    {"id": "node_1", "type": "data_processor", "category": "quantum"},
-                    {"id": "node_2", "type": "ml_predictor", "category": "ai"},
-                    {"id": "node_3", "type": "result_aggregator", "category": "output"}
-                ]
-            },
-            "simulationParams": {
-                "accuracy_target": 99.1,
-                "quantum_coherence_required": True,
-                "timeline_analysis": True
-            }
-        }
-        
-        expected_fields = ['success', 'simulation', 'message']
-        success, details, response_time = self.test_endpoint('quantum-simulation', payload, expected_fields)
+        success, details, response_time = self.test_endpoint('quantum-simulation', QUANTUM_SIMULATION_PAYLOAD, route_fields('quantum-simulation'))
         self.log_result('POST /api/quantum-simulation', 'PASS' if success else 'FAIL', response_time, details)
     
     def test_hipaa_compliance(self):
         """Test HIPAA Compliance Pack"""
-        payload = {
-            "workflowData": {
-                "id": "healthcare_workflow_001",
-                "name": "Patient Data Processing Workflow",
-                "nodes": [
-                    {"id": "phi_collector", "type": "data_input", "category": "healthcare", "config": {"contains_phi": True}},
-                    {"id": "phi_processor", "type": "data_transform", "category": "healthcare"},
-                    {"id": "audit_logger", "type": "compliance", "category": "security"}
-                ]
-            },
-            "complianceLevel": "full"
-        }
-        
-        expected_fields = ['success', 'compliance', 'message']
-        success, details, response_time = self.test_endpoint('hipaa-compliance', payload, expected_fields)
+        success, details, response_time = self.test_endpoint('hipaa-compliance', HIPAA_COMPLIANCE_PAYLOAD, route_fields('hipaa-compliance'))
         self.log_result('POST /api/hipaa-compliance', 'PASS' if success else 'FAIL', response_time, details)
     
     def test_reality_fabricator(self):
         """Test Reality Fabricator API"""
-        payload = {
-            "action": "optimize_smart_building_climate",
-            "deviceId": "building_hvac_system_001",
-            "parameters": {
-                "deviceType": "smart_hvac",
-                "location": "Corporate Headquarters Floor 15",
-                "scope": "building_wide",
-                "target_temperature": 72,
-                "energy_efficiency_mode": True
-            }
-        }
-        
-        expected_fields = ['success', 'miracle', 'message', 'reality_status']
-        success, details, response_time = self.test_endpoint('reality-fabricator', payload, expected_fields)
+        success, details, response_time = self.test_endpoint('reality-fabricator', REALITY_FABRICATOR_PAYLOAD, route_fields('reality-fabricator'))
         self.log_result('POST /api/reality-fabricator', 'PASS' if success else 'FAIL', response_time, details)
     
     def test_auto_compliance(self):
         """Test Auto-Compliance Generator"""
-        payload = {
-            "regulationText": "All financial transactions must maintain audit trails for 7 years with immutable storage and real-time monitoring capabilities",
-            "industry": "financial_services",
-            "jurisdiction": "US"
-        }
-        
-        expected_fields = ['success', 'compliance', 'message']
-        success, details, response_time = self.test_endpoint('auto-compliance', payload, expected_fields)
+        success, details, response_time = self.test_endpoint('auto-compliance', AUTO_COMPLIANCE_PAYLOAD, route_fields('auto-compliance'))
         self.log_result('POST /api/auto-compliance', 'PASS' if success else 'FAIL', response_time, details)
     
     def test_global_consciousness(self):
         """Test Global Consciousness Feed"""
-        payload = {
-            "feedType": "real_time_global_intelligence",
-            "dataFilters": {
-                "geographic_scope": "worldwide",
-                "data_categories": ["iot_sensors", "social_signals", "economic_indicators"],
-                "intelligence_level": "collective_wisdom"
-            },
-            "aggregationLevel": "global_synthesis"
-        }
-        
-        expected_fields = ['success', 'consciousness', 'message', 'status']
-        success, details, response_time = self.test_endpoint('global-consciousness', payload, expected_fields)
+        success, details, response_time = self.test_endpoint('global-consciousness', GLOBAL_CONSCIOUSNESS_PAYLOAD, route_fields('global-consciousness'))
         self.log_result('POST /api/global-consciousness', 'PASS' if success else 'FAIL', response_time, details)
     
     def test_ai_prophet_certification(self):
         """Test AI Prophet Certification"""
-        payload = {
-            "candidateId": "prophet_candidate_sarah_johnson",
-            "certificationLevel": "master",
-            "specialization": "enterprise_automation_mastery"
-        }
-        
-        expected_fields = ['success', 'certification', 'message', 'divine_status']
-        success, details, response_time = self.test_endpoint('ai-prophet-certification', payload, expected_fields)
+        success, details, response_time = self.test_endpoint('ai-prophet-certification', AI_PROPHET_CERTIFICATION_PAYLOAD, route_fields('ai-prophet-certification'))
         self.log_result('POST /api/ai-prophet-certification', 'PASS' if success else 'FAIL', response_time, details)
     
     def test_neuro_adaptive(self):
         """Test Neuro-Adaptive UI"""
-        payload = {
-            "userId": "user_neuro_test_001",
-            "brainwaveData": {
-                "cognitive_load": 0.65,
-                "stress_indicators": 0.3,
-                "attention_span_minutes": 25,
-                "focus_level": 0.8
-            },
-            "uiInteractionPattern": {
-                "preferred_complexity": "advanced",
-                "interaction_speed": "fast",
-                "error_tolerance": "low"
-            }
-        }
-        
-        expected_fields = ['success', 'adaptation', 'message', 'brain_status']
-        success, details, response_time = self.test_endpoint('neuro-adaptive', payload, expected_fields)
+        success, details, response_time = self.test_endpoint('neuro-adaptive', NEURO_ADAPTIVE_PAYLOAD, route_fields('neuro-adaptive'))
         self.log_result('POST /api/neuro-adaptive', 'PASS' if success else 'FAIL', response_time, details)
     
     def test_fedramp_compliance(self):
         """Test FedRAMP Compliance"""
-        payload = {
-            "assessmentType": "moderate",
-            "systemBoundary": "cloud_service_offering",
-            "securityControls": {
-                "nist_800_53_baseline": "moderate",
-                "control_families": ["AC", "AU", "CA", "CM", "CP", "IA", "IR", "PL", "RA", "SC", "SI", "PM"],
-                "implementation_status": "in_progress"
-            }
-        }
-        
-        expected_fields = ['success', 'compliance', 'message', 'government_status']
-        success, details, response_time = self.test_endpoint('fedramp-compliance', payload, expected_fields)
+        success, details, response_time = self.test_endpoint('fedramp-compliance', FEDRAMP_COMPLIANCE_PAYLOAD, route_fields('fedramp-compliance'))
         self.log_result('POST /api/fedramp-compliance', 'PASS' if success else 'FAIL', response_time, details)
     
     def test_quantum_workflow_db(self):
         """Test Quantum Workflow Database"""
-        payload = {
-            "operation": "store_quantum_workflow_state",
-            "workflowState": {
-                "workflow_id": "quantum_workflow_001",
-                "superposition_states": ["success", "partial_success", "retry_needed"],
-                "entangled_workflows": ["workflow_002", "workflow_003"],
-                "quantum_coherence": 0.94
-            },
-            "quantumParams": {
-                "quantum_bits": 512,
-                "error_correction": True,
-                "parallel_universes": 100,
-                "timeline_consistency": True
-            }
-        }
-        
-        expected_fields = ['success', 'database', 'message', 'reality_status']
-        success, details, response_time = self.test_endpoint('quantum-workflow-db', payload, expected_fields)
+        success, details, response_time = self.test_endpoint('quantum-workflow-db', QUANTUM_WORKFLOW_DB_PAYLOAD, route_fields('quantum-workflow-db'))
         self.log_result('POST /api/quantum-workflow-db', 'PASS' if success else 'FAIL', response_time, details)
     
+    def run_scheduled_load(self, rate: float, duration: float):
+        """Drive every god-tier endpoint on a fixed-rate schedule with coordinated-omission-corrected latency"""
+        print("=" * 80)
+        print("KAIRO GOD-TIER SCHEDULED LOAD")
+        print("=" * 80)
+        print(f"Testing against: {BASE_URL}")
+        print(f"Rate: {rate} req/s for {duration}s")
+        print("-" * 80)
+        warm_up(self.session, BASE_URL)
+        
+        def scheduled_send(endpoint, payload, fields):
+            def send(intended_start):
+                success, _, response_time = self.test_endpoint(endpoint, payload, fields, intended_start)
+                return success, response_time
+            return send
+        
+        sends = [(f"POST /api/{endpoint}", scheduled_send(endpoint, payload, fields))
+                 for endpoint, payload, fields in GOD_TIER_ENDPOINTS]
+        report = ScheduledSender(rate).run(sends, duration)
+        for line in format_scheduled_report(report):
+            print(line)
+        print("=" * 80)
+        
+        return report['overall']['failures'] == 0
+    
     def run_all_tests(self):
         """Run all God-tier API endpoint tests"""
         print("=" * 80)
         print("KAIRO GOD-TIER API ENDPOINTS TESTING")
         print("=" * 80)
         print(f"Testing against: {BASE_URL}")
-        print(f"Timeout: {TIMEOUT}s")
+        print(f"Timeout: {TIMEOUT}s" + (f", per endpoint from {self.timeouts.path} where learned" if self.timeouts else ""))
         print("-" * 80)
         
+        # Open the keep-alive connection before anything is timed
+        warm_up(self.session, BASE_URL)
+        
         # Run all tests
         self.test_quantum_simulation()
         self.test_hipaa_compliance()
@@ -262,6 +331,8 @@ class GodTierAPITester:
         self.test_neuro_adaptive()
         self.test_fedramp_compliance()
         self.test_quantum_workflow_db()
+        if self.timeouts:
+            self.timeouts.save()
         
         # Print summary
         print("-" * 80)
@@ -291,6 +362,19 @@ class GodTierAPITester:
         return self.failed_tests == 0
 
 if __name__ == "__main__":
-    tester = GodTierAPITester()
-    success = tester.run_all_tests()
+    parser = argparse.ArgumentParser(description="Kairo god-tier API endpoint testing")
+    parser.add_argument("--rate", type=float, help="Scheduled-send load at this many requests/second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Scheduled load duration in seconds")
+    parser.add_argument("--fixed-timeout", action="store_true",
+                        help=f"Use the fixed {TIMEOUT}s timeout instead of per-endpoint timeouts learned from history")
+    parser.add_argument("--results", metavar="PATH", help="Append every test result to this file as NDJSON")
+    args = parser.parse_args()
+    
+    tester = GodTierAPITester(adaptive_timeouts=not args.fixed_timeout, results_path=args.results)
+    if args.rate:
+        success = tester.run_scheduled_load(args.rate, args.duration)
+    else:
+        success = tester.run_all_tests()
+    if tester.sink:
+        tester.sink.close()
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Cache Hit/Miss Probe for Kairo API Testing
+Snapshots /api/performance/cache-status around a workload and splits endpoint latency into cache hits and misses
+
+Usage: python cache_probe.py --rounds 20
+       python cache_probe.py --rounds 50 --only reality-fabricator --base-url http://localhost:3000
+
+Hits and misses are told apart by the top-level `cached` flag that cached routes (reality-fabricator) put on
+their responses. Routes without one are split at the widest gap of a bimodal latency distribution; a route
+whose latencies show no second mode is reported as a single population.
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from comprehensive_backend_test import BASE_URL, DEMO_CREDENTIALS, ENDPOINT_CATALOG, TIMEOUT
+from http_client import create_session, warm_up
+from latency_histogram import LatencyHistogram, format_summary
+
+# Configuration
+ROUNDS = 20
+BIMODAL_MIN_RATIO = 2.0      # The slow mode must be at least 2x the fast one to count as a cache miss population
+BIMODAL_MIN_SHARE = 0.05     # ...and each mode must hold at least 5% of the samples
+
+
+def snapshot_cache(session: requests.Session, base_url: str = BASE_URL) -> Optional[Dict[str, float]]:
+    """Cache counters from /api/performance/cache-status, or None if the endpoint is unavailable"""
+    try:
+        response = session.get(f"{base_url}/api/performance/cache-status", timeout=TIMEOUT)
+        data = response.json()
+    except (requests.exceptions.RequestException, json.JSONDecodeError):
+        return None
+    cache = (data.get('performance_metrics') or {}).get('cache_performance')
+    if response.status_code != 200 or not cache:
+        return None
+
+    entries = int(cache.get('total_entries') or 0)
+    # cache.getStats() reports "hit rate" as total hits per live entry, rounded to two decimals
+    hits_per_entry = float(cache.get('hit_rate_percentage') or 0.0)
+    return {'entries': entries, 'total_hits': round(hits_per_entry * entries), 'expired': cache.get('expired_entries', 0),
+            'taken_at': time.time()}
+
+
+def cache_delta(before: Optional[Dict[str, float]], after: Optional[Dict[str, float]]) -> Optional[Dict[str, Any]]:
+    """Hits and misses the workload produced: new hits, and new entries as the misses that filled them"""
+    if not before or not after:
+        return None
+    hits = max(0, after['total_hits'] - before['total_hits'])
+    misses = max(0, after['entries'] - before['entries'])
+    lookups = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_ratio': round(hits / lookups, 4) if lookups else None}
+
+
+def cached_flag(response: requests.Response) -> Optional[bool]:
+    """The route's own hit/miss marker, if it sets one"""
+    try:
+        data = response.json()
+    except (ValueError, json.JSONDecodeError):
+        return None
+    flag = data.get('cached') if isinstance(data, dict) else None
+    return flag if isinstance(flag, bool) else None
+
+
+def bimodal_threshold(latencies_ms: List[float]) -> Optional[float]:
+    """Latency separating a fast and a slow mode (Otsu's method on log latency), or None if unimodal"""
+    values = sorted(math.log(max(value, 0.001)) for value in latencies_ms)
+    n = len(values)
+    min_size = max(2, math.ceil(n * BIMODAL_MIN_SHARE))
+    if n < 2 * min_size:
+        return None
+
+    prefix = [0.0]
+    for value in values:
+        prefix.append(prefix[-1] + value)
+    best_split, best_variance = None, -1.0
+    for split in range(min_size, n - min_size + 1):
+        low_mean = prefix[split] / split
+        high_mean = (prefix[n] - prefix[split]) / (n - split)
+        between = split * (n - split) * (high_mean - low_mean) ** 2
+        if between > best_variance:
+            best_split, best_variance = split, between
+
+    low_mean = prefix[best_split] / best_split
+    high_mean = (prefix[n] - prefix[best_split]) / (n - best_split)
+    if high_mean - low_mean < math.log(BIMODAL_MIN_RATIO):
+        return None
+    return math.exp((values[best_split - 1] + values[best_split]) / 2)
+
+
+def split_populations(samples: List[Tuple[float, Optional[bool]]]) -> Dict[str, Any]:
+    """Divide (latency_ms, cached flag) samples into hit and miss histograms"""
+    hits, misses = LatencyHistogram(), LatencyHistogram()
+    if samples and all(flag is not None for _, flag in samples):
+        method = 'flag'
+        for latency, flag in samples:
+            (hits if flag else misses).record(latency)
+    else:
+        threshold = bimodal_threshold([latency for latency, _ in samples])
+        if threshold is None:
+            method = 'unimodal'
+            for latency, _ in samples:
+                misses.record(latency)
+        else:
+            method = f"bimodal split at {threshold:.2f}ms"
+            for latency, _ in samples:
+                (hits if latency < threshold else misses).record(latency)
+
+    result = {'method': method, 'hits': hits, 'misses': misses, 'speedup': None}
+    if len(hits) and len(misses):
+        result['speedup'] = round(misses.percentile(50) / hits.percentile(50), 2) if hits.percentile(50) else None
+    return result
+
+
+class CacheProbe:
+    """Repeats each endpoint's request so the cache gets a chance to answer, and attributes latency to hits/misses"""
+
+    def __init__(self, base_url: str = BASE_URL, session: requests.Session = None):
+        self.base_url = base_url
+        self.session = session or create_session()
+
+    def run(self, catalog: List[Tuple[str, str, str, Any, bool]], rounds: int = ROUNDS) -> Dict[str, Any]:
+        before = snapshot_cache(self.session, self.base_url)
+        samples: Dict[str, List[Tuple[float, Optional[bool]]]] = {label: [] for label, *_ in catalog}
+        failures = {label: 0 for label, *_ in catalog}
+
+        for _ in range(rounds):
+            for label, method, endpoint, payload, _ in catalog:
+                start_time = time.perf_counter()
+                try:
+                    response = self.session.request(method, f"{self.base_url}/api/{endpoint}", json=payload,
+                                                    timeout=TIMEOUT)
+                except requests.exceptions.RequestException:
+                    failures[label] += 1
+                    continue
+                latency = (time.perf_counter() - start_time) * 1000
+                if response.status_code not in (200, 201):
+                    failures[label] += 1
+                    continue
+                samples[label].append((latency, cached_flag(response)))
+
+        after = snapshot_cache(self.session, self.base_url)
+        return {
+            'rounds': rounds,
+            'cache_before': before,
+            'cache_after': after,
+            'cache_delta': cache_delta(before, after),
+            'endpoints': {label: {**split_populations(samples[label]), 'failures': failures[label]}
+                          for label in samples},
+        }
+
+
+def print_probe_report(report: Dict[str, Any]):
+    delta = report['cache_delta']
+    if delta is None:
+        print("  Cache status unavailable - hit ratio could not be measured server-side")
+    else:
+        ratio = f"{delta['hit_ratio'] * 100:.1f}%" if delta['hit_ratio'] is not None else "n/a (no cache lookups)"
+        print(f"  Server-side: {delta['hits']} hits, {delta['misses']} new entries (misses), hit ratio {ratio}")
+
+    for label, entry in report['endpoints'].items():
+        hits, misses = entry['hits'], entry['misses']
+        total = len(hits) + len(misses)
+        print(f"  {label} ({entry['method']}"
+              + (f", {entry['failures']} failed" if entry['failures'] else "") + "):")
+        if not total:
+            print("    no successful responses")
+            continue
+        if len(hits):
+            print(f"    hit  {len(hits) / total * 100:5.1f}%: {format_summary(hits.summary())}")
+        if len(misses):
+            label_name = 'miss' if entry['method'] != 'unimodal' else 'all '
+            print(f"    {label_name} {len(misses) / total * 100:5.1f}%: {format_summary(misses.summary())}")
+        if entry['speedup']:
+            print(f"    cache hits are {entry['speedup']}x faster at p50")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kairo cache hit/miss latency probe")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="Requests per endpoint")
+    parser.add_argument("--only", action="append", metavar="ENDPOINT", help="Probe only these endpoints (repeatable)")
+    args = parser.parse_args()
+
+    catalog = [entry for entry in ENDPOINT_CATALOG if not args.only or entry[2] in args.only]
+
+    print("=" * 80)
+    print("KAIRO CACHE HIT/MISS PROBE")
+    print("=" * 80)
+    print(f"Testing against: {args.base_url}")
+    print(f"Endpoints: {len(catalog)}, {args.rounds} rounds each")
+
+    session = create_session()
+    warm_up(session, args.base_url)
+    if any(requires_auth for *_, requires_auth in catalog):
+        try:
+            session.post(f"{args.base_url}/api/auth/signin", json=DEMO_CREDENTIALS, timeout=TIMEOUT)
+        except requests.exceptions.RequestException:
+            pass  # Authenticated endpoints will show up as failures
+
+    report = CacheProbe(args.base_url, session).run(catalog, args.rounds)
+    print("-" * 80)
+    print_probe_report(report)
+    print("=" * 80)
+    return 0 if report['cache_delta'] is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
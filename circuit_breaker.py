@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Health-Gated Circuit Breaker for Kairo API Testing
+Stops every tester from waiting out its own connection error or timeout when the target server is down
+
+One breaker per origin (scheme://host:port) is shared by every session and thread of the process. It trips
+after a run of consecutive connection failures or timeouts, since a hung server accepts connections and then
+never answers. While open, requests fail at once with CircuitOpenError, a requests ConnectionError, so
+existing error handling reports them without waiting on the network. On a
+backoff schedule (1s, 2s, 4s ... up to 30s) one request probes /api/health instead: a reachable server
+closes the breaker, an unreachable one doubles the wait. Set KAIRO_CIRCUIT_BREAKER=0 to turn it off.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import requests
+
+# Configuration
+ENABLED = os.environ.get('KAIRO_CIRCUIT_BREAKER', '1') != '0'
+FAILURE_THRESHOLD = 3    # Consecutive connection failures or timeouts that trip the breaker
+BASE_BACKOFF = 1.0       # Seconds until the first health probe; doubled after every failed probe
+MAX_BACKOFF = 30.0
+PROBE_PATH = "/api/health"
+PROBE_TIMEOUT = 2.0
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the target's breaker is open"""
+
+
+class CircuitBreaker:
+    """Closed -> open after `threshold` consecutive connection failures -> half-open probe -> closed or open"""
+
+    def __init__(self, origin: str, threshold: int = FAILURE_THRESHOLD, backoff: float = BASE_BACKOFF,
+                 max_backoff: float = MAX_BACKOFF, probe_path: str = PROBE_PATH, probe_timeout: float = PROBE_TIMEOUT):
+        self.origin = origin
+        self.threshold = threshold
+        self.base_backoff = backoff
+        self.max_backoff = max_backoff
+        self.probe_url = f"{origin}{probe_path}"
+        self.probe_timeout = probe_timeout
+        self.state = CLOSED
+        self.failures = 0          # Consecutive connection failures
+        self.trips = 0
+        self.short_circuited = 0   # Requests refused while open
+        self.backoff = backoff
+        self.next_probe = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _open(self, backoff: float):
+        self.state = OPEN
+        self.backoff = min(backoff, self.max_backoff)
+        self.next_probe = time.monotonic() + self.backoff
+
+    def _refuse(self, reason: str) -> CircuitOpenError:
+        self.short_circuited += 1
+        return CircuitOpenError(f"Circuit open for {self.origin} ({reason}); "
+                                f"next health probe in {max(0.0, self.next_probe - time.monotonic()):.1f}s")
+
+    def before_request(self):
+        """Let a request through, run the due health probe first, or raise CircuitOpenError"""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self._probing or time.monotonic() < self.next_probe:
+                raise self._refuse(f"{self.failures} consecutive connection failures")
+            self._probing = True
+            self.state = HALF_OPEN
+
+        healthy, reason = self._probe()
+        with self._lock:
+            self._probing = False
+            if healthy:
+                self.state, self.failures, self.backoff = CLOSED, 0, self.base_backoff
+                return
+            self._open(self.backoff * 2)
+            raise self._refuse(reason)
+
+    def _probe(self):
+        # A plain requests call: it goes through neither the pooled adapter nor this breaker
+        try:
+            response = requests.get(self.probe_url, timeout=self.probe_timeout)
+        except requests.exceptions.RequestException as e:
+            return False, f"health probe failed: {type(e).__name__}"
+        if response.status_code >= 500:
+            return False, f"health probe returned HTTP {response.status_code}"
+        return True, None
+
+    def record_success(self):
+        """Any HTTP response, error statuses included, proves the server is reachable"""
+        with self._lock:
+            self.failures = 0
+            if self.state != CLOSED and not self._probing:
+                self.state, self.backoff = CLOSED, self.base_backoff
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == CLOSED and self.failures >= self.threshold:
+                self.trips += 1
+                self._open(self.base_backoff)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'origin': self.origin, 'state': self.state, 'consecutive_failures': self.failures,
+                    'trips': self.trips, 'short_circuited': self.short_circuited}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(url: str) -> CircuitBreaker:
+    """The process-wide breaker of the origin `url` belongs to"""
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    with _breakers_lock:
+        breaker = _breakers.get(origin)
+        if breaker is None:
+            breaker = _breakers[origin] = CircuitBreaker(origin)
+        return breaker
+
+
+def guarded_send(url: str, send):
+    """Run `send()` for a request to `url` through its breaker, when breakers are enabled"""
+    if not ENABLED:
+        return send()
+    breaker = breaker_for(url)
+    breaker.before_request()
+    try:
+        response = send()
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    return response
+
+
+def breaker_report() -> Dict[str, Dict[str, Any]]:
+    """Status of every breaker that has seen traffic, by origin"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.origin: breaker.status() for breaker in breakers}
@@ -4,86 +4,283 @@ Comprehensive Backend API Testing for Kairo AI Platform
 Testing all API endpoints including authentication, god-tier features, and core functionality
 """
 
+import argparse
 import requests
 import json
 import time
 import sys
-from typing import Dict, Any, List, Tuple
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+from concurrency_sweep import STEP_DURATION, sweep
+from adaptive_timeouts import AdaptiveTimeouts
+from circuit_breaker import CircuitOpenError, breaker_report
+from harness_profiler import HarnessProfiler, format_harness_report
+from http_client import PHASES, clone_session, create_session, warm_up
+from latency_histogram import LatencyHistogram
+from load_engine import ScheduledSender, format_scheduled_report
+from load_profiles import MONITOR_INTERVAL, PROFILES, ProfileLoadEngine, catalog_targets, format_profile_report
+from metric_timeline import MetricTimeline, find_spikes, format_timeline, write_timeline
+from response_schemas import validate_response
+from result_sink import ResultSink
+from session_pool import build_session_pool, print_build_report
+from soak_monitor import MetricsPoller, format_leak_report
+from task_graph import MAX_WORKERS, TaskGraph, format_graph_report
 
 # Configuration
 BASE_URL = "http://localhost:3001"
 TIMEOUT = 30
+MAX_RESULTS = 10000     # Results kept in memory for the summary; --results streams every one to a file
+
+DEMO_CREDENTIALS = {
+    "email": "demo.user.2025@kairo.test",
+    "password": "DemoAccess2025!"
+}
+
+INTEGRATIONS_TEST_PAYLOAD = {
+    "integration": "test",
+    "action": "validate_connection"
+}
+
+QUANTUM_SIMULATION_PAYLOAD = {
+    "workflowData": {
+        "id": "workflow_quantum_test_001",
+        "name": "Advanced Quantum Workflow",
+        "nodes": [
+            {"id": "node_1", "type": "data_processor", "category": "quantum"},
+            {"id": "node_2", "type": "ml_predictor", "category": "ai"},
+            {"id": "node_3", "type": "result_aggregator", "category": "output"}
+        ]
+    },
+    "simulationParams": {
+        "accuracy_target": 99.1,
+        "quantum_coherence_required": True,
+        "timeline_analysis": True
+    }
+}
+
+HIPAA_COMPLIANCE_PAYLOAD = {
+    "workflowData": {
+        "id": "healthcare_workflow_001",
+        "name": "Patient Data Processing Workflow",
+        "nodes": [
+            {"id": "phi_collector", "type": "data_input", "category": "healthcare", "config": {"contains_phi": True}},
+            {"id": "phi_processor", "type": "data_transform", "category": "healthcare"},
+            {"id": "audit_logger", "type": "compliance", "category": "security"}
+        ]
+    },
+    "complianceLevel": "full"
+}
+
+REALITY_FABRICATOR_PAYLOAD = {
+    "action": "optimize_smart_building_climate",
+    "deviceId": "building_hvac_system_001",
+    "parameters": {
+        "deviceType": "smart_hvac",
+        "location": "Corporate Headquarters Floor 15",
+        "scope": "building_wide",
+        "target_temperature": 72,
+        "energy_efficiency_mode": True
+    }
+}
+
+AUTO_COMPLIANCE_PAYLOAD = {
+    "regulationText": "All financial transactions must maintain audit trails for 7 years with immutable storage and real-time monitoring capabilities",
+    "industry": "financial_services",
+    "jurisdiction": "US"
+}
+
+GLOBAL_CONSCIOUSNESS_PAYLOAD = {
+    "feedType": "real_time_global_intelligence",
+    "dataFilters": {
+        "geographic_scope": "worldwide",
+        "data_categories": ["iot_sensors", "social_signals", "economic_indicators"],
+        "intelligence_level": "collective_wisdom"
+    },
+    "aggregationLevel": "global_synthesis"
+}
+
+TRINITY_MIRACLES_PAYLOAD = {"miracle_type": "workflow_optimization", "intensity": "divine"}
+TRINITY_PROPHECY_PAYLOAD = {"prophecy_request": "future_automation_trends", "timeline": "next_quarter"}
+TRINITY_TEMPORAL_THRONE_PAYLOAD = {"temporal_action": "timeline_analysis", "scope": "enterprise_wide"}
+
+# Every endpoint the tester covers: (label, method, endpoint, payload, requires_auth)
+ENDPOINT_CATALOG = [
+    ('GET /api/health', 'GET', 'health', None, False),
+    ('GET /api/demo/test', 'GET', 'demo/test', None, False),
+    ('POST /api/auth/signin', 'POST', 'auth/signin', DEMO_CREDENTIALS, False),
+    ('GET /api/auth/me', 'GET', 'auth/me', None, True),
+    ('GET /api/user/profile', 'GET', 'user/profile', None, True),
+    ('GET /api/user/activity', 'GET', 'user/activity', None, True),
+    ('GET /api/notifications', 'GET', 'notifications', None, True),
+    ('GET /api/learning/progress', 'GET', 'learning/progress', None, True),
+    ('GET /api/performance/metrics', 'GET', 'performance/metrics', None, True),
+    ('GET /api/performance/cache-status', 'GET', 'performance/cache-status', None, False),
+    ('POST /api/integrations/test', 'POST', 'integrations/test', INTEGRATIONS_TEST_PAYLOAD, False),
+    ('POST /api/quantum-simulation', 'POST', 'quantum-simulation', QUANTUM_SIMULATION_PAYLOAD, False),
+    ('POST /api/hipaa-compliance', 'POST', 'hipaa-compliance', HIPAA_COMPLIANCE_PAYLOAD, False),
+    ('POST /api/reality-fabricator', 'POST', 'reality-fabricator', REALITY_FABRICATOR_PAYLOAD, False),
+    ('POST /api/auto-compliance', 'POST', 'auto-compliance', AUTO_COMPLIANCE_PAYLOAD, False),
+    ('POST /api/global-consciousness', 'POST', 'global-consciousness', GLOBAL_CONSCIOUSNESS_PAYLOAD, False),
+    ('GET /api/god-tier/dashboard', 'GET', 'god-tier/dashboard', None, True),
+    ('POST /api/trinity/miracles', 'POST', 'trinity/miracles', TRINITY_MIRACLES_PAYLOAD, False),
+    ('POST /api/trinity/prophecy', 'POST', 'trinity/prophecy', TRINITY_PROPHECY_PAYLOAD, False),
+    ('POST /api/trinity/temporal-throne', 'POST', 'trinity/temporal-throne', TRINITY_TEMPORAL_THRONE_PAYLOAD, False),
+]
+
+LOGIN = 'test_demo_account_login'
+
+# Functional checks by report section: (test method, test methods it has to wait for). Checks that need
+# the demo session depend on the login; everything else, the god-tier POSTs included, depends on nothing.
+TEST_PLAN = [
+    ("🔧 CORE SYSTEM TESTS", [('test_health_check', ()), ('test_demo_test', ())]),
+    ("🔐 AUTHENTICATION TESTS", [(LOGIN, ()), ('test_auth_me', (LOGIN,))]),
+    ("👤 USER MANAGEMENT TESTS", [('test_user_profile', (LOGIN,)), ('test_user_activity', (LOGIN,)),
+                                 ('test_notifications', (LOGIN,)), ('test_learning_progress', (LOGIN,))]),
+    ("⚡ PERFORMANCE TESTS", [('test_performance_metrics', (LOGIN,)), ('test_performance_cache_status', ())]),
+    ("🔗 INTEGRATION TESTS", [('test_integrations_test', ())]),
+    ("🚀 GOD-TIER FEATURE TESTS", [('test_quantum_simulation', ()), ('test_hipaa_compliance', ()),
+                                  ('test_reality_fabricator', ()), ('test_auto_compliance', ()),
+                                  ('test_global_consciousness', ()), ('test_god_tier_dashboard', (LOGIN,))]),
+    ("✨ TRINITY TESTS", [('test_trinity_miracles', ()), ('test_trinity_prophecy', ()),
+                        ('test_trinity_temporal_throne', ())]),
+]
 
 class KairoAPITester:
-    def __init__(self):
-        self.results = []
+    def __init__(self, adaptive_timeouts: bool = True, results_path: Optional[str] = None,
+                 profile_harness: bool = False):
+        self.results = deque(maxlen=MAX_RESULTS)
         self.total_tests = 0
         self.passed_tests = 0
         self.failed_tests = 0
-        self.session = requests.Session()  # Use session to handle cookies
+        self.session = create_session(phase_timing=True)  # Use session to handle cookies
         self.demo_user_id = None
         self.is_authenticated = False
+        self.sweep_results = {}
+        self.scheduled_results = {}
+        self.phase_timings = {}  # "METHOD /api/endpoint" -> per-phase latency histograms and wire bytes
+        self.session_pool = None  # Many synthetic users for authenticated load, instead of the one demo cookie
+        self.cache_probe_results = {}
+        self.profile_results = {}
+        self.leak_results = {}
+        self.timeline_rows = []
+        self.graph_results = {}
+        self.harness_results = {}
+        self._lock = threading.Lock()  # Checks may run on several threads at once
+        # Per-endpoint timeouts learned from earlier runs; None keeps the fixed TIMEOUT everywhere
+        self.timeouts = AdaptiveTimeouts(default=TIMEOUT) if adaptive_timeouts else None
+        # Every result as NDJSON, written off the request path; the console keeps its own synchronous lines
+        self.sink = ResultSink(results_path, console=False) if results_path else None
+        # Client CPU inside each timed request and in the work around it; records nothing unless enabled
+        self.profiler = HarnessProfiler(enabled=profile_harness)
         
     def log_result(self, endpoint: str, status: str, response_time: float, details: str):
         """Log test result"""
-        result = {
-            'endpoint': endpoint,
-            'status': status,
-            'response_time_ms': round(response_time * 1000, 2),
-            'details': details
-        }
-        self.results.append(result)
-        self.total_tests += 1
-        if status == 'PASS':
-            self.passed_tests += 1
-        else:
-            self.failed_tests += 1
-            
-        print(f"[{status}] {endpoint} - {details} ({result['response_time_ms']}ms)")
+        with self.profiler.stage('logging'):
+            result = {
+                'endpoint': endpoint,
+                'status': status,
+                'response_time_ms': round(response_time * 1000, 2),
+                'details': details
+            }
+            if self.sink:
+                self.sink.emit(dict(result))
+            with self._lock:
+                self.results.append(result)
+                self.total_tests += 1
+                if status == 'PASS':
+                    self.passed_tests += 1
+                else:
+                    self.failed_tests += 1
+                
+                print(f"[{status}] {endpoint} - {details} ({result['response_time_ms']}ms)")
     
-    def make_request(self, method: str, endpoint: str, payload: Dict[Any, Any] = None, headers: Dict[str, str] = None) -> Tuple[bool, str, float, Any]:
+    def make_request(self, method: str, endpoint: str, payload: Dict[Any, Any] = None, headers: Dict[str, str] = None,
+                     session: requests.Session = None, intended_start: Optional[float] = None) -> Tuple[bool, str, float, Any]:
         """Make HTTP request with error handling using session for cookies"""
         url = f"{BASE_URL}/api/{endpoint}"
+        # Learned timeouts apply to functional checks; sweeps and scheduled load pass their own session or
+        # schedule and keep the fixed timeout, as latency under load is no baseline
+        functional = session is None and intended_start is None and self.timeouts is not None
+        key = f"{method} /api/{endpoint}"
+        timeout = self.timeouts.timeout_for(key) if functional else TIMEOUT
+        session = session or self.session
+        # In scheduled-send mode the clock starts when the request was due, not when it actually went out
+        start_time = intended_start if intended_start is not None else time.perf_counter()
+        cpu_start = self.profiler.request_started()
         
         # Default headers
-        default_headers = {'Content-Type': 'application/json'}
-        if headers:
-            default_headers.update(headers)
+        with self.profiler.stage('headers'):
+            default_headers = {'Content-Type': 'application/json'}
+            if headers:
+                default_headers.update(headers)
         
         try:
-            start_time = time.time()
-            
             if method == 'GET':
-                response = self.session.get(url, headers=default_headers, timeout=TIMEOUT)
+                response = session.get(url, headers=default_headers, timeout=timeout)
             elif method == 'POST':
-                response = self.session.post(url, json=payload, headers=default_headers, timeout=TIMEOUT)
+                response = session.post(url, json=payload, headers=default_headers, timeout=timeout)
             elif method == 'PUT':
-                response = self.session.put(url, json=payload, headers=default_headers, timeout=TIMEOUT)
+                response = session.put(url, json=payload, headers=default_headers, timeout=timeout)
             elif method == 'DELETE':
-                response = self.session.delete(url, headers=default_headers, timeout=TIMEOUT)
+                response = session.delete(url, headers=default_headers, timeout=timeout)
             else:
                 return False, f"Unsupported method: {method}", 0, None
             
-            response_time = time.time() - start_time
+            response_time = time.perf_counter() - start_time
+            self.profiler.request_finished(key, cpu_start, response_time)
+            self.record_phases(key, response)
             
             # Try to parse JSON response
-            try:
-                data = response.json()
-            except json.JSONDecodeError:
-                data = {"raw_response": response.text}
+            with self.profiler.stage('json_decode'):
+                try:
+                    data = response.json()
+                except json.JSONDecodeError:
+                    data = {"raw_response": response.text}
             
             # Check HTTP status code
             if response.status_code not in [200, 201]:
                 return False, f"HTTP {response.status_code}: {response.text[:200]}", response_time, data
             
+            # Routes in the schema registry must also return the documented shape
+            with self.profiler.stage('schema_check'):
+                problem = validate_response(endpoint, data)
+            if problem:
+                return False, f"Schema mismatch: {problem}", response_time, data
+            
+            if functional:
+                self.timeouts.record(key, response_time)
             return True, f"Success - Status: {response.status_code}", response_time, data
             
         except requests.exceptions.Timeout:
-            return False, f"Request timeout after {TIMEOUT}s", TIMEOUT, None
+            if functional:
+                self.timeouts.record_timeout(key, timeout)
+            learned = f" (learned timeout, fixed limit {TIMEOUT}s)" if timeout < TIMEOUT else ""
+            return False, f"Request timeout after {timeout:g}s{learned}", timeout if intended_start is None else time.perf_counter() - start_time, None
+        except CircuitOpenError as e:
+            return False, f"Not sent - {e}", 0, None
         except requests.exceptions.ConnectionError:
-            return False, "Connection error - server may be down", 0, None
+            return False, "Connection error - server may be down", 0 if intended_start is None else time.perf_counter() - start_time, None
         except Exception as e:
-            return False, f"Unexpected error: {str(e)}", 0, None
+            return False, f"Unexpected error: {str(e)}", 0 if intended_start is None else time.perf_counter() - start_time, None
+    
+    def record_phases(self, label: str, response: requests.Response):
+        """Keep DNS, connect, TLS, time-to-first-byte and body-read timings per endpoint"""
+        timings = getattr(response, 'phase_timings', None)
+        if timings is None:
+            return
+        
+        with self._lock:
+            entry = self.phase_timings.setdefault(label, {
+                'phases': {phase: LatencyHistogram() for phase in PHASES},
+                'responses': 0,
+                'wire_bytes': 0
+            })
+            for phase, seconds in timings.items():
+                entry['phases'][phase].record(seconds * 1000)
+            entry['responses'] += 1
+            entry['wire_bytes'] += getattr(response, 'wire_bytes', 0)
     
     def test_health_check(self):
         """Test health check endpoint"""
@@ -93,12 +290,7 @@ class KairoAPITester:
     
     def test_demo_account_login(self):
         """Test demo account login"""
-        payload = {
-            "email": "demo.user.2025@kairo.test",
-            "password": "DemoAccess2025!"
-        }
-        
-        success, details, response_time, data = self.make_request('POST', 'auth/signin', payload)
+        success, details, response_time, data = self.make_request('POST', 'auth/signin', DEMO_CREDENTIALS)
         
         if success and data and 'user' in data:
             self.is_authenticated = True
@@ -173,12 +365,7 @@ class KairoAPITester:
     
     def test_integrations_test(self):
         """Test integrations test endpoint"""
-        payload = {
-            "integration": "test",
-            "action": "validate_connection"
-        }
-        
-        success, details, response_time, data = self.make_request('POST', 'integrations/test', payload)
+        success, details, response_time, data = self.make_request('POST', 'integrations/test', INTEGRATIONS_TEST_PAYLOAD)
         self.log_result('POST /api/integrations/test', 'PASS' if success else 'FAIL', response_time, details)
         return success
     
@@ -191,108 +378,57 @@ class KairoAPITester:
     # God-tier endpoints testing
     def test_quantum_simulation(self):
         """Test Quantum Simulation Engine"""
-        payload = {
-            "workflowData": {
-                "id": "workflow_quantum_test_001",
-                "name": "Advanced Quantum Workflow",
-                "nodes": [
-                    {"id": "node_1", "type": "data_processor", "category": "quantum"},
-                    {"id": "node_2", "type": "ml_predictor", "category": "ai"},
-                    {"id": "node_3", "type": "result_aggregator", "category": "output"}
-                ]
-            },
-            "simulationParams": {
-                "accuracy_target": 99.1,
-                "quantum_coherence_required": True,
-                "timeline_analysis": True
-            }
-        }
-        
-        success, details, response_time, data = self.make_request('POST', 'quantum-simulation', payload)
+        success, details, response_time, data = self.make_request('POST', 'quantum-simulation', QUANTUM_SIMULATION_PAYLOAD)
         self.log_result('POST /api/quantum-simulation', 'PASS' if success else 'FAIL', response_time, details)
         return success
     
     def test_hipaa_compliance(self):
         """Test HIPAA Compliance Pack"""
-        payload = {
-            "workflowData": {
-                "id": "healthcare_workflow_001",
-                "name": "Patient Data Processing Workflow",
-                "nodes": [
-                    {"id": "phi_collector", "type": "data_input", "category": "healthcare", "config": {"contains_phi": True}},
-                    {"id": "phi_processor", "type": "data_transform", "category": "healthcare"},
-                    {"id": "audit_logger", "type": "compliance", "category": "security"}
-                ]
-            },
-            "complianceLevel": "full"
-        }
-        
-        success, details, response_time, data = self.make_request('POST', 'hipaa-compliance', payload)
+        success, details, response_time, data = self.make_request('POST', 'hipaa-compliance', HIPAA_COMPLIANCE_PAYLOAD)
         self.log_result('POST /api/hipaa-compliance', 'PASS' if success else 'FAIL', response_time, details)
         return success
     
     def test_reality_fabricator(self):
         """Test Reality Fabricator API"""
-        payload = {
-            "action": "optimize_smart_building_climate",
-            "deviceId": "building_hvac_system_001",
-            "parameters": {
-                "deviceType": "smart_hvac",
-                "location": "Corporate Headquarters Floor 15",
-                "scope": "building_wide",
-                "target_temperature": 72,
-                "energy_efficiency_mode": True
-            }
-        }
-        
-        success, details, response_time, data = self.make_request('POST', 'reality-fabricator', payload)
+        success, details, response_time, data = self.make_request('POST', 'reality-fabricator', REALITY_FABRICATOR_PAYLOAD)
         self.log_result('POST /api/reality-fabricator', 'PASS' if success else 'FAIL', response_time, details)
         return success
     
     def test_auto_compliance(self):
         """Test Auto-Compliance Generator"""
-        payload = {
-            "regulationText": "All financial transactions must maintain audit trails for 7 years with immutable storage and real-time monitoring capabilities",
-            "industry": "financial_services",
-            "jurisdiction": "US"
-        }
-        
-        success, details, response_time, data = self.make_request('POST', 'auto-compliance', payload)
+        success, details, response_time, data = self.make_request('POST', 'auto-compliance', AUTO_COMPLIANCE_PAYLOAD)
         self.log_result('POST /api/auto-compliance', 'PASS' if success else 'FAIL', response_time, details)
         return success
     
     def test_global_consciousness(self):
         """Test Global Consciousness Feed"""
-        payload = {
-            "feedType": "real_time_global_intelligence",
-            "dataFilters": {
-                "geographic_scope": "worldwide",
-                "data_categories": ["iot_sensors", "social_signals", "economic_indicators"],
-                "intelligence_level": "collective_wisdom"
-            },
-            "aggregationLevel": "global_synthesis"
-        }
-        
-        success, details, response_time, data = self.make_request('POST', 'global-consciousness', payload)
+        success, details, response_time, data = self.make_request('POST', 'global-consciousness', GLOBAL_CONSCIOUSNESS_PAYLOAD)
         self.log_result('POST /api/global-consciousness', 'PASS' if success else 'FAIL', response_time, details)
         return success
     
-    def test_trinity_endpoints(self):
-        """Test Trinity API endpoints"""
-        # Test miracles endpoint
-        payload = {"miracle_type": "workflow_optimization", "intensity": "divine"}
-        success, details, response_time, data = self.make_request('POST', 'trinity/miracles', payload)
+    def test_trinity_miracles(self):
+        """Test Trinity miracles endpoint"""
+        success, details, response_time, data = self.make_request('POST', 'trinity/miracles', TRINITY_MIRACLES_PAYLOAD)
         self.log_result('POST /api/trinity/miracles', 'PASS' if success else 'FAIL', response_time, details)
-        
-        # Test prophecy endpoint
-        payload = {"prophecy_request": "future_automation_trends", "timeline": "next_quarter"}
-        success, details, response_time, data = self.make_request('POST', 'trinity/prophecy', payload)
+        return success
+    
+    def test_trinity_prophecy(self):
+        """Test Trinity prophecy endpoint"""
+        success, details, response_time, data = self.make_request('POST', 'trinity/prophecy', TRINITY_PROPHECY_PAYLOAD)
         self.log_result('POST /api/trinity/prophecy', 'PASS' if success else 'FAIL', response_time, details)
-        
-        # Test temporal throne endpoint
-        payload = {"temporal_action": "timeline_analysis", "scope": "enterprise_wide"}
-        success, details, response_time, data = self.make_request('POST', 'trinity/temporal-throne', payload)
+        return success
+    
+    def test_trinity_temporal_throne(self):
+        """Test Trinity temporal throne endpoint"""
+        success, details, response_time, data = self.make_request('POST', 'trinity/temporal-throne', TRINITY_TEMPORAL_THRONE_PAYLOAD)
         self.log_result('POST /api/trinity/temporal-throne', 'PASS' if success else 'FAIL', response_time, details)
+        return success
+    
+    def test_trinity_endpoints(self):
+        """Test Trinity API endpoints"""
+        self.test_trinity_miracles()
+        self.test_trinity_prophecy()
+        self.test_trinity_temporal_throne()
     
     def test_god_tier_dashboard(self):
         """Test God-tier dashboard endpoint"""
@@ -304,60 +440,187 @@ class KairoAPITester:
         self.log_result('GET /api/god-tier/dashboard', 'PASS' if success else 'FAIL', response_time, details)
         return success
     
-    def run_all_tests(self):
-        """Run comprehensive API test suite"""
-        print("=" * 80)
-        print("KAIRO AI PLATFORM - COMPREHENSIVE API TESTING")
-        print("=" * 80)
-        print(f"Testing against: {BASE_URL}")
-        print(f"Timeout: {TIMEOUT}s")
-        print("-" * 80)
-        
-        # Core system tests
-        print("\n🔧 CORE SYSTEM TESTS")
+    def run_test_graph(self, max_workers: int = MAX_WORKERS):
+        """Run TEST_PLAN with independent checks in parallel, each check once its dependencies are done"""
+        print(f"\n🧵 FUNCTIONAL TESTS ({max_workers} in parallel)")
         print("-" * 40)
-        self.test_health_check()
-        self.test_demo_test()
-        
-        # Authentication tests
-        print("\n🔐 AUTHENTICATION TESTS")
+        # One keep-alive connection per worker, opened before any check is timed
+        warm_up(self.session, BASE_URL, connections=max_workers)
+        graph = TaskGraph()
+        for _, checks in TEST_PLAN:
+            for name, depends_on in checks:
+                graph.add(name, getattr(self, name), depends_on)
+        self.graph_results = graph.run(max_workers)
+        for line in format_graph_report(self.graph_results):
+            print(line)
+        return self.graph_results
+    
+    def _worker_session(self) -> requests.Session:
+        """Independent pooled session that shares the demo login cookies, or the synthetic user pool"""
+        if self.session_pool:
+            return self.session_pool
+        return clone_session(self.session)
+    
+    def build_session_pool(self, users: int):
+        """Sign in `users` synthetic users so authenticated load is spread across distinct sessions"""
+        print("\n👥 SESSION POOL")
         print("-" * 40)
-        self.test_demo_account_login()
-        self.test_auth_me()
-        
-        # User management tests
-        print("\n👤 USER MANAGEMENT TESTS")
+        self.session_pool, report = build_session_pool(BASE_URL, users)
+        print_build_report(report)
+        if not len(self.session_pool):
+            self.session_pool = None
+        return report
+    
+    def run_concurrency_sweep(self, max_workers: int, step_duration: float = STEP_DURATION):
+        """Step concurrency up for every covered endpoint and report its saturation knee"""
+        print("\n📈 CONCURRENCY SWEEP")
         print("-" * 40)
-        self.test_user_profile()
-        self.test_user_activity()
-        self.test_notifications()
-        self.test_learning_progress()
+        print(f"Levels up to {max_workers} workers, {step_duration}s per step")
         
-        # Performance tests
-        print("\n⚡ PERFORMANCE TESTS")
-        print("-" * 40)
-        self.test_performance_metrics()
-        self.test_performance_cache_status()
+        self.sweep_results = {}
+        for label, method, endpoint, payload, requires_auth in ENDPOINT_CATALOG:
+            if requires_auth and not self.is_authenticated:
+                print(f"\n{label}: SKIP - Not authenticated")
+                continue
+            
+            def request_fn(session, method=method, endpoint=endpoint, payload=payload):
+                success, _, response_time, _ = self.make_request(method, endpoint, payload, session=session)
+                return success, response_time
+            
+            print(f"\n{label}:")
+            result = sweep(request_fn, self._worker_session, max_workers, step_duration,
+                           on_step=lambda step: print(
+                               f"  {step['workers']:>4} workers: {step['throughput_rps']:>9.2f} req/s, "
+                               f"p50 {step['p50_ms']:.2f}ms, p99 {step['p99_ms']:.2f}ms"
+                               + (f", {step['failures']} failed ({step['error_rate'] * 100:.1f}%)"
+                                  if step['failures'] else "")))
+            self.sweep_results[label] = result
+            
+            analysis = result['analysis']
+            if analysis['knee_workers'] is None:
+                print("  No step had successful requests, so there is no knee")
+                continue
+            print(f"  Peak throughput: {analysis['peak_rps']:.2f} req/s, knee at {analysis['knee_workers']} workers")
+            if analysis['plateau_workers']:
+                print(f"  Throughput plateaus after {analysis['plateau_workers']} workers")
+            if analysis['tail_break_workers']:
+                print(f"  p99 breaks away at {analysis['tail_break_workers']} workers")
+        
+        return self.sweep_results
+    
+    def run_cache_probe(self, rounds: int):
+        """Repeat every covered endpoint and split its latency into cache hits and misses"""
+        from cache_probe import CacheProbe, print_probe_report
         
-        # Integration tests
-        print("\n🔗 INTEGRATION TESTS")
+        print("\n🧊 CACHE HIT/MISS PROBE")
         print("-" * 40)
-        self.test_integrations_test()
-        
-        # God-tier feature tests
-        print("\n🚀 GOD-TIER FEATURE TESTS")
+        catalog = [entry for entry in ENDPOINT_CATALOG if self.is_authenticated or not entry[4]]
+        report = CacheProbe(BASE_URL, self.session).run(catalog, rounds)
+        print_probe_report(report)
+        self.cache_probe_results = report
+        return report
+    
+    def run_scheduled_load(self, rate: float, duration: float):
+        """Cycle the covered endpoints on a fixed-rate schedule with coordinated-omission-corrected latency"""
+        print("\n⏰ SCHEDULED-SEND LOAD")
         print("-" * 40)
-        self.test_quantum_simulation()
-        self.test_hipaa_compliance()
-        self.test_reality_fabricator()
-        self.test_auto_compliance()
-        self.test_global_consciousness()
-        self.test_god_tier_dashboard()
-        
-        # Trinity tests
-        print("\n✨ TRINITY TESTS")
+        
+        def scheduled_send(method, endpoint, payload, session):
+            def send(intended_start):
+                success, _, response_time, _ = self.make_request(method, endpoint, payload, session=session,
+                                                                 intended_start=intended_start)
+                return success, response_time
+            return send
+        
+        sends = [(label, scheduled_send(method, endpoint, payload, self.session_pool if requires_auth else None))
+                 for label, method, endpoint, payload, requires_auth in ENDPOINT_CATALOG
+                 if self.is_authenticated or not requires_auth]
+        report = ScheduledSender(rate).run(sends, duration)
+        for line in format_scheduled_report(report):
+            print(line)
+        
+        self.scheduled_results = report
+        return report
+    
+    def run_load_profile(self, profile: str, rate: float, duration: float, only: List[str] = None,
+                         monitor_interval: float = None, timeline: bool = False, timeline_out: str = None):
+        """Drive the covered endpoints (or just `only`) through a named ramp/step/spike/soak profile
+
+        Server metrics are polled for leaks every `monitor_interval` seconds, by default only during a soak.
+        With `timeline`, per-second client latency is reported next to the server metrics of that second.
+        """
+        print(f"\n🎢 {profile.upper()} LOAD PROFILE")
         print("-" * 40)
-        self.test_trinity_endpoints()
+        catalog = [entry for entry in ENDPOINT_CATALOG if self.is_authenticated or not entry[4]]
+        targets = catalog_targets(BASE_URL, catalog, only)
+        if not targets:
+            print(f"No covered endpoint matches {only}")
+            return None
+        phases = PROFILES[profile](rate, duration)
+        print(f"{len(targets)} endpoints, phases: {', '.join(phase.name for phase in phases)}")
+        
+        if monitor_interval is None:
+            monitor_interval = MONITOR_INTERVAL if profile == 'soak' else 0
+        timeline = MetricTimeline(BASE_URL, clone_session(self.session)).start() if timeline or timeline_out else None
+        poller = timeline.poller if timeline else None
+        if poller is None and monitor_interval > 0:
+            poller = MetricsPoller(BASE_URL, clone_session(self.session), monitor_interval).start()
+        
+        engine = ProfileLoadEngine(session_factory=self._worker_session,
+                                   on_sample=timeline.on_sample if timeline else None, profiler=self.profiler)
+        report = engine.run_profile(targets, phases)
+        if poller is not None:
+            poller.stop()
+        for line in format_profile_report(report):
+            print(line)
+        
+        if timeline is not None:
+            self.timeline_rows = timeline.rows()
+            spikes = find_spikes(self.timeline_rows)
+            for line in format_timeline(self.timeline_rows, spikes, notes=timeline.poller.notes()):
+                print(line)
+            if timeline_out:
+                write_timeline(timeline_out, self.timeline_rows, spikes, timeline.window)
+                print(f"Timeline written to {timeline_out}")
+        
+        if monitor_interval > 0:
+            self.leak_results = poller.analyze()
+            print("Server metrics:")
+            for line in format_leak_report(self.leak_results):
+                print(line)
+        
+        self.profile_results = report
+        return report
+    
+    def run_all_tests(self, sweep_max_workers: int = None, sweep_step_duration: float = STEP_DURATION,
+                      scheduled_rate: float = None, scheduled_duration: float = 30.0, session_pool_users: int = None,
+                      cache_probe_rounds: int = None, profile: str = None, profile_rate: float = 100.0,
+                      profile_duration: float = 60.0, profile_only: List[str] = None,
+                      monitor_interval: float = None, timeline: bool = False, timeline_out: str = None,
+                      parallel: int = None):
+        """Run comprehensive API test suite; with `parallel`, independent checks run on that many threads"""
+        print("=" * 80)
+        print("KAIRO AI PLATFORM - COMPREHENSIVE API TESTING")
+        print("=" * 80)
+        print(f"Testing against: {BASE_URL}")
+        print(f"Timeout: {TIMEOUT}s" + (f", per endpoint from {self.timeouts.path} where learned" if self.timeouts else ""))
+        print("-" * 80)
+        
+        # Open the keep-alive connection before anything is timed
+        warm_up(self.session, BASE_URL)
+        
+        self.profiler.begin("functional checks")
+        if parallel:
+            self.run_test_graph(parallel)
+        else:
+            for section, checks in TEST_PLAN:
+                print(f"\n{section}")
+                print("-" * 40)
+                for name, _ in checks:
+                    getattr(self, name)()
+        self.profiler.end()
+        if self.timeouts:
+            self.timeouts.save()
         
         # Print comprehensive summary
         print("\n" + "=" * 80)
@@ -390,6 +653,22 @@ class KairoAPITester:
             print(f"  Fastest Response: {min(response_times):.2f}ms")
             print(f"  Slowest Response: {max(response_times):.2f}ms")
         
+        if self.phase_timings:
+            print("\n🔬 REQUEST PHASES (p50 ms, TTFB = server compute, body = transfer):")
+            print(f"  {'Endpoint':<40} {'dns':>7} {'connect':>8} {'tls':>7} {'ttfb':>8} {'body':>8} {'avg bytes':>10}")
+            for label, entry in self.phase_timings.items():
+                p50 = {phase: histogram.percentile(50) for phase, histogram in entry['phases'].items()}
+                avg_bytes = entry['wire_bytes'] / entry['responses'] if entry['responses'] else 0
+                print(f"  {label:<40} {p50['dns']:>7.2f} {p50['connect']:>8.2f} {p50['tls']:>7.2f} "
+                      f"{p50['ttfb']:>8.2f} {p50['body']:>8.2f} {avg_bytes:>10.0f}")
+        
+        tripped = [status for status in breaker_report().values() if status['trips']]
+        if tripped:
+            print("\n🔌 CIRCUIT BREAKER:")
+            for status in tripped:
+                print(f"  {status['origin']}: {status['state']}, tripped {status['trips']}x, "
+                      f"{status['short_circuited']} requests not sent")
+        
         # Authentication status
         print(f"\n🔑 AUTHENTICATION STATUS:")
         print(f"  Demo Account Login: {'✅ Success' if self.is_authenticated else '❌ Failed'}")
@@ -398,10 +677,79 @@ class KairoAPITester:
         
         print("=" * 80)
         
-        # Return success status
-        return self.failed_tests == 0
+        # Optional saturation analysis, after the functional pass so login cookies are available
+        if cache_probe_rounds:
+            self.run_cache_probe(cache_probe_rounds)
+            print("=" * 80)
+        if session_pool_users and (sweep_max_workers or scheduled_rate or profile):
+            self.build_session_pool(session_pool_users)
+            print("=" * 80)
+        if sweep_max_workers:
+            self.profiler.begin("concurrency sweep")
+            self.run_concurrency_sweep(sweep_max_workers, sweep_step_duration)
+            self.profiler.end()
+            print("=" * 80)
+        if scheduled_rate:
+            self.profiler.begin(f"scheduled load at {scheduled_rate:g} req/s")
+            self.run_scheduled_load(scheduled_rate, scheduled_duration)
+            self.profiler.end()
+            print("=" * 80)
+        if profile:
+            self.profiler.begin(f"{profile} profile at {profile_rate:g} req/s")
+            self.run_load_profile(profile, profile_rate, profile_duration, profile_only, monitor_interval, timeline,
+                                  timeline_out)
+            self.profiler.end()
+            print("=" * 80)
+        if self.profiler.enabled:
+            self.harness_results = self.profiler.report()
+            print("\n🩺 HARNESS OVERHEAD (client CPU inside each timed request, and around it)")
+            print("-" * 40)
+            for line in format_harness_report(self.harness_results):
+                print(line)
+            if not self.harness_results['saturated']:
+                print("  ✅ Harness not saturated; reported latencies are server and network time")
+            print("=" * 80)
+        
+        # Return success status; a leak found during a soak fails the run as well
+        return self.failed_tests == 0 and not self.leak_results.get('suspects')
 
 if __name__ == "__main__":
-    tester = KairoAPITester()
-    success = tester.run_all_tests()
+    parser = argparse.ArgumentParser(description="Kairo comprehensive API testing")
+    parser.add_argument("--parallel", type=int, nargs="?", const=MAX_WORKERS, metavar="WORKERS",
+                        help=f"Run independent checks in parallel along their dependency graph (default {MAX_WORKERS} workers)")
+    parser.add_argument("--sweep", type=int, metavar="N", help="Sweep concurrency 1, 2, 4 ... N workers per endpoint")
+    parser.add_argument("--step-duration", type=float, default=STEP_DURATION, help="Seconds per concurrency step")
+    parser.add_argument("--scheduled-rate", type=float, metavar="RPS",
+                        help="Scheduled-send load with latency measured from each request's intended start")
+    parser.add_argument("--scheduled-duration", type=float, default=30.0, help="Scheduled load duration in seconds")
+    parser.add_argument("--session-pool", type=int, metavar="USERS",
+                        help="Spread authenticated sweep/scheduled load across this many synthetic users")
+    parser.add_argument("--cache-probe", type=int, metavar="ROUNDS",
+                        help="Repeat each endpoint ROUNDS times and split latency into cache hits and misses")
+    parser.add_argument("--profile", choices=sorted(PROFILES), help="Drive the endpoints through a named load profile")
+    parser.add_argument("--profile-rate", type=float, default=100.0,
+                        help="Peak (ramp, step, spike) or steady (soak) rate of the load profile in req/s")
+    parser.add_argument("--profile-duration", type=float, default=60.0, help="Load profile length in seconds")
+    parser.add_argument("--profile-only", action="append", metavar="ENDPOINT",
+                        help="Limit the load profile to these endpoints, e.g. reality-fabricator (repeatable)")
+    parser.add_argument("--monitor-interval", type=float,
+                        help="Poll server metrics for leaks every N seconds of the profile (default: 10 for soak)")
+    parser.add_argument("--timeline", action="store_true",
+                        help="Report the load profile per second, next to the server metrics for that second")
+    parser.add_argument("--timeline-out", metavar="PATH", help="Write every timeline window to a JSON file")
+    parser.add_argument("--fixed-timeout", action="store_true",
+                        help=f"Use the fixed {TIMEOUT}s timeout instead of per-endpoint timeouts learned from history")
+    parser.add_argument("--results", metavar="PATH", help="Append every test result to this file as NDJSON")
+    parser.add_argument("--profile-harness", action="store_true",
+                        help="Measure client CPU per request and warn when the load generator is saturated")
+    args = parser.parse_args()
+    
+    tester = KairoAPITester(adaptive_timeouts=not args.fixed_timeout, results_path=args.results,
+                            profile_harness=args.profile_harness)
+    success = tester.run_all_tests(args.sweep, args.step_duration, args.scheduled_rate, args.scheduled_duration,
+                                   args.session_pool, args.cache_probe, args.profile, args.profile_rate,
+                                   args.profile_duration, args.profile_only, args.monitor_interval, args.timeline,
+                                   args.timeline_out, args.parallel)
+    if tester.sink:
+        tester.sink.close()
     sys.exit(0 if success else 1)
\ No newline at end of file
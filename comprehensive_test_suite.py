@@ -3,30 +3,75 @@
 Comprehensive Test Suite for Kairo AI Platform
 Tests all critical API endpoints and god-tier features
 
-Usage: python comprehensive_test_suite.py
+Usage: python comprehensive_test_suite.py [base_url]
+       python comprehensive_test_suite.py [base_url] --samples 20
+       python comprehensive_test_suite.py [base_url] --rate 50 --duration 30
+       python comprehensive_test_suite.py [base_url] --rate 500 --duration 600 --results run.ndjson --quiet
+       python comprehensive_test_suite.py [base_url] --rate 500 --duration 30 --profile-harness
+
+Log lines and results go through a buffered sink: the console is written by a background thread, and
+--results also streams every event, failure and load request to an NDJSON file.
 """
 
+import argparse
 import requests
 import json
 import time
 import sys
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from collections import deque
+from typing import Dict, Any, List, Optional
+from datetime import timedelta
+
+from harness_profiler import HarnessProfiler, format_harness_report
+from http_client import clone_session, create_session, warm_up
+from latency_histogram import LatencyHistogram, format_summary
+from load_engine import LoadTarget, OpenLoopLoadEngine, format_report
+from response_schemas import validate_response
+from result_sink import ResultSink
+
+# Benchmarks are judged on this percentile of every recorded sample, not on a single request
+BENCHMARK_PERCENTILE = 99
+DEFAULT_SAMPLES = 5
+MAX_ERRORS = 1000         # Failures kept in memory for the summary; --results keeps all of them
+QUIET_LEVELS = {'START', 'FAIL', 'ERROR', 'WARN', 'LOAD', 'RESULT'}
+
+REALITY_FABRICATOR_PAYLOAD = {
+    "workflowData": {
+        "nodes": [
+            {"type": "trigger", "id": "node1"},
+            {"type": "ai_processor", "id": "node2"}
+        ]
+    },
+    "fabricationParams": {
+        "complexity_level": "advanced",
+        "reality_coherence": 0.95
+    }
+}
 
 class KairoTestSuite:
-    def __init__(self, base_url: str = "http://localhost:3000"):
+    def __init__(self, base_url: str = "http://localhost:3000", samples: int = DEFAULT_SAMPLES,
+                 results_path: Optional[str] = None, quiet: bool = False, profile_harness: bool = False):
         self.base_url = base_url
-        self.session = requests.Session()
+        self.samples = max(1, samples)
+        self.session = create_session()
+        self.sink = ResultSink(results_path, console_levels=QUIET_LEVELS if quiet else None)
+        self.profiler = HarnessProfiler(enabled=profile_harness)
         self.test_results = {
             "passed": 0,
             "failed": 0, 
-            "errors": [],
+            "errors": deque(maxlen=MAX_ERRORS),
             "performance_metrics": {}
         }
         
     def log(self, message: str, level: str = "INFO"):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] {level}: {message}")
+        with self.profiler.stage('logging'):
+            self.sink.emit({'level': level, 'message': message})
+        
+    def record_error(self, error: Dict[str, Any]):
+        """Count a failure, keep it for the summary and stream it to the results file"""
+        self.test_results["failed"] += 1
+        self.test_results["errors"].append(error)
+        self.sink.emit({'event': 'error', **error})
         
     def assert_response(self, response: requests.Response, expected_status: int = 200, test_name: str = ""):
         """Assert response status and log results"""
@@ -36,8 +81,7 @@ class KairoTestSuite:
                 self.log(f"✅ {test_name} - PASSED ({response.status_code})", "PASS")
                 return True
             else:
-                self.test_results["failed"] += 1
-                self.test_results["errors"].append({
+                self.record_error({
                     "test": test_name,
                     "expected": expected_status,
                     "actual": response.status_code,
@@ -46,8 +90,7 @@ class KairoTestSuite:
                 self.log(f"❌ {test_name} - FAILED (Expected: {expected_status}, Got: {response.status_code})", "FAIL")
                 return False
         except Exception as e:
-            self.test_results["failed"] += 1
-            self.test_results["errors"].append({
+            self.record_error({
                 "test": test_name,
                 "error": str(e),
                 "response": response.text[:200] if response else "No response"
@@ -56,14 +99,16 @@ class KairoTestSuite:
             return False
             
     def measure_performance(self, func, test_name: str):
-        """Measure API response time"""
-        start_time = time.time()
-        result = func()
-        end_time = time.time()
-        
-        response_time = (end_time - start_time) * 1000  # Convert to milliseconds
-        self.test_results["performance_metrics"][test_name] = response_time
-        self.log(f"⏱️  {test_name} - Response Time: {response_time:.2f}ms", "PERF")
+        """Measure API response time, keeping every sample in a per-endpoint latency histogram"""
+        histogram = self.test_results["performance_metrics"].setdefault(test_name, LatencyHistogram())
+        
+        result = None
+        for _ in range(self.samples):
+            start_time = time.perf_counter()
+            result = func()
+            histogram.record((time.perf_counter() - start_time) * 1000)  # Convert to milliseconds
+            
+        self.log(f"⏱️  {test_name} - {format_summary(histogram.summary())}", "PERF")
         
         return result
         
@@ -79,9 +124,11 @@ class KairoTestSuite:
         if self.assert_response(response, 200, "Health Check"):
             try:
                 data = response.json()
-                if data.get("success") and data.get("data", {}).get("status") in ["healthy", "degraded"]:
+                problem = validate_response("health", data)
+                if problem is None:
                     self.log(f"Health Status: {data['data']['status']}", "INFO")
                     return True
+                self.log(f"Health check response shape: {problem}", "ERROR")
             except Exception as e:
                 self.log(f"Health check response parsing failed: {e}", "ERROR")
         return False
@@ -107,9 +154,11 @@ class KairoTestSuite:
         if self.assert_response(response, 200, "Demo Account Login"):
             try:
                 data = response.json()
-                if "user" in data and data["user"].get("id"):
+                problem = validate_response("auth/signin", data)
+                if problem is None:
                     self.log(f"Logged in as: {data['user']['email']}", "INFO")
                     return True
+                self.log(f"Login response shape: {problem}", "ERROR")
             except Exception as e:
                 self.log(f"Login response parsing failed: {e}", "ERROR")
         return False
@@ -124,12 +173,13 @@ class KairoTestSuite:
         response = self.measure_performance(auth_me_request, "Auth Me Endpoint")
         success = self.assert_response(response, 200, "Auth Me Performance")
         
-        # Check if response time is under performance target
-        response_time = self.test_results["performance_metrics"].get("Auth Me Endpoint", 0)
+        # Check if tail response time is under performance target
+        histogram = self.test_results["performance_metrics"].get("Auth Me Endpoint")
+        response_time = histogram.percentile(BENCHMARK_PERCENTILE) if histogram else 0
         if response_time > 1000:  # 1 second threshold
-            self.log(f"⚠️  Auth/Me response time ({response_time:.2f}ms) exceeds 1000ms target", "WARN")
+            self.log(f"⚠️  Auth/Me p{BENCHMARK_PERCENTILE} response time ({response_time:.2f}ms) exceeds 1000ms target", "WARN")
         else:
-            self.log(f"🚀 Auth/Me performance optimized: {response_time:.2f}ms", "PASS")
+            self.log(f"🚀 Auth/Me performance optimized: p{BENCHMARK_PERCENTILE} {response_time:.2f}ms", "PASS")
             
         return success
         
@@ -147,10 +197,12 @@ class KairoTestSuite:
         if success:
             try:
                 data = response.json()
-                if data.get("success") and "notifications" in data.get("data", {}):
+                problem = validate_response("notifications", data)
+                if problem is None:
                     notifications = data["data"]["notifications"]
                     self.log(f"Retrieved {len(notifications)} notifications", "INFO")
                     return True
+                self.log(f"Notifications response shape: {problem}", "ERROR")
             except Exception as e:
                 self.log(f"Notifications response parsing failed: {e}", "ERROR")
         return False
@@ -168,7 +220,8 @@ class KairoTestSuite:
         if success:
             try:
                 data = response.json()
-                if data.get("success") and "progress" in data.get("data", {}):
+                problem = validate_response("learning/progress", data)
+                if problem is None:
                     progress = data["data"]["progress"]
                     certifications = data["data"].get("certifications", [])
                     statistics = data["data"].get("statistics", {})
@@ -176,6 +229,7 @@ class KairoTestSuite:
                     self.log(f"Learning Progress: {len(progress)} courses, {len(certifications)} certifications", "INFO")
                     self.log(f"Statistics: {statistics.get('averageProgress', 0)}% average progress", "INFO")
                     return True
+                self.log(f"Learning progress response shape: {problem}", "ERROR")
             except Exception as e:
                 self.log(f"Learning progress response parsing failed: {e}", "ERROR")
         return False
@@ -184,23 +238,10 @@ class KairoTestSuite:
         """Test Reality Fabricator god-tier feature"""
         self.log("Testing Reality Fabricator API...", "TEST")
         
-        test_data = {
-            "workflowData": {
-                "nodes": [
-                    {"type": "trigger", "id": "node1"},
-                    {"type": "ai_processor", "id": "node2"}
-                ]
-            },
-            "fabricationParams": {
-                "complexity_level": "advanced",
-                "reality_coherence": 0.95
-            }
-        }
-        
         def reality_fabricator_request():
             return self.session.post(
                 f"{self.base_url}/api/reality-fabricator",
-                json=test_data,
+                json=REALITY_FABRICATOR_PAYLOAD,
                 headers={"Content-Type": "application/json"}
             )
             
@@ -297,20 +338,69 @@ class KairoTestSuite:
         
         for test_name, target in targets.items():
             if test_name in metrics:
-                actual = metrics[test_name]
+                histogram = metrics[test_name]
+                actual = histogram.percentile(BENCHMARK_PERCENTILE)
+                label = f"p{BENCHMARK_PERCENTILE} of {len(histogram)}"
                 total_benchmarks += 1
                 
                 if actual <= target:
                     passed_benchmarks += 1
-                    self.log(f"🚀 {test_name}: {actual:.2f}ms ≤ {target}ms (PASSED)", "PERF")
+                    self.log(f"🚀 {test_name}: {actual:.2f}ms ({label}) ≤ {target}ms (PASSED)", "PERF")
                 else:
-                    self.log(f"⚠️  {test_name}: {actual:.2f}ms > {target}ms (NEEDS OPTIMIZATION)", "PERF")
+                    self.log(f"⚠️  {test_name}: {actual:.2f}ms ({label}) > {target}ms (NEEDS OPTIMIZATION)", "PERF")
                     
         benchmark_score = (passed_benchmarks / total_benchmarks * 100) if total_benchmarks > 0 else 0
         self.log(f"Performance Benchmark Score: {benchmark_score:.1f}% ({passed_benchmarks}/{total_benchmarks})", "PERF")
         
         return benchmark_score >= 70  # 70% benchmark target
         
+    def load_targets(self) -> List[LoadTarget]:
+        """Endpoints exercised by the test methods, as open-loop load targets"""
+        url = lambda path: f"{self.base_url}/api/{path}"
+        return [
+            LoadTarget("Health Check", "GET", url("health")),
+            LoadTarget("Auth Me Endpoint", "GET", url("auth/me")),
+            LoadTarget("Get Notifications", "GET", url("notifications")),
+            LoadTarget("Get Learning Progress", "GET", url("learning/progress")),
+            LoadTarget("Reality Fabricator", "POST", url("reality-fabricator"), REALITY_FABRICATOR_PAYLOAD),
+            LoadTarget("Trinity Prophecy GET", "GET", url("trinity/prophecy?limit=5"), expected_status=[200, 500]),
+            LoadTarget("Trinity Temporal Throne", "GET", url("trinity/temporal-throne?action=snapshots&limit=5"),
+                       expected_status=[200, 500]),
+            LoadTarget("Trinity Miracles", "GET", url("trinity/miracles?limit=5"), expected_status=[200, 500]),
+        ]
+        
+    def _authenticated_session(self) -> requests.Session:
+        """Fresh pooled session carrying the demo login cookies"""
+        return clone_session(self.session)
+        
+    def run_load_test(self, rate: float, duration: float, arrival: str = "constant") -> bool:
+        """Drive the suite's endpoints at a target arrival rate and report throughput next to latency"""
+        self.log(f"🌊 Open-loop load: {rate} req/s for {duration}s ({arrival} arrivals)", "LOAD")
+        
+        # Every request goes to the results file when there is one; the console only sees the report
+        on_sample = (lambda sample: self.sink.emit({'event': 'request', **sample})) if self.sink.path else None
+        engine = OpenLoopLoadEngine(session_factory=self._authenticated_session, arrival=arrival, on_sample=on_sample,
+                                    profiler=self.profiler)
+        self.profiler.begin(f"open-loop load at {rate:g} req/s")
+        report = engine.run(self.load_targets(), rate, duration)
+        self.profiler.end()
+        self.test_results["load_metrics"] = report
+        
+        for line in format_report(report):
+            self.log(line, "LOAD")
+        if self.profiler.enabled:
+            self.test_results["harness_metrics"] = self.profiler.report()
+            for line in format_harness_report(self.test_results["harness_metrics"]):
+                self.log(line, "WARN" if "⚠️" in line else "LOAD")
+            
+        overall = report["overall"]
+        if overall["achieved_rps"] < rate * 0.9:
+            self.log(f"⚠️  Achieved {overall['achieved_rps']} req/s is below the offered {rate} req/s", "WARN")
+            
+        error_rate = (overall["requests"] - overall["ok"]) / overall["requests"] if overall["requests"] else 1.0
+        self.log(f"Load error rate: {error_rate * 100:.2f}%", "LOAD")
+        return error_rate <= 0.01
+        
     def run_comprehensive_test(self):
         """Run all tests in sequence"""
         self.log("🚀 Starting Comprehensive Kairo AI Test Suite", "START")
@@ -318,6 +408,9 @@ class KairoTestSuite:
         
         start_time = time.time()
         
+        # Open the keep-alive connection before anything is timed
+        warm_up(self.session, self.base_url)
+        
         # Core functionality tests
         tests = [
             ("Health Check", self.test_health_check),
@@ -338,8 +431,7 @@ class KairoTestSuite:
                 test_func()
             except Exception as e:
                 self.log(f"Test {test_name} crashed: {e}", "ERROR")
-                self.test_results["failed"] += 1
-                self.test_results["errors"].append({
+                self.record_error({
                     "test": test_name,
                     "error": f"Test crashed: {str(e)}"
                 })
@@ -360,15 +452,16 @@ class KairoTestSuite:
         
         if self.test_results["errors"]:
             self.log("\n❌ Failed Tests:", "RESULT")
-            for error in self.test_results["errors"][:5]:  # Show first 5 errors
+            for error in list(self.test_results["errors"])[:5]:  # Show first 5 errors
                 self.log(f"  - {error.get('test', 'Unknown')}: {error.get('error', error.get('response', 'Unknown error'))}", "RESULT")
                 
         # Performance summary
         if self.test_results["performance_metrics"]:
             self.log("\n⏱️  Performance Metrics:", "RESULT")
-            for test_name, response_time in self.test_results["performance_metrics"].items():
+            for test_name, histogram in self.test_results["performance_metrics"].items():
+                response_time = histogram.percentile(BENCHMARK_PERCENTILE)
                 status = "🚀" if response_time < 1000 else "⚠️" if response_time < 2000 else "🐌"
-                self.log(f"  {status} {test_name}: {response_time:.2f}ms", "RESULT")
+                self.log(f"  {status} {test_name}: {format_summary(histogram.summary())}", "RESULT")
                 
         # Overall score
         total_tests = self.test_results["passed"] + self.test_results["failed"]
@@ -388,15 +481,28 @@ class KairoTestSuite:
 
 def main():
     """Main test runner"""
-    if len(sys.argv) > 1:
-        base_url = sys.argv[1]
-    else:
-        base_url = "http://localhost:3000"
+    parser = argparse.ArgumentParser(description="Kairo AI Platform test suite")
+    parser.add_argument("base_url", nargs="?", default="http://localhost:3000")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="Requests recorded per endpoint")
+    parser.add_argument("--rate", type=float, help="Run an open-loop load test at this many requests/second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Load test duration in seconds")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="constant")
+    parser.add_argument("--results", metavar="PATH", help="Append every log event, failure and load request as NDJSON")
+    parser.add_argument("--quiet", action="store_true", help="Print only failures, warnings and the summary")
+    parser.add_argument("--profile-harness", action="store_true",
+                        help="Measure client CPU per load request and warn when the load generator is saturated")
+    args = parser.parse_args()
+    base_url = args.base_url
         
     print(f"🔧 Testing Kairo AI Platform at: {base_url}")
     
-    test_suite = KairoTestSuite(base_url)
-    exit_code = test_suite.run_comprehensive_test()
+    test_suite = KairoTestSuite(base_url, args.samples, args.results, args.quiet, args.profile_harness)
+    if args.rate:
+        test_suite.test_demo_account_login()
+        exit_code = 0 if test_suite.run_load_test(args.rate, args.duration, args.arrival) else 1
+    else:
+        exit_code = test_suite.run_comprehensive_test()
+    test_suite.sink.close()
     
     sys.exit(exit_code)
 
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Concurrency Sweep for Kairo API Testing
+Steps closed-loop concurrency up (1, 2, 4, ... N workers) and finds where throughput plateaus and tail latency breaks away
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from latency_histogram import LatencyHistogram
+
+# Configuration
+STEP_DURATION = 5.0
+PLATEAU_GAIN = 0.10      # Less than 10% more throughput for double the workers counts as a plateau
+TAIL_BREAK_FACTOR = 2.0  # p99 more than 2x the single-worker p99 counts as tail latency breaking away
+
+# A request function receives the worker's own session and returns (success, response_time_seconds)
+RequestFn = Callable[[Any], Tuple[bool, float]]
+
+
+def concurrency_levels(max_workers: int) -> List[int]:
+    """Powers of two up to max_workers, always ending at max_workers"""
+    levels = []
+    workers = 1
+    while workers < max_workers:
+        levels.append(workers)
+        workers *= 2
+    levels.append(max_workers)
+    return levels
+
+
+def run_step(request_fn: RequestFn, session_factory: Callable[[], Any], workers: int,
+             duration: float) -> Dict[str, Any]:
+    """Run `workers` closed-loop clients back to back for `duration` seconds
+
+    Throughput and latency cover successful requests only: a refused connection or an open circuit fails in
+    next to no time, and counting it would make a step with the server down look fast.
+    """
+    histogram = LatencyHistogram()
+    failures = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        session = session_factory()
+        local_histogram = LatencyHistogram()
+        local_failures = 0
+        while time.perf_counter() < deadline:
+            success, response_time = request_fn(session)
+            if success:
+                local_histogram.record(response_time * 1000)
+            else:
+                local_failures += 1
+        with lock:
+            histogram.merge(local_histogram)
+            failures[0] += local_failures
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    succeeded = len(histogram)
+    requests = succeeded + failures[0]
+    return {
+        'workers': workers,
+        'requests': requests,
+        'failures': failures[0],
+        'error_rate': round(failures[0] / requests, 4) if requests else 0.0,
+        'throughput_rps': round(succeeded / elapsed, 2) if elapsed > 0 else 0.0,
+        'p50_ms': round(histogram.percentile(50), 2),
+        'p99_ms': round(histogram.percentile(99), 2),
+    }
+
+
+def find_knee(steps: List[Dict[str, Any]]) -> Dict[str, Optional[int]]:
+    """Locate the throughput plateau, the tail-latency break and the best operating point"""
+    analysis = {'plateau_workers': None, 'tail_break_workers': None, 'knee_workers': None, 'peak_rps': 0.0}
+    if not steps:
+        return analysis
+
+    baseline_p99 = steps[0]['p99_ms']
+    analysis['peak_rps'] = max(step['throughput_rps'] for step in steps)
+
+    for previous, current in zip(steps, steps[1:]):
+        if previous['throughput_rps'] <= 0:
+            continue
+        gain = (current['throughput_rps'] - previous['throughput_rps']) / previous['throughput_rps']
+        if gain < PLATEAU_GAIN:
+            analysis['plateau_workers'] = previous['workers']
+            break
+
+    for step in steps[1:]:
+        if baseline_p99 > 0 and step['p99_ms'] > baseline_p99 * TAIL_BREAK_FACTOR:
+            analysis['tail_break_workers'] = step['workers']
+            break
+
+    # Kleinrock's "power" (throughput / latency) peaks at the knee of the curve
+    # Steps where nothing succeeded have no operating point to offer
+    working = [s for s in steps if s['throughput_rps'] > 0 and s['p99_ms'] > 0]
+    if working:
+        best = max(working, key=lambda s: s['throughput_rps'] / s['p99_ms'])
+        analysis['knee_workers'] = best['workers']
+    return analysis
+
+
+def sweep(request_fn: RequestFn, session_factory: Callable[[], Any], max_workers: int,
+          step_duration: float = STEP_DURATION,
+          on_step: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Sweep concurrency for one request function and analyse where it saturates"""
+    steps = []
+    for workers in concurrency_levels(max_workers):
+        step = run_step(request_fn, session_factory, workers, step_duration)
+        steps.append(step)
+        if on_step:
+            on_step(step)
+    return {'steps': steps, 'analysis': find_knee(steps)}
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Distributed Load Generation for Kairo API Testing
+A coordinator hands one scenario to N worker agents over TCP, starts them in sync and aggregates streamed histograms
+
+Usage: python distributed_load.py coordinator --workers 3 --spawn-local --rate 300 --duration 30
+       python distributed_load.py coordinator --workers 2 --listen 0.0.0.0:7700 --catalog god-tier
+       python distributed_load.py worker --coordinator 10.0.0.5:7700
+
+Protocol: one JSON object per line.
+  worker -> coordinator: hello, interval (per-second histograms, the last one partial), done (final histograms)
+  coordinator -> worker: scenario (endpoints, rate share, duration, start_at wall-clock time)
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from http_client import clone_session, create_session
+from latency_histogram import LatencyHistogram, format_summary
+from load_engine import LoadTarget, OpenLoopLoadEngine
+
+# Configuration
+LISTEN_ADDRESS = "127.0.0.1:7700"
+START_DELAY = 2.0        # Seconds between handing out the scenario and the synchronized start
+REPORT_INTERVAL = 1.0
+CONNECT_TIMEOUT = 30
+
+
+def build_scenario(catalog: str, base_url: Optional[str], rate: float, duration: float,
+                   connections: int) -> Dict[str, Any]:
+    """Scenario definition built from an existing tester's endpoint catalog"""
+    if catalog == 'god-tier':
+        import backend_test
+        endpoints = [[f"POST /api/{endpoint}", 'POST', endpoint, payload, False]
+                     for endpoint, payload, _ in backend_test.GOD_TIER_ENDPOINTS]
+        default_url = backend_test.BASE_URL
+    else:
+        import comprehensive_backend_test
+        endpoints = [list(entry) for entry in comprehensive_backend_test.ENDPOINT_CATALOG]
+        default_url = comprehensive_backend_test.BASE_URL
+    return {
+        'name': catalog,
+        'base_url': base_url or default_url,
+        'rate': rate,
+        'duration': duration,
+        'connections': connections,
+        'endpoints': endpoints,
+    }
+
+
+def send_message(stream, message: Dict[str, Any]):
+    stream.write((json.dumps(message) + "\n").encode())
+    stream.flush()
+
+
+def read_message(stream) -> Optional[Dict[str, Any]]:
+    line = stream.readline()
+    return json.loads(line) if line else None
+
+
+class WorkerAgent:
+    """Connects to a coordinator, runs the scenario it is handed and streams interval histograms back"""
+
+    def __init__(self, coordinator: str, worker_id: str = None):
+        host, port = coordinator.rsplit(':', 1)
+        self.address = (host, int(port))
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+
+    def run(self):
+        with socket.create_connection(self.address, timeout=CONNECT_TIMEOUT) as sock:
+            sock.settimeout(None)
+            stream = sock.makefile('rwb')
+            send_message(stream, {'type': 'hello', 'worker_id': self.worker_id, 'cores': os.cpu_count()})
+
+            message = read_message(stream)
+            if not message or message.get('type') != 'scenario':
+                return
+            self.execute(stream, message['scenario'], message['start_at'], message['rate_share'])
+
+    def _session(self, scenario: Dict[str, Any]) -> requests.Session:
+        session = create_session()
+        if any(entry[4] for entry in scenario['endpoints']):
+            import comprehensive_backend_test
+            try:
+                session.post(f"{scenario['base_url']}/api/auth/signin",
+                             json=comprehensive_backend_test.DEMO_CREDENTIALS, timeout=CONNECT_TIMEOUT)
+            except requests.exceptions.RequestException:
+                pass  # Authenticated endpoints will show up as failures
+        return session
+
+    def execute(self, stream, scenario: Dict[str, Any], start_at: float, rate: float):
+        login = self._session(scenario)
+        targets = [LoadTarget(label, method, f"{scenario['base_url']}/api/{endpoint}", payload)
+                   for label, method, endpoint, payload, _ in scenario['endpoints']]
+
+        lock = threading.Lock()
+        interval: Dict[str, Dict[str, Any]] = {}
+        totals: Dict[str, Dict[str, Any]] = {}
+
+        def on_sample(sample):
+            with lock:
+                for bucket in (interval, totals):
+                    entry = bucket.setdefault(sample['target'], {'histogram': LatencyHistogram(), 'failures': 0})
+                    # Failures are only counted, so instant refusals and full-length timeouts stay out of latency
+                    if sample['ok']:
+                        entry['histogram'].record(sample['latency'] * 1000)
+                    else:
+                        entry['failures'] += 1
+
+        engine = OpenLoopLoadEngine(session_factory=lambda: clone_session(login), max_in_flight=scenario['connections'],
+                                    on_sample=on_sample)
+
+        # Synchronized start: every worker sleeps until the same wall-clock instant
+        time.sleep(max(0.0, start_at - time.time()))
+        done = threading.Event()
+
+        def stream_intervals():
+            seq = 0
+            last = time.perf_counter()
+            while True:
+                finished = done.wait(REPORT_INTERVAL)
+                now = time.perf_counter()
+                with lock:
+                    snapshot = {label: {'histogram': entry['histogram'].to_dict(), 'failures': entry['failures']}
+                                for label, entry in interval.items()}
+                    interval.clear()
+                # The run rarely ends on an interval boundary: its last, partial interval still goes out
+                if snapshot or not finished:
+                    send_message(stream, {'type': 'interval', 'worker_id': self.worker_id, 'seq': seq,
+                                          'span': round(now - last, 3), 'targets': snapshot})
+                    seq += 1
+                last = now
+                if finished:
+                    return
+
+        reporter = threading.Thread(target=stream_intervals, daemon=True)
+        reporter.start()
+        report = engine.run(targets, rate, scenario['duration'])
+        done.set()
+        reporter.join()
+
+        with lock:
+            final = {label: {'histogram': entry['histogram'].to_dict(), 'failures': entry['failures']}
+                     for label, entry in totals.items()}
+        send_message(stream, {'type': 'done', 'worker_id': self.worker_id, 'wall_time': report['wall_time_s'],
+                              'targets': final})
+
+
+class Coordinator:
+    """Accepts worker agents, distributes a scenario and aggregates what they stream back"""
+
+    def __init__(self, listen: str = LISTEN_ADDRESS, workers: int = 1):
+        host, port = listen.rsplit(':', 1)
+        self.address = (host, int(port))
+        self.expected_workers = workers
+        self.messages: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(self.address)
+        self.server.listen(workers)
+        self.address = self.server.getsockname()
+
+    def _reader(self, stream, worker_id: str):
+        while True:
+            try:
+                message = read_message(stream)
+            except (OSError, ValueError):
+                message = None
+            if message is None:
+                self.messages.put({'type': 'disconnected', 'worker_id': worker_id})
+                return
+            self.messages.put(message)
+            if message['type'] == 'done':
+                return
+
+    def accept_workers(self) -> Dict[str, Any]:
+        """Streams of the expected number of workers, by worker id"""
+        streams = {}
+        while len(streams) < self.expected_workers:
+            conn, peer = self.server.accept()
+            stream = conn.makefile('rwb')
+            hello = read_message(stream)
+            if not hello or hello.get('type') != 'hello':
+                conn.close()
+                continue
+            if hello['worker_id'] in streams:
+                print(f"  ⚠️  Rejected a second worker named {hello['worker_id']} from {peer[0]}")
+                conn.close()
+                continue
+            print(f"  Worker {hello['worker_id']} connected from {peer[0]} ({hello.get('cores')} cores)")
+            streams[hello['worker_id']] = stream
+            threading.Thread(target=self._reader, args=(stream, hello['worker_id']), daemon=True).start()
+        return streams
+
+    def run(self, scenario: Dict[str, Any]) -> Dict[str, Any]:
+        """Wait for every worker, start them together and merge their histograms"""
+        streams = self.accept_workers()
+        start_at = time.time() + START_DELAY
+        rate_share = scenario['rate'] / len(streams)
+        for stream in streams.values():
+            send_message(stream, {'type': 'scenario', 'scenario': scenario, 'start_at': start_at,
+                                  'rate_share': rate_share})
+        print(f"  Scenario '{scenario['name']}' handed to {len(streams)} workers, "
+              f"{rate_share:.1f} req/s each, starting in {START_DELAY}s")
+
+        pending_intervals: Dict[int, List[Dict[str, Any]]] = {}
+        totals: Dict[str, Dict[str, Any]] = {}
+        running = set(streams)
+        next_seq = 0
+        wall_time = 0.0
+        while running:
+            message = self.messages.get()
+            if message['type'] == 'interval':
+                pending_intervals.setdefault(message['seq'], []).append(message)
+            elif message['type'] == 'done':
+                running.discard(message['worker_id'])
+                wall_time = max(wall_time, message['wall_time'])
+                for label, data in message['targets'].items():
+                    entry = totals.setdefault(label, {'histogram': LatencyHistogram(), 'failures': 0})
+                    entry['histogram'].merge(LatencyHistogram.from_dict(data['histogram']))
+                    entry['failures'] += data['failures']
+            elif message['type'] == 'disconnected':
+                running.discard(message['worker_id'])
+                print(f"  ⚠️  Worker {message['worker_id']} disconnected before finishing")
+            next_seq = self._print_ready_intervals(pending_intervals, next_seq, running)
+
+        # Intervals no running worker will add to any more: partial ones from workers that stopped early
+        for seq in sorted(pending_intervals):
+            self._print_interval(seq, pending_intervals.pop(seq))
+        self.server.close()
+        overall = LatencyHistogram()
+        for entry in totals.values():
+            overall.merge(entry['histogram'])
+        return {'workers': len(streams), 'wall_time_s': wall_time, 'endpoints': totals, 'overall': overall}
+
+    def _print_ready_intervals(self, pending: Dict[int, List[Dict[str, Any]]], next_seq: int,
+                               running: set) -> int:
+        """Print, in order, every interval that all still-running workers have reported"""
+        while next_seq in pending and running <= {message['worker_id'] for message in pending[next_seq]}:
+            self._print_interval(next_seq, pending.pop(next_seq))
+            next_seq += 1
+        return next_seq
+
+    def _print_interval(self, seq: int, batch: List[Dict[str, Any]]):
+        merged = LatencyHistogram()
+        failures = 0
+        for message in batch:
+            for data in message['targets'].values():
+                merged.merge(LatencyHistogram.from_dict(data['histogram']))
+                failures += data['failures']
+        span = max(message.get('span', REPORT_INTERVAL) for message in batch)
+        requests = len(merged) + failures
+        # A short final interval mostly holds stragglers finishing together; a rate would overstate them
+        volume = (f"{requests / span:>8.1f} req/s" if span >= REPORT_INTERVAL / 2
+                  else f"{requests:>4} requests in the last {span:.2f}s")
+        print(f"  [{seq * REPORT_INTERVAL + span:>5.1f}s] {volume}, "
+              f"p50 {merged.percentile(50):.2f}ms, p99 {merged.percentile(99):.2f}ms"
+              + (f", {failures} failed" if failures else ""))
+
+
+def spawn_local_workers(coordinator: str, count: int) -> List[subprocess.Popen]:
+    """Start worker agents on this machine, for testing the protocol on localhost"""
+    return [subprocess.Popen([sys.executable, os.path.abspath(__file__), 'worker', '--coordinator', coordinator,
+                              '--worker-id', f"local-{i}"])
+            for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed Kairo load generation")
+    subparsers = parser.add_subparsers(dest='role', required=True)
+
+    coordinator_parser = subparsers.add_parser('coordinator')
+    coordinator_parser.add_argument('--listen', default=LISTEN_ADDRESS)
+    coordinator_parser.add_argument('--workers', type=int, default=1)
+    coordinator_parser.add_argument('--spawn-local', action='store_true', help="Start the workers on localhost")
+    coordinator_parser.add_argument('--catalog', choices=['comprehensive', 'god-tier'], default='comprehensive')
+    coordinator_parser.add_argument('--base-url')
+    coordinator_parser.add_argument('--rate', type=float, default=100.0, help="Total arrival rate across workers")
+    coordinator_parser.add_argument('--duration', type=float, default=30.0)
+    coordinator_parser.add_argument('--connections', type=int, default=64, help="Max in-flight requests per worker")
+
+    worker_parser = subparsers.add_parser('worker')
+    worker_parser.add_argument('--coordinator', required=True, help="host:port of the coordinator")
+    worker_parser.add_argument('--worker-id')
+
+    args = parser.parse_args()
+
+    if args.role == 'worker':
+        WorkerAgent(args.coordinator, args.worker_id).run()
+        return 0
+
+    scenario = build_scenario(args.catalog, args.base_url, args.rate, args.duration, args.connections)
+    coordinator = Coordinator(args.listen, args.workers)
+    host, port = coordinator.address
+
+    print("=" * 80)
+    print("KAIRO DISTRIBUTED LOAD GENERATION")
+    print("=" * 80)
+    print(f"Testing against: {scenario['base_url']}")
+    print(f"Coordinator listening on {host}:{port}, waiting for {args.workers} workers")
+
+    children = spawn_local_workers(f"{host}:{port}", args.workers) if args.spawn_local else []
+    report = coordinator.run(scenario)
+    for child in children:
+        child.wait()
+
+    print("-" * 80)
+    failures = 0
+    for label, entry in sorted(report['endpoints'].items()):
+        failures += entry['failures']
+        print(f"  {label}: {format_summary(entry['histogram'].summary())}"
+              + (f", {entry['failures']} failed" if entry['failures'] else ""))
+    total = len(report['overall']) + failures
+    rps = total / report['wall_time_s'] if report['wall_time_s'] else 0.0
+    print(f"  OVERALL: {rps:.1f} req/s across {report['workers']} workers - "
+          f"{format_summary(report['overall'].summary())}")
+    print("=" * 80)
+    return 0 if failures == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Harness Self-Profiling for Kairo API Testing
+Measures how much of each reported response time is Python client work rather than server time
+
+Usage: python comprehensive_backend_test.py --profile-harness --scheduled-rate 300
+       python comprehensive_test_suite.py --rate 500 --duration 30 --profile-harness
+
+Each timed request records the CPU time its own thread spent inside the timed window. That covers building
+headers and the request, urllib3, parsing the status line and headers, and reading the body. This part of
+response_time_ms is spent in the client, not the server. Named stages break down the harness's own work.
+Header building falls inside the timed window. JSON decoding, schema checks and logging run after the clock
+stops: they do not inflate latency, but they use up the harness's throughput. For each section, process CPU
+divided by wall time shows how close the harness came to the single core that the GIL lets Python threads
+use. Above SATURATION_CPU the load generator is the bottleneck, and the reported latencies include queueing
+inside the client.
+"""
+
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional
+
+from latency_histogram import LatencyHistogram
+
+# Configuration
+SATURATION_CPU = 0.8       # Share of one core above which the harness, not the server, limits the run
+CLIENT_SHARE_WARN = 0.2    # Warn when this much of the reported response time is client CPU
+MIN_SECTION_S = 1.0        # Shorter sections are too brief for a utilization verdict
+
+_NO_STAGE = nullcontext()
+
+
+class _Stage:
+    """Wall and thread CPU time of one block of harness work"""
+
+    __slots__ = ('profiler', 'name', 'wall_start', 'cpu_start')
+
+    def __init__(self, profiler: 'HarnessProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+
+    def __exit__(self, *exc_info):
+        self.profiler.record_stage(self.name, time.perf_counter() - self.wall_start,
+                                   time.thread_time() - self.cpu_start)
+        return False
+
+
+class _Section:
+    """Scope of one run (functional checks, a sweep, a load profile) and the harness's CPU during it"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self.wall_s: Optional[float] = None
+        self.process_cpu_s: Optional[float] = None
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    def close(self):
+        self.wall_s = time.perf_counter() - self.wall_start
+        self.process_cpu_s = time.process_time() - self.cpu_start
+
+
+class HarnessProfiler:
+    """Client CPU inside timed requests and in the work around them, per section
+
+    A disabled profiler (the default in the testers) accepts every call and records nothing.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.sections: List[_Section] = []
+        self._current: Optional[_Section] = None
+        self._lock = threading.Lock()
+
+    def begin(self, label: str):
+        """Start a new section; the previous one, if any, ends here"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._current:
+                self._current.close()
+            self._current = _Section(label)
+            self.sections.append(self._current)
+
+    def end(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._current:
+                self._current.close()
+                self._current = None
+
+    def request_started(self) -> Optional[float]:
+        """Call on the sending thread when the response-time clock starts"""
+        return time.thread_time() if self.enabled else None
+
+    def request_finished(self, key: str, cpu_start: Optional[float], response_s: float):
+        """Call on the same thread when the clock stops; the thread's CPU since then was client work"""
+        if cpu_start is None:
+            return
+        client_cpu = time.thread_time() - cpu_start
+        with self._lock:
+            section = self._current
+            if section is None:
+                return
+            entry = section.endpoints.get(key)
+            if entry is None:
+                entry = section.endpoints[key] = {'requests': 0, 'response_s': 0.0, 'client_cpu_s': 0.0,
+                                                  'client_cpu': LatencyHistogram()}
+            entry['requests'] += 1
+            entry['response_s'] += response_s
+            entry['client_cpu_s'] += client_cpu
+            entry['client_cpu'].record(client_cpu * 1000)
+
+    def stage(self, name: str):
+        """Context manager timing a block of harness work, e.g. 'headers' or 'json_decode'"""
+        return _Stage(self, name) if self.enabled else _NO_STAGE
+
+    def record_stage(self, name: str, wall_s: float, cpu_s: float):
+        with self._lock:
+            section = self._current
+            if section is None:
+                return
+            entry = section.stages.get(name)
+            if entry is None:
+                entry = section.stages[name] = {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0}
+            entry['calls'] += 1
+            entry['wall_s'] += wall_s
+            entry['cpu_s'] += cpu_s
+
+    def _section_report(self, section: _Section) -> Dict[str, Any]:
+        wall = section.wall_s if section.wall_s is not None else time.perf_counter() - section.wall_start
+        cpu = section.process_cpu_s if section.process_cpu_s is not None else time.process_time() - section.cpu_start
+        requests = sum(entry['requests'] for entry in section.endpoints.values())
+        response_s = sum(entry['response_s'] for entry in section.endpoints.values())
+        client_cpu_s = sum(entry['client_cpu_s'] for entry in section.endpoints.values())
+        utilization = round(cpu / wall, 3) if wall > 0 else 0.0
+        cpu_per_request = cpu / requests if requests else None
+        client_share = client_cpu_s / response_s if response_s > 0 else 0.0
+
+        warnings = []
+        if wall >= MIN_SECTION_S and utilization >= SATURATION_CPU:
+            warnings.append(f"{section.label}: the harness used {utilization * 100:.0f}% of a core. The load "
+                            f"generator is saturated, so latency includes client-side queueing and the "
+                            f"achieved rate is a client limit")
+        if requests and client_share >= CLIENT_SHARE_WARN:
+            warnings.append(f"{section.label}: {client_share * 100:.0f}% of the reported response time is "
+                            f"Python client CPU, not the server")
+
+        return {
+            'label': section.label,
+            'wall_s': round(wall, 3),
+            'process_cpu_s': round(cpu, 3),
+            'cpu_utilization': utilization,
+            'requests': requests,
+            'cpu_per_request_ms': round(cpu_per_request * 1000, 3) if cpu_per_request is not None else None,
+            # One core is all the GIL gives the harness, so this is the fastest it could ever send
+            'ceiling_rps': round(1 / cpu_per_request, 1) if cpu_per_request else None,
+            'client_share': round(client_share, 4),
+            'endpoints': {key: {
+                'requests': entry['requests'],
+                'response_ms_mean': round(entry['response_s'] / entry['requests'] * 1000, 3),
+                'client_cpu_ms_mean': round(entry['client_cpu_s'] / entry['requests'] * 1000, 3),
+                'client_cpu_ms_p99': entry['client_cpu'].percentile(99),
+                'client_share': round(entry['client_cpu_s'] / entry['response_s'], 4) if entry['response_s'] > 0 else 0.0,
+            } for key, entry in section.endpoints.items()},
+            'stages': {name: {
+                'calls': entry['calls'],
+                'wall_ms_mean': round(entry['wall_s'] / entry['calls'] * 1000, 4),
+                'cpu_ms_mean': round(entry['cpu_s'] / entry['calls'] * 1000, 4),
+                'cpu_s_total': round(entry['cpu_s'], 4),
+            } for name, entry in section.stages.items()},
+            'warnings': warnings,
+        }
+
+    def report(self) -> Dict[str, Any]:
+        """Every section so far; the open one is reported up to now"""
+        with self._lock:
+            sections = [self._section_report(section) for section in self.sections]
+        return {'sections': sections, 'saturated': any(section['warnings'] for section in sections)}
+
+
+def format_harness_report(report: Dict[str, Any]) -> List[str]:
+    lines = []
+    for section in report['sections']:
+        per_request = (f", {section['cpu_per_request_ms']:.3f}ms CPU per request "
+                       f"(ceiling ~{section['ceiling_rps']:g} req/s)" if section['requests'] else "")
+        lines.append(f"{section['label']}: {section['requests']} requests in {section['wall_s']:g}s, harness CPU "
+                     f"{section['process_cpu_s']:g}s = {section['cpu_utilization'] * 100:.0f}% of a core{per_request}")
+        if section['endpoints']:
+            lines.append(f"  {'Endpoint':<44} {'n':>7} {'resp ms':>9} {'client ms':>10} {'p99 ms':>8} {'client %':>9}")
+            for key, entry in sorted(section['endpoints'].items(), key=lambda item: -item[1]['client_share']):
+                lines.append(f"  {key:<44} {entry['requests']:>7} {entry['response_ms_mean']:>9.2f} "
+                             f"{entry['client_cpu_ms_mean']:>10.3f} {entry['client_cpu_ms_p99']:>8.3f} "
+                             f"{entry['client_share'] * 100:>8.1f}%")
+        for name, entry in section['stages'].items():
+            lines.append(f"  stage {name}: {entry['cpu_ms_mean']:.3f}ms CPU / {entry['wall_ms_mean']:.3f}ms wall per call, "
+                         f"{entry['calls']} calls")
+        lines.extend(f"  ⚠️  {warning}" for warning in section['warnings'])
+    return lines
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Transport for Kairo API Testing
+One place to build keep-alive connection pools so connection setup stays out of reported latencies
+
+Set KAIRO_HTTP2=1 to switch every tester to HTTP/2 (requires `pip install httpx[http2]`). HTTP/2 is only
+negotiated with https:// targets; plain http:// ones stay on HTTP/1.1 through the same client. Every request
+goes through the target's circuit breaker (circuit_breaker.py), so a dead server fails fast.
+"""
+
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError, ReadTimeoutError
+
+from circuit_breaker import guarded_send
+
+try:
+    import httpx
+except ImportError:  # HTTP/2 mode is optional
+    httpx = None
+
+# Configuration
+POOL_CONNECTIONS = 10    # Distinct hosts kept in the pool manager
+POOL_MAXSIZE = 32        # Keep-alive connections kept per host
+HTTP2 = os.environ.get('KAIRO_HTTP2', '') == '1'
+
+SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+PHASES = ['dns', 'connect', 'tls', 'ttfb', 'body']
+
+# Phase timings of the request currently in flight on this thread (requests is synchronous per thread)
+_phase_state = threading.local()
+
+
+def _phases() -> Dict[str, float]:
+    timings = getattr(_phase_state, 'timings', None)
+    if timings is None:
+        timings = _phase_state.timings = dict.fromkeys(PHASES, 0.0)
+    return timings
+
+
+class _PhaseTimingMixin:
+    """Splits connection setup into DNS, TCP connect and TLS, and times request-sent to headers-received"""
+
+    def _new_conn(self):
+        timings = _phases()
+        start = time.perf_counter()
+        try:
+            addresses = list(dict.fromkeys(info[4][0] for info in
+                                           socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)))
+        except socket.gaierror:
+            addresses = [self._dns_host]  # Let urllib3 raise its usual NameResolutionError
+        resolved = time.perf_counter()
+        timings['dns'] += resolved - start
+
+        # Connect to the already-resolved addresses in order, so DNS is not looked up a second time
+        original_host = self._dns_host
+        last_error = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError as e:
+                    last_error = e
+            else:
+                raise last_error
+        finally:
+            self._dns_host = original_host
+            timings['connect'] += time.perf_counter() - resolved
+        return sock
+
+    def connect(self):
+        timings = _phases()
+        before = timings['dns'] + timings['connect']
+        start = time.perf_counter()
+        super().connect()
+        # Whatever connect() spent beyond DNS and TCP is the TLS handshake (zero for plain HTTP)
+        timings['tls'] += max(0.0, time.perf_counter() - start - (timings['dns'] + timings['connect'] - before))
+
+    def request(self, *args, **kwargs):
+        _phase_state.request_start = time.perf_counter()
+        return super().request(*args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        _phases()['ttfb'] = time.perf_counter() - getattr(_phase_state, 'request_start', time.perf_counter())
+        return response
+
+
+class TimedHTTPConnection(_PhaseTimingMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_PhaseTimingMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter with TCP keep-alive on every pooled socket, sending through the target's circuit breaker"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', SOCKET_OPTIONS)
+        super().init_poolmanager(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        return guarded_send(request.url, lambda: super(PooledAdapter, self).send(request, **kwargs))
+
+
+class PhaseTimingAdapter(PooledAdapter):
+    """PooledAdapter that attaches `response.phase_timings` (seconds per phase) and `response.wire_bytes`"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool,
+                                                   'https': TimedHTTPSConnectionPool}
+
+    def send(self, request, stream=False, **kwargs):
+        _phase_state.timings = dict.fromkeys(PHASES, 0.0)
+        # Always stream from urllib3 so the body read can be timed separately from the headers
+        response = super().send(request, stream=True, **kwargs)
+        timings = _phases()
+        if not stream:
+            body_start = time.perf_counter()
+            response.content
+            timings['body'] = time.perf_counter() - body_start
+            response.wire_bytes = response.raw.tell()
+        response.phase_timings = timings
+        return response
+
+
+class Http2Session:
+    """requests.Session look-alike over httpx so the testers' exception handling keeps working"""
+
+    def __init__(self, max_per_host: int = POOL_MAXSIZE):
+        if httpx is None:
+            raise RuntimeError("HTTP/2 mode needs httpx: pip install 'httpx[http2]'")
+        limits = httpx.Limits(max_connections=max_per_host, max_keepalive_connections=max_per_host)
+        # HTTP/2 is negotiated with ALPN over TLS; plain http:// targets (the Next.js dev server does not speak
+        # h2c) and servers without h2 fall back to HTTP/1.1 on the same client
+        self.client = httpx.Client(http1=True, http2=True, limits=limits)
+        self.cookies = self.client.cookies
+        self.headers = self.client.headers
+
+    def request(self, method: str, url: str, json: Any = None, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None, stream: bool = False, **kwargs):
+        # `stream` is accepted for requests compatibility; httpx has already read the body when this returns
+        return guarded_send(url, lambda: self._request(method, url, json, headers, timeout, **kwargs))
+
+    def _request(self, method: str, url: str, json: Any, headers: Optional[Dict[str, str]], timeout: Optional[float],
+                 **kwargs):
+        try:
+            return self.client.request(method, url, json=json, headers=headers, timeout=timeout, **kwargs)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e))
+        except (httpx.ConnectError, httpx.NetworkError, httpx.RemoteProtocolError) as e:
+            raise requests.exceptions.ConnectionError(str(e))
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e))
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        self.client.close()
+
+
+def create_session(max_per_host: int = POOL_MAXSIZE, block: bool = False, http2: Optional[bool] = None,
+                   phase_timing: bool = False):
+    """Build a pooled keep-alive session
+
+    `max_per_host` caps the keep-alive connections kept per host; with `block=True` it is also a hard
+    limit on concurrent connections, and callers wait for a free one instead of opening extras.
+    `phase_timing` attaches DNS/connect/TLS/TTFB/body timings to every HTTP/1.1 response.
+    """
+    if HTTP2 if http2 is None else http2:
+        return Http2Session(max_per_host)
+
+    session = requests.Session()
+    adapter_cls = PhaseTimingAdapter if phase_timing else PooledAdapter
+    adapter = adapter_cls(pool_connections=POOL_CONNECTIONS, pool_maxsize=max_per_host, pool_block=block)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def clone_session(source, max_per_host: int = POOL_MAXSIZE):
+    """New pooled session carrying the cookies (e.g. a login) of an existing one"""
+    session = create_session(max_per_host)
+    session.cookies.update(source.cookies)
+    return session
+
+
+def shared_transport_session(transport):
+    """New session with its own cookie jar that reuses the connection pool of `transport`
+
+    Lets many simulated users keep separate logins without opening a connection pool each.
+    """
+    if isinstance(transport, Http2Session):
+        return Http2Session()  # httpx clients cannot share a connection pool across cookie jars
+    session = requests.Session()
+    for prefix, adapter in transport.adapters.items():
+        session.mount(prefix, adapter)
+    return session
+
+
+def is_read_timeout(error: BaseException) -> bool:
+    """True for the ConnectionError requests raises when reading a streamed body times out"""
+    return any(isinstance(arg, ReadTimeoutError) for arg in getattr(error, 'args', ()))
+
+
+def warm_up(session, base_url: str, connections: int = 1, path: str = "/api/health"):
+    """Open `connections` keep-alive connections ahead of timed requests"""
+    def touch():
+        try:
+            session.get(f"{base_url}{path}", timeout=5)
+        except requests.exceptions.RequestException:
+            pass  # A dead server is reported by the tests themselves
+
+    threads = [threading.Thread(target=touch, daemon=True) for _ in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Field Scanner for Kairo API Testing
+Counts response bytes as they arrive and extracts only the top-level fields a test checks
+
+A multi-megabyte god-tier response is never held in memory or parsed as a whole: the scanner walks the
+stream chunk by chunk, records which top-level keys occur, and decodes just the values it was asked to
+capture. Nested values are stepped over by a single regex match per shallow subtree, and once every field
+a test needs has been seen the rest of the body is only counted.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+# Configuration
+CHUNK_SIZE = 64 * 1024
+MAX_CAPTURE_BYTES = 64 * 1024    # Larger captured values are dropped rather than buffered
+SKIP_DEPTH = 6                   # Nesting levels one regex match can step over
+
+STRING_SPECIAL = re.compile(rb'["\\]')
+STRUCTURAL = re.compile(rb'[{}\[\]",:]')
+NON_WHITESPACE = re.compile(rb'[^ \t\r\n]')
+VALUE_KINDS = {ord('{'): 'object', ord('['): 'array', ord('"'): 'string', ord('t'): 'boolean', ord('f'): 'boolean',
+               ord('n'): 'null'}
+
+
+def _skip_pattern(levels: int) -> bytes:
+    """Literals, complete strings and complete containers up to `levels` deep, without closing the current one
+
+    Written in unrolled form (no nested quantifiers over overlapping input) so a container cut off by the
+    end of a chunk fails in linear time instead of backtracking.
+    """
+    literals = rb'[^"{}\[\]]*'
+    alternatives = [rb'"[^"\\]*(?:\\.[^"\\]*)*"']
+    if levels > 0:
+        inner = _skip_pattern(levels - 1)
+        alternatives += [rb'\{' + inner + rb'\}', rb'\[' + inner + rb'\]']
+    return literals + rb'(?:(?:' + rb'|'.join(alternatives) + rb')' + literals + rb')*'
+
+
+# Skips everything up to the next bracket or string it cannot finish, in a single C-level match
+SKIP_NESTED = re.compile(_skip_pattern(SKIP_DEPTH), re.DOTALL)
+
+
+class TopLevelScanner:
+    """Incremental scanner for the top-level keys of a JSON object
+
+    This is not a validator: it tracks nesting and strings only. `keys` lists every top-level key seen so
+    far, `kinds` the JSON kind of each one's value and `values` the decoded values of the `capture` keys.
+    `complete` turns true at the closing brace of the top-level object, and `error` describes a body that
+    is not a JSON object.
+    """
+
+    def __init__(self, capture: Iterable[str] = (), max_capture_bytes: int = MAX_CAPTURE_BYTES):
+        self.capture = set(capture)
+        self.max_capture_bytes = max_capture_bytes
+        self.keys: List[str] = []
+        self.kinds: Dict[str, str] = {}
+        self.values: Dict[str, Any] = {}
+        self.complete = False
+        self.error: Optional[str] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key_buf: Optional[bytearray] = None
+        self._kind_key: Optional[str] = None
+        self._value_key: Optional[str] = None
+        self._value_buf: Optional[bytearray] = None
+        self._mark = 0
+
+    def has(self, fields: Iterable[str]) -> bool:
+        """True once the value of every field in `fields` has started and every captured one has been decoded"""
+        return all(field in self.kinds and (field not in self.capture or field in self.values) for field in fields)
+
+    def feed(self, chunk: bytes):
+        if self.complete or self.error:
+            return
+        pos, end = 0, len(chunk)
+        self._mark = 0
+        while pos < end and not self.complete and not self.error:
+            if self._escape:
+                pos += 1
+                self._escape = False
+                continue
+            if self._in_string:
+                match = STRING_SPECIAL.search(chunk, pos)
+                if not match:
+                    pos = end
+                    break
+                pos = match.end()
+                if match.group() == b'\\':
+                    self._escape = True
+                    continue
+                self._in_string = False
+                if self._key_buf is not None:
+                    self._key_buf += chunk[self._mark:pos]
+                    self._finish_key()
+                continue
+            if self._kind_key is not None:
+                # The first byte of a top-level value tells its kind
+                match = NON_WHITESPACE.search(chunk, pos)
+                if not match:
+                    pos = end
+                    break
+                self.kinds[self._kind_key] = VALUE_KINDS.get(chunk[match.start()], 'number')
+                self._kind_key = None
+
+            if self._depth > 1:
+                pos = SKIP_NESTED.match(chunk, pos).end()
+                if pos >= end:
+                    break
+            match = STRUCTURAL.search(chunk, pos)
+            if not match:
+                pos = end
+                break
+            char, pos = match.group(), match.end()
+
+            if self._depth == 0 and char != b'{':
+                self.error = "Response is not a JSON object"
+            elif char == b'"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_buf = bytearray(b'"')
+                    self._mark = pos
+            elif char == b'{' or char == b'[':
+                if self._depth == 0:
+                    self._expect_key = True
+                self._depth += 1
+            elif char == b'}' or char == b']':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish_value(chunk, pos - 1)
+                    self.complete = True
+            elif self._depth == 1:
+                if char == b':':
+                    self._expect_key = False
+                    self._kind_key = self.keys[-1] if self.keys else None
+                    if self._value_key is not None:
+                        self._value_buf = bytearray()
+                        self._mark = pos
+                else:
+                    self._finish_value(chunk, pos - 1)
+                    self._expect_key = True
+
+        # Carry a partially read key or captured value over into the next chunk
+        if self._key_buf is not None:
+            self._key_buf += chunk[self._mark:]
+        elif self._value_buf is not None:
+            self._value_buf += chunk[self._mark:]
+            if len(self._value_buf) > self.max_capture_bytes:
+                self._value_key = self._value_buf = None
+
+    def _finish_key(self):
+        try:
+            key = json.loads(bytes(self._key_buf))
+        except ValueError:
+            self.error = "Malformed object key"
+            return
+        self._key_buf = None
+        self.keys.append(key)
+        self._value_key = key if key in self.capture else None
+
+    def _finish_value(self, chunk: bytes, stop: int):
+        if self._value_buf is not None:
+            raw = self._value_buf + chunk[self._mark:stop]
+            try:
+                self.values[self._value_key] = json.loads(bytes(raw))
+            except ValueError:
+                self.error = f"Malformed value for {self._value_key!r}"
+        self._value_key = self._value_buf = None
+
+
+class StreamedBody:
+    """What a streamed read of a JSON response produced"""
+
+    def __init__(self, scanner: TopLevelScanner, body_bytes: int, wire_bytes: int):
+        self.scanner = scanner
+        self.body_bytes = body_bytes    # Decoded body size, i.e. the size of the JSON document
+        self.wire_bytes = wire_bytes    # Bytes actually received, before any content decoding
+
+    @property
+    def keys(self) -> List[str]:
+        return self.scanner.keys
+
+    @property
+    def values(self) -> Dict[str, Any]:
+        return self.scanner.values
+
+
+def read_json_fields(response, capture: Iterable[str] = (), required: Iterable[str] = (),
+                     chunk_size: int = CHUNK_SIZE) -> StreamedBody:
+    """Drain a streamed response, scanning it until every `required` field is known
+
+    `response` is a requests response fetched with `stream=True` (or an httpx response). The whole body is
+    always read, so the keep-alive connection goes back to the pool, but bytes after the last required
+    field are only counted.
+    """
+    scanner = TopLevelScanner(capture)
+    required = list(required)
+    chunks = (response.iter_content(chunk_size) if hasattr(response, 'iter_content')
+              else response.iter_bytes(chunk_size))
+    body_bytes = 0
+    scanning = True
+    try:
+        for chunk in chunks:
+            body_bytes += len(chunk)
+            if scanning:
+                scanner.feed(chunk)
+                scanning = not (scanner.complete or scanner.error or (required and scanner.has(required)))
+    finally:
+        response.close()
+
+    raw = getattr(response, 'raw', None)
+    wire_bytes = raw.tell() if raw is not None and hasattr(raw, 'tell') else getattr(response, 'num_bytes_downloaded',
+                                                                                     body_bytes)
+    return StreamedBody(scanner, body_bytes, wire_bytes)
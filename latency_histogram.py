@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+High Dynamic Range Latency Histogram for Kairo API Testing
+Keeps every latency sample in log-linear buckets with O(1) record cost and mergeable, compact counts
+"""
+
+import math
+from typing import Any, Dict, Iterable, Optional
+
+# Configuration
+SIGNIFICANT_FIGURES = 3          # Relative bucket error of 0.1%
+REPORT_PERCENTILES = [50, 90, 99, 99.9]
+
+
+class LatencyHistogram:
+    """HdrHistogram-style bucket layout over integer microseconds, reported in milliseconds"""
+
+    def __init__(self, significant_figures: int = SIGNIFICANT_FIGURES):
+        if not 1 <= significant_figures <= 5:
+            raise ValueError("significant_figures must be between 1 and 5")
+        self.significant_figures = significant_figures
+
+        largest_single_unit = 2 * 10 ** significant_figures
+        self._sub_bucket_count_magnitude = max(1, math.ceil(math.log2(largest_single_unit)))
+        self._sub_bucket_half_count_magnitude = self._sub_bucket_count_magnitude - 1
+        self._sub_bucket_count = 1 << self._sub_bucket_count_magnitude
+        self._sub_bucket_half_count = self._sub_bucket_count >> 1
+        self._sub_bucket_mask = self._sub_bucket_count - 1
+
+        self.counts: Dict[int, int] = {}
+        self.total_count = 0
+        self.total_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us = 0
+
+    # Bucket arithmetic
+    def _counts_index(self, value_us: int) -> int:
+        bucket_index = (value_us | self._sub_bucket_mask).bit_length() - (self._sub_bucket_half_count_magnitude + 1)
+        sub_bucket_index = value_us >> bucket_index
+        return ((bucket_index + 1) << self._sub_bucket_half_count_magnitude) + (sub_bucket_index - self._sub_bucket_half_count)
+
+    def _value_from_index(self, index: int) -> int:
+        bucket_index = (index >> self._sub_bucket_half_count_magnitude) - 1
+        sub_bucket_index = (index & (self._sub_bucket_half_count - 1)) + self._sub_bucket_half_count
+        if bucket_index < 0:
+            sub_bucket_index -= self._sub_bucket_half_count
+            bucket_index = 0
+        return sub_bucket_index << bucket_index
+
+    def _highest_equivalent(self, index: int) -> int:
+        value = self._value_from_index(index)
+        bucket_index = max(0, (value | self._sub_bucket_mask).bit_length() - (self._sub_bucket_half_count_magnitude + 1))
+        return value + (1 << bucket_index) - 1
+
+    # Recording
+    def record_us(self, value_us: int, count: int = 1):
+        """Record an integer microsecond value"""
+        if value_us < 0:
+            raise ValueError("Latency cannot be negative")
+        index = self._counts_index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += count
+        self.total_us += value_us * count
+        if self.min_us is None or value_us < self.min_us:
+            self.min_us = value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def record(self, value_ms: float, count: int = 1):
+        """Record a latency in milliseconds"""
+        self.record_us(int(round(value_ms * 1000)), count)
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """Add another histogram's samples into this one"""
+        if other.significant_figures != self.significant_figures:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total_count += other.total_count
+        self.total_us += other.total_us
+        if other.min_us is not None and (self.min_us is None or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    # Queries
+    def __len__(self) -> int:
+        return self.total_count
+
+    def percentile(self, pct: float) -> float:
+        """Latency in milliseconds at or below which `pct` percent of samples fall"""
+        if self.total_count == 0:
+            return 0.0
+        threshold = max(1, math.ceil(pct / 100.0 * self.total_count))
+        running = 0
+        for index in sorted(self.counts):
+            running += self.counts[index]
+            if running >= threshold:
+                return min(self._highest_equivalent(index), self.max_us) / 1000.0
+        return self.max_us / 1000.0
+
+    def mean(self) -> float:
+        return self.total_us / self.total_count / 1000.0 if self.total_count else 0.0
+
+    def summary(self, percentiles: Iterable[float] = REPORT_PERCENTILES) -> Dict[str, float]:
+        """Count, mean, requested percentiles and max, all in milliseconds"""
+        result = {'count': self.total_count, 'mean': round(self.mean(), 2)}
+        for pct in percentiles:
+            result[f"p{pct:g}"] = round(self.percentile(pct), 2)
+        result['max'] = round(self.max_us / 1000.0, 2)
+        return result
+
+    # Serialization
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact, JSON/pickle friendly form carrying only non-empty buckets"""
+        return {
+            'sig': self.significant_figures,
+            'counts': [[index, count] for index, count in sorted(self.counts.items())],
+            'total_us': self.total_us,
+            'min_us': self.min_us,
+            'max_us': self.max_us,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        histogram = cls(data['sig'])
+        for index, count in data['counts']:
+            histogram.counts[int(index)] = count
+            histogram.total_count += count
+        histogram.total_us = data['total_us']
+        histogram.min_us = data['min_us']
+        histogram.max_us = data['max_us']
+        return histogram
+
+
+def merge_all(histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+    """Merge any number of histograms into a new one"""
+    merged = None
+    for histogram in histograms:
+        if merged is None:
+            merged = LatencyHistogram(histogram.significant_figures)
+        merged.merge(histogram)
+    return merged or LatencyHistogram()
+
+
+def format_summary(summary: Dict[str, float]) -> str:
+    """One-line rendering of LatencyHistogram.summary()"""
+    parts = [f"{key} {value:.2f}ms" for key, value in summary.items() if key not in ('count', 'mean')]
+    return f"n={summary['count']}, " + ", ".join(parts)
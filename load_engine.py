@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Open-Loop Load Engine for Kairo API Testing
+Fires requests at a target arrival rate with asyncio and reports achieved throughput next to latency
+"""
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+
+from circuit_breaker import CircuitOpenError
+from harness_profiler import HarnessProfiler
+from http_client import create_session
+from latency_histogram import LatencyHistogram, format_summary, merge_all
+
+# Configuration
+TIMEOUT = 30
+MAX_IN_FLIGHT = 256
+LATE_START_THRESHOLD = 0.005  # asyncio timers alone add ~1ms of jitter
+
+
+class LoadTarget:
+    """A single endpoint the engine can fire requests at"""
+
+    def __init__(self, name: str, method: str, url: str, payload: Optional[Dict[str, Any]] = None,
+                 headers: Optional[Dict[str, str]] = None, expected_status: List[int] = None):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.payload = payload
+        self.headers = headers or {'Content-Type': 'application/json'}
+        self.expected_status = expected_status or [200, 201]
+
+
+# A send for the scheduler: (seconds after the start, target, tag handed back with the sample)
+Send = Tuple[float, 'LoadTarget', Any]
+
+
+class SampleStats:
+    """Running overall and per-target totals, so a run keeps counts and histograms instead of every sample
+
+    Latency is kept apart for successful and failed requests: an open circuit or refused connection fails in
+    next to no time and a timeout takes the full timeout, so either would distort the response-time picture.
+    """
+
+    def __init__(self):
+        self.overall = self._totals()
+        self.targets: Dict[str, Dict[str, Any]] = {}
+        self.max_start_lag = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _totals() -> Dict[str, Any]:
+        return {'requests': 0, 'ok': 0, 'errors': {}, 'late_starts': 0, 'histogram': LatencyHistogram(),
+                'error_histogram': LatencyHistogram()}
+
+    def record(self, sample: Dict[str, Any]):
+        with self._lock:
+            target = self.targets.get(sample['target'])
+            if target is None:
+                target = self.targets[sample['target']] = self._totals()
+            for totals in (self.overall, target):
+                totals['requests'] += 1
+                if sample['ok']:
+                    totals['ok'] += 1
+                    totals['histogram'].record(sample['latency'] * 1000)
+                else:
+                    totals['error_histogram'].record(sample['latency'] * 1000)
+                    key = sample['error'] or f"HTTP {sample['status']}"
+                    totals['errors'][key] = totals['errors'].get(key, 0) + 1
+                # A send that started well after its slot means the client, not the server, fell behind
+                if sample['start_lag'] > LATE_START_THRESHOLD:
+                    totals['late_starts'] += 1
+            self.max_start_lag = max(self.max_start_lag, sample['start_lag'])
+
+    @staticmethod
+    def _stats(totals: Dict[str, Any], wall_time: float) -> Dict[str, Any]:
+        return {
+            'requests': totals['requests'],
+            'ok': totals['ok'],
+            'errors': dict(totals['errors']),
+            'achieved_rps': round(totals['requests'] / wall_time, 2) if wall_time > 0 else 0.0,
+            'ok_rps': round(totals['ok'] / wall_time, 2) if wall_time > 0 else 0.0,
+            'late_starts': totals['late_starts'],
+            'latency_ms': totals['histogram'].summary(),
+            'error_latency_ms': totals['error_histogram'].summary(),
+            'histogram': totals['histogram'].to_dict(),
+        }
+
+    def report(self, rate: float, wall_time: float) -> Dict[str, Any]:
+        """Per-target and overall throughput/latency stats"""
+        with self._lock:
+            return {
+                'offered_rps': rate,
+                'wall_time_s': round(wall_time, 3),
+                'overall': self._stats(self.overall, wall_time),
+                'targets': {name: self._stats(totals, wall_time) for name, totals in self.targets.items()},
+            }
+
+
+class OpenLoopLoadEngine:
+    """Schedules requests on a fixed arrival timeline, independent of how fast responses come back"""
+
+    def __init__(self, session_factory: Callable[[], requests.Session] = create_session,
+                 max_in_flight: int = MAX_IN_FLIGHT, timeout: float = TIMEOUT, arrival: str = 'constant',
+                 on_sample: Optional[Callable[[Dict[str, Any]], None]] = None, profiler: HarnessProfiler = None):
+        if arrival not in ('constant', 'poisson'):
+            raise ValueError(f"Unsupported arrival process: {arrival}")
+        self.session_factory = session_factory
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.arrival = arrival
+        self.on_sample = on_sample  # Called on the worker thread as each request completes
+        self.profiler = profiler or HarnessProfiler(enabled=False)
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        """One pooled keep-alive session per worker thread"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self.session_factory()
+            self._local.session = session
+        return session
+
+    def _send(self, target: LoadTarget, scheduled_at: float) -> Dict[str, Any]:
+        """Send one request on a worker thread and time it"""
+        start_time = time.perf_counter()
+        cpu_start = self.profiler.request_started()
+        sample = {
+            'target': target.name,
+            'start_lag': start_time - scheduled_at,
+            'status': None,
+            'ok': False,
+            'error': None,
+        }
+        try:
+            response = self._session().request(
+                target.method, target.url, json=target.payload,
+                headers=target.headers, timeout=self.timeout
+            )
+            sample['status'] = response.status_code
+            sample['ok'] = response.status_code in target.expected_status
+        except requests.exceptions.Timeout:
+            sample['error'] = 'timeout'
+        except CircuitOpenError:
+            sample['error'] = 'circuit_open'  # Refused without touching the network while the server is down
+        except requests.exceptions.ConnectionError:
+            sample['error'] = 'connection_error'
+        except Exception as e:
+            sample['error'] = f"unexpected: {e}"
+        sample['latency'] = time.perf_counter() - start_time
+        self.profiler.request_finished(target.name, cpu_start, sample['latency'])
+        if self.on_sample:
+            with self.profiler.stage('on_sample'):
+                self.on_sample(sample)
+        return sample
+
+    def _interarrival(self, rate: float) -> float:
+        if self.arrival == 'poisson':
+            return random.expovariate(rate)
+        return 1.0 / rate
+
+    def _arrivals(self, targets: List[LoadTarget], rate: float, duration: float) -> Iterator[Send]:
+        offset = 0.0
+        index = 0
+        while offset < duration:
+            yield offset, targets[index % len(targets)], None
+            index += 1
+            offset += self._interarrival(rate)
+
+    async def _dispatch(self, sends: Iterable[Send], on_done: Callable[[Dict[str, Any], Any], None],
+                        until: float = 0.0, thread_name_prefix: str = 'load') -> float:
+        """Fire every send at its offset from now and hand each sample with its tag to `on_done`
+
+        Completed requests drop out as they finish, so memory does not grow with the length of the run.
+        Waits until `until` seconds after the start before collecting stragglers, and returns the largest
+        delay of a send behind its slot on the scheduler itself.
+        """
+        def send(target: LoadTarget, send_at: float, tag: Any):
+            on_done(self._send(target, send_at), tag)
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix=thread_name_prefix)
+        pending = set()
+        max_lag = 0.0
+        try:
+            start = time.perf_counter()
+            for offset, target, tag in sends:
+                send_at = start + offset
+                delay = send_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    max_lag = max(max_lag, -delay)
+                future = loop.run_in_executor(executor, send, target, send_at, tag)
+                pending.add(future)
+                future.add_done_callback(pending.discard)
+            delay = start + until - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if pending:
+                await asyncio.gather(*pending)
+            return max_lag
+        finally:
+            executor.shutdown(wait=True)
+
+    def run(self, targets: List[LoadTarget], rate: float, duration: float) -> Dict[str, Any]:
+        """Drive all targets round-robin at `rate` requests/second for `duration` seconds"""
+        if not targets:
+            raise ValueError("At least one load target is required")
+        if rate <= 0 or duration <= 0:
+            raise ValueError("Rate and duration must be positive")
+
+        stats = SampleStats()
+        wall_start = time.perf_counter()
+        asyncio.run(self._dispatch(self._arrivals(targets, rate, duration), lambda sample, _: stats.record(sample)))
+        wall_time = time.perf_counter() - wall_start
+
+        return stats.report(rate, wall_time)
+
+    def summarize(self, samples: Iterable[Dict[str, Any]], rate: float, wall_time: float) -> Dict[str, Any]:
+        """Aggregate raw samples into per-target and overall throughput/latency stats"""
+        stats = SampleStats()
+        for sample in samples:
+            stats.record(sample)
+        return stats.report(rate, wall_time)
+
+
+# A scheduled send receives its intended start time and returns (success, seconds since that intended start)
+ScheduledSend = Callable[[float], Tuple[bool, float]]
+
+
+class ScheduledSender:
+    """Serial fixed-rate send loop that measures latency from each request's intended start (coordinated omission)"""
+
+    def __init__(self, rate: float):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+
+    def run(self, sends: List[Tuple[str, ScheduledSend]], duration: float) -> Dict[str, Any]:
+        """Cycle through `sends` on the schedule for `duration` seconds"""
+        if not sends:
+            raise ValueError("At least one scheduled send is required")
+
+        interval = 1.0 / self.rate
+        corrected: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name, _ in sends}
+        uncorrected: Dict[str, LatencyHistogram] = {name: LatencyHistogram() for name, _ in sends}
+        failures = {name: 0 for name, _ in sends}
+        max_behind = 0.0
+
+        start = time.perf_counter()
+        index = 0
+        while True:
+            intended_start = start + index * interval
+            if intended_start - start >= duration:
+                break
+            wait = intended_start - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+
+            # Requests queued behind a stall keep their original slot, so the stall lands in their latency
+            name, send = sends[index % len(sends)]
+            actual_start = time.perf_counter()
+            behind = actual_start - intended_start
+            max_behind = max(max_behind, behind)
+
+            success, latency = send(intended_start)
+            corrected[name].record(latency * 1000)
+            uncorrected[name].record(max(0.0, latency - behind) * 1000)
+            if not success:
+                failures[name] += 1
+            index += 1
+        wall_time = time.perf_counter() - start
+
+        return {
+            'offered_rps': self.rate,
+            'achieved_rps': round(index / wall_time, 2) if wall_time > 0 else 0.0,
+            'wall_time_s': round(wall_time, 3),
+            'max_behind_schedule_ms': round(max_behind * 1000, 2),
+            'targets': {
+                name: {
+                    'requests': len(corrected[name]),
+                    'failures': failures[name],
+                    'corrected_ms': corrected[name].summary(),
+                    'uncorrected_ms': uncorrected[name].summary(),
+                }
+                for name, _ in sends
+            },
+            'overall': {
+                'requests': index,
+                'failures': sum(failures.values()),
+                'corrected_ms': merge_all(corrected.values()).summary(),
+                'uncorrected_ms': merge_all(uncorrected.values()).summary(),
+            },
+        }
+
+
+def format_scheduled_report(report: Dict[str, Any]) -> List[str]:
+    """Render a ScheduledSender report, corrected latency first"""
+    lines = [
+        f"Scheduled {report['offered_rps']} req/s, achieved {report['achieved_rps']} req/s over {report['wall_time_s']}s "
+        f"(fell up to {report['max_behind_schedule_ms']}ms behind schedule)"
+    ]
+    rows = list(report['targets'].items()) + [('OVERALL', report['overall'])]
+    for name, stats in rows:
+        lines.append(f"  {name}: {stats['requests']} requests"
+                     + (f", {stats['failures']} failed" if stats['failures'] else ""))
+        lines.append(f"    corrected:   {format_summary(stats['corrected_ms'])}")
+        lines.append(f"    uncorrected: {format_summary(stats['uncorrected_ms'])}")
+    return lines
+
+
+def format_report(report: Dict[str, Any]) -> List[str]:
+    """Render a load report as printable lines"""
+    lines = [f"Offered rate: {report['offered_rps']} req/s over {report['wall_time_s']}s"]
+    rows = list(report['targets'].items()) + [('OVERALL', report['overall'])]
+    for name, stats in rows:
+        lines.append(
+            f"  {name}: {stats['achieved_rps']} req/s achieved ({stats['ok_rps']} ok/s), "
+            f"{format_summary(stats['latency_ms'])}"
+            + (f", errors {stats['errors']} (failed in p50 {stats['error_latency_ms']['p50']:.2f}ms, "
+               f"max {stats['error_latency_ms']['max']:.2f}ms)" if stats['errors'] else "")
+            + (f", late starts {stats['late_starts']}" if stats['late_starts'] else "")
+        )
+    return lines
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Load Profiles for Kairo API Testing
+Drives endpoints through named rate profiles (ramp, step, spike, soak) on a precise open-loop timeline
+
+Usage: python load_profiles.py spike --rate 200 --duration 120 --only reality-fabricator
+       python load_profiles.py soak --rate 50 --duration 14400 --windows 48 --monitor-interval 15
+       python load_profiles.py step --rate 400 --duration 300 --steps 8 --timeline
+
+Every phase ramps linearly from its start rate to its end rate. Send times are solved in closed form from
+the cumulative arrival curve, so rate changes land exactly on the phase boundaries and long runs do not
+drift. Results are aggregated per phase and per time window as requests complete, so a multi-hour soak
+keeps histograms, not samples.
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+from http_client import clone_session, create_session, warm_up
+from latency_histogram import LatencyHistogram, format_summary, merge_all
+from load_engine import LATE_START_THRESHOLD, LoadTarget, OpenLoopLoadEngine, Send
+from metric_timeline import MetricTimeline, find_spikes, format_timeline, write_timeline
+from soak_monitor import MetricsPoller, format_leak_report
+
+# Configuration
+WINDOW = 1.0                 # Seconds per timeline window in phase results
+SPIKE_BASE_FRACTION = 0.1    # Spike profile: baseline rate as a fraction of the peak
+SPIKE_DURATION_FRACTION = 0.1
+STEPS = 5
+SOAK_WINDOWS = 12
+MONITOR_INTERVAL = 10.0      # Seconds between server metrics polls during a soak
+RECOVERY_FACTOR = 1.5        # Recovered once every later window's p99 is within 1.5x the pre-spike p99
+
+
+class Phase:
+    """A stretch of a profile whose rate moves linearly from `start_rate` to `end_rate`
+
+    `role` marks phases the analysis cares about: 'baseline' and 'spike' before a 'recovery' phase,
+    and 'soak' for drift. `window` is the width of the timeline buckets in this phase's results.
+    """
+
+    def __init__(self, name: str, duration: float, start_rate: float, end_rate: Optional[float] = None,
+                 role: Optional[str] = None, window: float = WINDOW):
+        if duration <= 0:
+            raise ValueError(f"Phase {name!r} needs a positive duration")
+        end_rate = start_rate if end_rate is None else end_rate
+        if start_rate < 0 or end_rate < 0 or start_rate + end_rate == 0:
+            raise ValueError(f"Phase {name!r} needs non-negative rates that are not both zero")
+        self.name = name
+        self.duration = duration
+        self.start_rate = start_rate
+        self.end_rate = end_rate
+        self.role = role
+        self.window = window
+
+    def expected_requests(self) -> float:
+        return (self.start_rate + self.end_rate) / 2 * self.duration
+
+    def send_offsets(self, carry: float = 0.0):
+        """Offsets into the phase of each send: the times where the cumulative arrival count reaches k + carry
+
+        With r(t) = r0 + (r1 - r0) t / T the count is N(t) = r0 t + (r1 - r0) t^2 / 2T, solved here in the
+        cancellation-free form t = 2n / (r0 + sqrt(r0^2 + 4an)).
+        """
+        r0 = self.start_rate
+        a = (self.end_rate - self.start_rate) / (2 * self.duration)
+        expected = self.expected_requests()
+        k = 0
+        while k + carry < expected:
+            n = k + carry
+            yield 2 * n / (r0 + math.sqrt(max(0.0, r0 * r0 + 4 * a * n))) if n > 0 else 0.0
+            k += 1
+
+    def next_carry(self, carry: float = 0.0) -> float:
+        """Fraction of an arrival owed to the next phase, so phase boundaries neither add nor drop sends"""
+        expected = self.expected_requests()
+        sent = max(0, math.ceil(expected - carry))
+        return sent + carry - expected
+
+
+def ramp_profile(rate: float, duration: float, start_rate: float = 1.0) -> List[Phase]:
+    """Linear ramp from `start_rate` to `rate`"""
+    return [Phase('ramp', duration, start_rate, rate)]
+
+
+def step_profile(rate: float, duration: float, steps: int = STEPS) -> List[Phase]:
+    """`steps` equal plateaus climbing to `rate`"""
+    return [Phase(f"step {i + 1}/{steps}", duration / steps, rate * (i + 1) / steps) for i in range(steps)]
+
+
+def spike_profile(rate: float, duration: float, base_rate: Optional[float] = None,
+                  spike_fraction: float = SPIKE_DURATION_FRACTION) -> List[Phase]:
+    """Baseline, a sudden jump to `rate`, then baseline again to watch the recovery"""
+    base_rate = base_rate if base_rate is not None else rate * SPIKE_BASE_FRACTION
+    baseline = duration * 0.3
+    spike = duration * spike_fraction
+    return [Phase('baseline', baseline, base_rate, role='baseline'),
+            Phase('spike', spike, rate, role='spike'),
+            Phase('recovery', duration - baseline - spike, base_rate, role='recovery')]
+
+
+def soak_profile(rate: float, duration: float, windows: int = SOAK_WINDOWS) -> List[Phase]:
+    """Constant `rate` for a long time, reported in `windows` slices to expose drift"""
+    return [Phase('soak', duration, rate, role='soak', window=duration / windows)]
+
+
+PROFILES = {'ramp': ramp_profile, 'step': step_profile, 'spike': spike_profile, 'soak': soak_profile}
+
+
+class PhaseStats:
+    """Running totals for one phase, overall, per target and per timeline window
+
+    Latencies cover successful requests; failed ones go to a separate histogram, as in load_engine.SampleStats.
+    """
+
+    def __init__(self, phase: Phase):
+        self.phase = phase
+        self.histogram = LatencyHistogram()
+        self.error_histogram = LatencyHistogram()
+        self.requests = 0
+        self.ok = 0
+        self.late_starts = 0
+        self.errors: Dict[str, int] = {}
+        self.targets: Dict[str, Dict[str, Any]] = {}
+        self.windows: Dict[int, Dict[str, Any]] = {}
+
+    def record(self, sample: Dict[str, Any], offset: float):
+        latency_ms = sample['latency'] * 1000
+        self.requests += 1
+        if sample['ok']:
+            self.ok += 1
+            self.histogram.record(latency_ms)
+        else:
+            self.error_histogram.record(latency_ms)
+            key = sample['error'] or f"HTTP {sample['status']}"
+            self.errors[key] = self.errors.get(key, 0) + 1
+        if sample['start_lag'] > LATE_START_THRESHOLD:
+            self.late_starts += 1
+
+        target = self.targets.setdefault(sample['target'], {'requests': 0, 'ok': 0, 'histogram': LatencyHistogram()})
+        target['requests'] += 1
+        target['ok'] += sample['ok']
+        if sample['ok']:
+            target['histogram'].record(latency_ms)
+
+        window = self.windows.setdefault(int(offset // self.phase.window),
+                                         {'requests': 0, 'ok': 0, 'histogram': LatencyHistogram()})
+        window['requests'] += 1
+        window['ok'] += sample['ok']
+        if sample['ok']:
+            window['histogram'].record(latency_ms)
+
+    def report(self) -> Dict[str, Any]:
+        phase = self.phase
+        return {
+            'name': phase.name,
+            'role': phase.role,
+            'duration_s': phase.duration,
+            'offered_rps': [phase.start_rate, phase.end_rate],
+            'requests': self.requests,
+            'ok': self.ok,
+            'errors': self.errors,
+            'achieved_rps': round(self.requests / phase.duration, 2),
+            'ok_rps': round(self.ok / phase.duration, 2),
+            'late_starts': self.late_starts,
+            'latency_ms': self.histogram.summary(),
+            'error_latency_ms': self.error_histogram.summary(),
+            'targets': {name: {'requests': entry['requests'], 'ok': entry['ok'],
+                               'latency_ms': entry['histogram'].summary()}
+                        for name, entry in self.targets.items()},
+            'windows': [{'start_s': round(index * phase.window, 3), 'requests': entry['requests'],
+                         'ok': entry['ok'], 'p50_ms': round(entry['histogram'].percentile(50), 2),
+                         'p99_ms': round(entry['histogram'].percentile(99), 2)}
+                        for index, entry in sorted(self.windows.items())],
+            'histogram': self.histogram,
+            'error_histogram': self.error_histogram,
+        }
+
+
+def recovery_time(baseline: Dict[str, Any], recovery: Dict[str, Any],
+                  factor: float = RECOVERY_FACTOR) -> Optional[float]:
+    """Seconds into the recovery phase after which every window is error-free and back near the baseline p99"""
+    threshold = baseline['latency_ms']['p99'] * factor
+    recovered_at = None
+    for window in recovery['windows']:
+        healthy = window['ok'] == window['requests'] and window['p99_ms'] <= threshold
+        if not healthy:
+            recovered_at = None
+        elif recovered_at is None:
+            recovered_at = window['start_s']
+    return recovered_at
+
+
+def drift(windows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Least-squares p99 slope across soak windows and the change from the first to the last window"""
+    points = [(window['start_s'], window['p99_ms']) for window in windows if window['ok']]
+    if len(points) < 2:
+        return None
+    mean_t = sum(t for t, _ in points) / len(points)
+    mean_p = sum(p for _, p in points) / len(points)
+    stt = sum((t - mean_t) ** 2 for t, _ in points)
+    slope = sum((t - mean_t) * (p - mean_p) for t, p in points) / stt if stt else 0.0
+    first, last = points[0][1], points[-1][1]
+    return {
+        'p99_slope_ms_per_hour': round(slope * 3600, 2),
+        'first_window_p99_ms': first,
+        'last_window_p99_ms': last,
+        'change_pct': round((last - first) / first * 100, 1) if first else None,
+    }
+
+
+class ProfileLoadEngine(OpenLoopLoadEngine):
+    """Open-loop engine whose rate follows a multi-phase profile instead of staying constant"""
+
+    def _profile_sends(self, targets: List[LoadTarget], phases: List[Phase],
+                       stats: List[PhaseStats]) -> Iterator[Send]:
+        phase_start = 0.0
+        carry = 0.0
+        index = 0
+        for phase, phase_stats in zip(phases, stats):
+            for offset in phase.send_offsets(carry):
+                yield phase_start + offset, targets[index % len(targets)], (phase_stats, offset)
+                index += 1
+            carry = phase.next_carry(carry)
+            phase_start += phase.duration
+
+    def run_profile(self, targets: List[LoadTarget], phases: List[Phase]) -> Dict[str, Any]:
+        """Drive all targets round-robin through `phases` and report each phase separately"""
+        if not targets:
+            raise ValueError("At least one load target is required")
+        if not phases:
+            raise ValueError("A load profile needs at least one phase")
+
+        stats = [PhaseStats(phase) for phase in phases]
+        lock = threading.Lock()
+
+        def record(sample: Dict[str, Any], tag):
+            phase_stats, offset = tag
+            with lock:
+                phase_stats.record(sample, offset)
+
+        wall_start = time.perf_counter()
+        # The last phase's window closes on schedule before stragglers are collected
+        max_lag = asyncio.run(self._dispatch(self._profile_sends(targets, phases, stats), record,
+                                             until=sum(phase.duration for phase in phases),
+                                             thread_name_prefix='profile'))
+        wall_time = time.perf_counter() - wall_start
+
+        reports = [phase_stats.report() for phase_stats in stats]
+        overall = merge_all(report.pop('histogram') for report in reports)
+        errors = merge_all(report.pop('error_histogram') for report in reports)
+        report = {
+            'wall_time_s': round(wall_time, 3),
+            'max_schedule_lag_ms': round(max_lag * 1000, 2),
+            'requests': sum(phase['requests'] for phase in reports),
+            'ok': sum(phase['ok'] for phase in reports),
+            'latency_ms': overall.summary(),
+            'error_latency_ms': errors.summary(),
+            'phases': reports,
+        }
+
+        baseline = next((phase for phase in reports if phase['role'] == 'baseline'), None)
+        for phase in reports:
+            if phase['role'] == 'recovery' and baseline is not None and baseline['requests']:
+                phase['recovery_time_s'] = recovery_time(baseline, phase)
+            if phase['role'] == 'soak':
+                phase['drift'] = drift(phase['windows'])
+        return report
+
+
+def format_profile_report(report: Dict[str, Any]) -> List[str]:
+    """Render a profile report: one block per phase, recovery and drift where they apply"""
+    lines = [f"{report['requests']} requests over {report['wall_time_s']}s, {report['ok']} ok "
+             f"(sender fell up to {report['max_schedule_lag_ms']}ms behind schedule)"]
+    for phase in report['phases']:
+        start_rate, end_rate = phase['offered_rps']
+        offered = f"{start_rate:g}" if start_rate == end_rate else f"{start_rate:g}→{end_rate:g}"
+        lines.append(f"  {phase['name']} ({phase['duration_s']:g}s at {offered} req/s): "
+                     f"{phase['achieved_rps']} req/s achieved ({phase['ok_rps']} ok/s)"
+                     + (f", errors {phase['errors']}" if phase['errors'] else "")
+                     + (f", late starts {phase['late_starts']}" if phase['late_starts'] else ""))
+        lines.append(f"    {format_summary(phase['latency_ms'])}")
+        if phase['errors']:
+            lines.append(f"    failed: {format_summary(phase['error_latency_ms'])}")
+        if 'recovery_time_s' in phase:
+            recovered = phase['recovery_time_s']
+            lines.append(f"    recovered {recovered:g}s after the spike" if recovered is not None
+                         else "    ⚠️  did not recover to the baseline p99 within this phase")
+        if phase.get('drift'):
+            d = phase['drift']
+            lines.append(f"    drift: p99 {d['first_window_p99_ms']}ms → {d['last_window_p99_ms']}ms "
+                         f"({d['change_pct']}%), slope {d['p99_slope_ms_per_hour']}ms/hour")
+    lines.append(f"  OVERALL: {format_summary(report['latency_ms'])}")
+    if report['ok'] < report['requests']:
+        lines.append(f"  OVERALL failed: {format_summary(report['error_latency_ms'])}")
+    return lines
+
+
+def catalog_targets(base_url: str, catalog, only: Optional[List[str]] = None) -> List[LoadTarget]:
+    """LoadTargets for ENDPOINT_CATALOG entries, optionally limited to the endpoints in `only`"""
+    return [LoadTarget(label, method, f"{base_url}/api/{endpoint}", payload)
+            for label, method, endpoint, payload, _ in catalog if not only or endpoint in only]
+
+
+def main():
+    from comprehensive_backend_test import BASE_URL, DEMO_CREDENTIALS, ENDPOINT_CATALOG, TIMEOUT
+
+    parser = argparse.ArgumentParser(description="Drive Kairo endpoints through a named load profile")
+    parser.add_argument("profile", choices=sorted(PROFILES))
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--rate", type=float, default=100.0, help="Peak (ramp, step, spike) or steady (soak) req/s")
+    parser.add_argument("--duration", type=float, default=60.0, help="Total profile length in seconds")
+    parser.add_argument("--steps", type=int, default=STEPS, help="Plateaus of the step profile")
+    parser.add_argument("--windows", type=int, default=SOAK_WINDOWS, help="Drift windows of the soak profile")
+    parser.add_argument("--only", action="append", metavar="ENDPOINT", help="Drive only these endpoints (repeatable)")
+    parser.add_argument("--monitor-interval", type=float, default=None,
+                        help="Poll server metrics for leaks every N seconds (default: 10 for soak, off otherwise)")
+    parser.add_argument("--timeline", action="store_true",
+                        help="Show per-second client latency next to the server metrics for the same second")
+    parser.add_argument("--timeline-out", metavar="PATH", help="Write every timeline window to a JSON file")
+    args = parser.parse_args()
+
+    options = {'step': {'steps': args.steps}, 'soak': {'windows': args.windows}}.get(args.profile, {})
+    phases = PROFILES[args.profile](args.rate, args.duration, **options)
+    catalog = [entry for entry in ENDPOINT_CATALOG if not args.only or entry[2] in args.only]
+
+    print("=" * 80)
+    print(f"KAIRO {args.profile.upper()} LOAD PROFILE")
+    print("=" * 80)
+    print(f"Testing against: {args.base_url}")
+    print(f"Endpoints: {len(catalog)}, phases: {', '.join(phase.name for phase in phases)}")
+    print("-" * 80)
+
+    monitor_interval = args.monitor_interval if args.monitor_interval is not None else (
+        MONITOR_INTERVAL if args.profile == 'soak' else 0)
+
+    login = create_session()
+    warm_up(login, args.base_url)
+    timeline = args.timeline or bool(args.timeline_out)
+    # /api/performance/metrics, polled by the leak monitor and the timeline, needs the login as well
+    if monitor_interval > 0 or timeline or any(requires_auth for *_, requires_auth in catalog):
+        try:
+            login.post(f"{args.base_url}/api/auth/signin", json=DEMO_CREDENTIALS, timeout=TIMEOUT)
+        except requests.exceptions.RequestException:
+            pass  # Authenticated endpoints will show up as errors
+
+    # The poller keeps its own connection, so polls never queue behind load requests. The timeline's
+    # per-second polls serve the leak check too.
+    timeline = MetricTimeline(args.base_url, clone_session(login)).start() if timeline else None
+    poller = timeline.poller if timeline else None
+    if poller is None and monitor_interval > 0:
+        poller = MetricsPoller(args.base_url, clone_session(login), monitor_interval).start()
+
+    engine = ProfileLoadEngine(session_factory=lambda: clone_session(login),
+                               on_sample=timeline.on_sample if timeline else None)
+    report = engine.run_profile(catalog_targets(args.base_url, catalog), phases)
+    if poller is not None:
+        poller.stop()
+    for line in format_profile_report(report):
+        print(line)
+
+    if timeline is not None:
+        rows = timeline.rows()
+        spikes = find_spikes(rows)
+        print("-" * 80)
+        for line in format_timeline(rows, spikes, notes=timeline.poller.notes()):
+            print(line)
+        if args.timeline_out:
+            write_timeline(args.timeline_out, rows, spikes, timeline.window)
+            print(f"Timeline written to {args.timeline_out}")
+
+    leaks = []
+    if monitor_interval > 0:
+        analysis = poller.analyze()
+        leaks = analysis['suspects']
+        print("-" * 80)
+        print("Server metrics:")
+        for line in format_leak_report(analysis):
+            print(line)
+    print("=" * 80)
+    return 0 if report['ok'] == report['requests'] and not leaks else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
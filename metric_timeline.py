@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Client/Server Metric Timeline for Kairo API Testing
+Puts per-second client latency next to the server's own metrics for the same second
+
+Usage: python load_profiles.py spike --rate 200 --duration 120 --timeline
+       python comprehensive_backend_test.py --profile step --timeline --timeline-out timeline.json
+
+Client samples are bucketed by the second their request was sent, server metrics by the second they were
+polled, both counted from one shared perf_counter origin. Cumulative server counters (CPU time, request
+totals) are turned into per-second rates between polls. Windows whose p99 stands well above the run's
+typical p99 are marked as spikes, and long runs print only the spikes with a little context around them.
+/api/monitoring/metrics (heap, RSS, CPU, connections) is rate-limited on the server to 100 requests per 15
+minutes per IP, so its columns are filled about every 15s rather than every window (see soak_monitor).
+"""
+
+import json
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from latency_histogram import LatencyHistogram
+from soak_monitor import MetricsPoller, is_cumulative
+
+# Configuration
+WINDOW = 1.0
+SPIKE_FACTOR = 2.0          # A window is a spike when its p99 exceeds 2x the median window p99
+MIN_SPIKE_SAMPLES = 5       # Windows with fewer requests have no meaningful p99
+MAX_ROWS = 120              # Longer timelines print only spikes and their neighbours
+CONTEXT_WINDOWS = 2
+MB = 1024 * 1024
+
+# Server columns shown when the routes report them: (series, header, formatter)
+COLUMNS: List[Tuple[str, str, Callable[[float], str]]] = [
+    ('monitoring.memory.heapUsed', 'heap MB', lambda v: f"{v / MB:.1f}"),
+    ('monitoring.memory.rss', 'rss MB', lambda v: f"{v / MB:.1f}"),
+    ('monitoring.cpu.user/s', 'cpu usr%', lambda v: f"{v / 1e4:.1f}"),     # process.cpuUsage() is in µs
+    ('monitoring.cpu.system/s', 'cpu sys%', lambda v: f"{v / 1e4:.1f}"),
+    ('monitoring.database.activeConnections', 'db conn', lambda v: f"{v:.0f}"),
+    ('monitoring.database.waitingConnections', 'db wait', lambda v: f"{v:.0f}"),
+    ('performance.current.requestsPerSecond', 'srv rps', lambda v: f"{v:.1f}"),
+    ('client.poll_ms.monitoring', 'poll ms', lambda v: f"{v:.1f}"),
+]
+
+
+class MetricTimeline:
+    """Per-window client latency histograms and server metrics polled on the same clock
+
+    Pass `on_sample` to a load engine; start() before the load begins and stop() after it ends.
+    """
+
+    def __init__(self, base_url: str, session: requests.Session = None, window: float = WINDOW,
+                 poll_interval: float = None):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.poller = MetricsPoller(base_url, session, poll_interval or window)
+        self.origin: Optional[float] = None
+        self._windows: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> 'MetricTimeline':
+        self.origin = time.perf_counter()
+        self.poller.start(self.origin)
+        return self
+
+    def stop(self):
+        self.poller.stop()
+
+    def on_sample(self, sample: Dict[str, Any]):
+        """Load engine callback: file the sample under the window its request was sent in"""
+        sent = time.perf_counter() - sample['latency'] - self.origin
+        index = max(0, int(sent // self.window))
+        with self._lock:
+            entry = self._windows.get(index)
+            if entry is None:
+                entry = self._windows[index] = {'histogram': LatencyHistogram(), 'errors': 0}
+            entry['histogram'].record(sample['latency'] * 1000)
+            if not sample['ok']:
+                entry['errors'] += 1
+
+    def _server_windows(self) -> Dict[int, Dict[str, float]]:
+        """Last polled value of every series per window, with cumulative counters as rates"""
+        windows: Dict[int, Dict[str, float]] = {}
+        for name, (times, values) in self.poller.snapshot().items():
+            if is_cumulative(name):
+                name += '/s'
+                points = [(times[i], (values[i] - values[i - 1]) / (times[i] - times[i - 1]))
+                          for i in range(1, len(times)) if times[i] > times[i - 1]]
+            else:
+                points = list(zip(times, values))
+            for t, value in points:
+                windows.setdefault(int(t // self.window), {})[name] = value
+        return windows
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One row per window from the first to the last that saw a request or a poll"""
+        with self._lock:
+            client = {index: (entry['histogram'].summary([50, 99]), entry['errors'])
+                      for index, entry in self._windows.items()}
+        server = self._server_windows()
+        last = max(list(client) + list(server), default=-1)
+        rows = []
+        for index in range(last + 1):
+            summary, errors = client.get(index, (None, 0))
+            rows.append({
+                'window': index,
+                'offset_s': round(index * self.window, 3),
+                'requests': summary['count'] if summary else 0,
+                'errors': errors,
+                'p50_ms': summary['p50'] if summary else None,
+                'p99_ms': summary['p99'] if summary else None,
+                'max_ms': summary['max'] if summary else None,
+                'server': server.get(index, {}),
+            })
+        return rows
+
+
+def find_spikes(rows: List[Dict[str, Any]], factor: float = SPIKE_FACTOR) -> List[int]:
+    """Windows whose p99 exceeds `factor` times the median window p99"""
+    p99s = sorted(row['p99_ms'] for row in rows if row['requests'] >= MIN_SPIKE_SAMPLES)
+    if not p99s:
+        return []
+    median = p99s[len(p99s) // 2]
+    return [row['window'] for row in rows
+            if row['requests'] >= MIN_SPIKE_SAMPLES and row['p99_ms'] > factor * median]
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{value:>9.2f}" if value is not None else f"{'-':>9}"
+
+
+def format_timeline(rows: List[Dict[str, Any]], spikes: List[int], max_rows: int = MAX_ROWS,
+                    notes: List[str] = ()) -> List[str]:
+    """Render the timeline as a table; past `max_rows` windows only spikes and their neighbours are shown
+
+    `notes` (MetricsPoller.notes()) explain gaps in the server columns.
+    """
+    present = {name for row in rows for name in row['server']}
+    columns = [column for column in COLUMNS if column[0] in present]
+    header = f"  {'':2}{'t (s)':>8} {'req':>6} {'err':>5} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    header += "".join(f" {title:>9}" for _, title, _ in columns)
+    lines = [f"Timeline ({len(rows)} windows, {len(spikes)} p99 spikes over {SPIKE_FACTOR:g}x the median window p99)",
+             *(f"  {note}" for note in notes), header]
+
+    spike_set = set(spikes)
+    if len(rows) <= max_rows:
+        shown = set(range(len(rows)))
+    else:
+        shown = {index for spike in spikes for index in range(spike - CONTEXT_WINDOWS, spike + CONTEXT_WINDOWS + 1)
+                 if 0 <= index < len(rows)}
+    previous = -1
+    for row in rows:
+        if row['window'] not in shown:
+            continue
+        if previous >= 0 and row['window'] != previous + 1:
+            lines.append("  ...")
+        previous = row['window']
+        line = (f"  {'⚠️' if row['window'] in spike_set else '':2}{row['offset_s']:>8g} {row['requests']:>6} "
+                f"{row['errors']:>5} {_ms(row['p50_ms'])} {_ms(row['p99_ms'])} {_ms(row['max_ms'])}")
+        for name, _, fmt in columns:
+            value = row['server'].get(name)
+            line += f" {fmt(value) if value is not None and math.isfinite(value) else '-':>9}"
+        lines.append(line)
+    if len(rows) > max_rows and not spikes:
+        lines.append("  (no p99 spikes; write the timeline to a file to see every window)")
+    return lines
+
+
+def write_timeline(path: str, rows: List[Dict[str, Any]], spikes: List[int], window: float = WINDOW):
+    """Save every window, with all polled server series, as JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'window_s': window, 'spikes': spikes, 'rows': rows}, f, indent=1)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Multi-Core Load Generation for Kairo API Testing
+Shards the comprehensive_backend_test.py endpoint catalog across a process pool and merges per-worker histograms
+
+Usage: python process_pool_runner.py --duration 30 --connections 8
+       python process_pool_runner.py --god-tier-only --rate 2000 --workers 8
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from comprehensive_backend_test import BASE_URL, DEMO_CREDENTIALS, ENDPOINT_CATALOG, TIMEOUT
+from http_client import create_session
+from latency_histogram import LatencyHistogram, format_summary
+from load_engine import LoadTarget, OpenLoopLoadEngine
+
+# Configuration
+DURATION = 30.0
+CONNECTIONS_PER_WORKER = 8
+GOD_TIER_ROUTES = {'quantum-simulation', 'hipaa-compliance', 'reality-fabricator', 'auto-compliance',
+                   'global-consciousness', 'god-tier/dashboard'}
+
+# (label, method, endpoint, payload, requires_auth), as in ENDPOINT_CATALOG
+Endpoint = Tuple[str, str, str, Optional[Dict[str, Any]], bool]
+
+
+def shard_endpoints(catalog: List[Endpoint], workers: int) -> List[List[Endpoint]]:
+    """Split the catalog round-robin; with more workers than endpoints, endpoints are shared"""
+    if workers <= len(catalog):
+        return [catalog[i::workers] for i in range(workers)]
+    return [[catalog[i % len(catalog)]] for i in range(workers)]
+
+
+def _pooled_session(base_url: str, connections: int, needs_auth: bool) -> requests.Session:
+    session = create_session(max_per_host=connections)
+    if needs_auth:
+        try:
+            session.post(f"{base_url}/api/auth/signin", json=DEMO_CREDENTIALS, timeout=TIMEOUT)
+        except requests.exceptions.RequestException:
+            pass  # Authenticated endpoints will simply show up as failures
+    return session
+
+
+def _closed_loop(session: requests.Session, base_url: str, shard: List[Endpoint], connections: int,
+                 duration: float) -> Dict[str, Dict[str, Any]]:
+    """`connections` threads cycle through the shard back to back, sharing one pooled session"""
+    histograms = {label: LatencyHistogram() for label, *_ in shard}
+    failures = {label: 0 for label, *_ in shard}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(offset: int):
+        local = {label: LatencyHistogram() for label, *_ in shard}
+        local_failures = {label: 0 for label, *_ in shard}
+        index = offset
+        while time.perf_counter() < deadline:
+            label, method, endpoint, payload, _ = shard[index % len(shard)]
+            index += 1
+            start_time = time.perf_counter()
+            try:
+                response = session.request(method, f"{base_url}/api/{endpoint}", json=payload, timeout=TIMEOUT)
+                ok = response.status_code in (200, 201)
+            except requests.exceptions.RequestException:
+                ok = False
+            # Only successful requests carry a latency, as in load_engine.SampleStats
+            if ok:
+                local[label].record((time.perf_counter() - start_time) * 1000)
+            else:
+                local_failures[label] += 1
+        with lock:
+            for label in histograms:
+                histograms[label].merge(local[label])
+                failures[label] += local_failures[label]
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {label: {'histogram': histograms[label].to_dict(), 'failures': failures[label]} for label in histograms}
+
+
+def run_worker(base_url: str, shard: List[Endpoint], duration: float, connections: int,
+               rate: Optional[float]) -> Dict[str, Any]:
+    """Process-pool entry point: load one shard and return compact histograms, never raw samples"""
+    needs_auth = any(requires_auth for *_, requires_auth in shard)
+    session = _pooled_session(base_url, connections, needs_auth)
+
+    start = time.perf_counter()
+    if rate:
+        engine = OpenLoopLoadEngine(session_factory=lambda: session, max_in_flight=connections)
+        targets = [LoadTarget(label, method, f"{base_url}/api/{endpoint}", payload)
+                   for label, method, endpoint, payload, _ in shard]
+        report = engine.run(targets, rate, duration)
+        targets_result = {
+            label: {'histogram': stats['histogram'], 'failures': stats['requests'] - stats['ok']}
+            for label, stats in report['targets'].items()
+        }
+    else:
+        targets_result = _closed_loop(session, base_url, shard, connections, duration)
+
+    return {'pid': os.getpid(), 'wall_time': time.perf_counter() - start, 'targets': targets_result}
+
+
+def merge_worker_results(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Merge per-worker histograms into one histogram and failure count per endpoint"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        for label, data in result['targets'].items():
+            entry = merged.setdefault(label, {'histogram': LatencyHistogram(), 'failures': 0})
+            entry['histogram'].merge(LatencyHistogram.from_dict(data['histogram']))
+            entry['failures'] += data['failures']
+    return merged
+
+
+class ProcessPoolLoadRunner:
+    def __init__(self, base_url: str = BASE_URL, workers: int = None,
+                 connections: int = CONNECTIONS_PER_WORKER):
+        self.base_url = base_url
+        self.workers = workers or os.cpu_count() or 1
+        self.connections = connections
+
+    def run(self, catalog: List[Endpoint], duration: float = DURATION, rate: Optional[float] = None) -> Dict[str, Any]:
+        """Load every endpoint in `catalog` from all workers at once and merge the results"""
+        shards = shard_endpoints(catalog, self.workers)
+        worker_rate = rate / len(shards) if rate else None
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            futures = [pool.submit(run_worker, self.base_url, shard, duration, self.connections, worker_rate)
+                       for shard in shards]
+            results = [future.result() for future in futures]
+        wall_time = time.perf_counter() - start
+
+        merged = merge_worker_results(results)
+        overall = LatencyHistogram()
+        for entry in merged.values():
+            overall.merge(entry['histogram'])
+        load_time = max(result['wall_time'] for result in results)
+        failures = sum(entry['failures'] for entry in merged.values())
+
+        return {
+            'workers': len(shards),
+            'wall_time_s': round(wall_time, 3),
+            'throughput_rps': round((len(overall) + failures) / load_time, 2) if load_time > 0 else 0.0,
+            'failures': failures,
+            'overall': overall,
+            'endpoints': merged,
+            'load_time_s': load_time,
+        }
+
+
+def print_report(report: Dict[str, Any]):
+    print("-" * 80)
+    print(f"Workers: {report['workers']}, total throughput: {report['throughput_rps']} req/s, "
+          f"failures: {report['failures']}")
+    for label, entry in sorted(report['endpoints'].items()):
+        histogram = entry['histogram']
+        requests = len(histogram) + entry['failures']
+        rps = requests / report['load_time_s'] if report['load_time_s'] > 0 else 0.0
+        print(f"  {label}: {rps:.2f} req/s"
+              + (f", {entry['failures']} failed" if entry['failures'] else "")
+              + f" - {format_summary(histogram.summary())}")
+    print(f"  OVERALL: {format_summary(report['overall'].summary())}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Multi-core Kairo load generation")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--connections", type=int, default=CONNECTIONS_PER_WORKER, help="Concurrent requests per worker")
+    parser.add_argument("--duration", type=float, default=DURATION)
+    parser.add_argument("--rate", type=float, help="Total open-loop arrival rate; closed-loop when omitted")
+    parser.add_argument("--god-tier-only", action="store_true", help="Only load the god-tier routes")
+    args = parser.parse_args()
+
+    catalog = [entry for entry in ENDPOINT_CATALOG if not args.god_tier_only or entry[2] in GOD_TIER_ROUTES]
+
+    print("=" * 80)
+    print("KAIRO MULTI-CORE LOAD GENERATION")
+    print("=" * 80)
+    print(f"Testing against: {args.base_url}")
+    print(f"Endpoints: {len(catalog)}, duration: {args.duration}s, "
+          + (f"open-loop {args.rate} req/s" if args.rate else f"closed-loop {args.connections} connections/worker"))
+
+    runner = ProcessPoolLoadRunner(args.base_url, args.workers, args.connections)
+    report = runner.run(catalog, args.duration, args.rate)
+    print_report(report)
+
+    sys.exit(0 if report['failures'] == 0 else 1)
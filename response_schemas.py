@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Response Schema Registry for Kairo API Testing
+One schema per route, compiled once at import into validators cheap enough to run on every response under load
+
+Schemas are plain Python literals:
+  str, bool, NUMBER, ...   value must be an instance (NUMBER accepts int and float, but not bool)
+  {"key": ..., "opt?": ...} object with the listed fields; a trailing "?" marks a field as optional
+  [item]                   array whose every element matches `item`
+  Const(value)             exactly this value, e.g. Const(True) for the success flag
+  OneOf(a, b, ...)         one of a fixed set of values
+  ANY                      anything, only the field's presence is checked
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+NUMBER = 'number'
+ANY = 'any'
+
+# Kind of a JSON value as reported by json_stream.TopLevelScanner
+JSON_KINDS = {dict: 'object', list: 'array', str: 'string', bool: 'boolean', int: 'number', float: 'number',
+              type(None): 'null'}
+
+
+class Const:
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class OneOf:
+    def __init__(self, *values: Any):
+        self.values = frozenset(values)
+
+
+Validator = Callable[[Any], Optional[str]]
+
+
+def _kind(value: Any) -> str:
+    return JSON_KINDS.get(type(value), type(value).__name__)
+
+
+def compile_schema(schema: Any, path: str = "") -> Validator:
+    """Turn a schema literal into a function returning None for a valid value, or the first problem found"""
+    where = path or "response"
+
+    if schema == ANY:
+        return lambda value: None
+
+    if schema == NUMBER:
+        def check_number(value):
+            if type(value) is int or type(value) is float:
+                return None
+            return f"{where}: expected number, got {_kind(value)}"
+        return check_number
+
+    if isinstance(schema, type):
+        expected = JSON_KINDS.get(schema, schema.__name__)
+
+        def check_type(value):
+            # bool is an int subclass; an exact type match keeps true/false out of numeric fields
+            if type(value) is schema:
+                return None
+            return f"{where}: expected {expected}, got {_kind(value)}"
+        return check_type
+
+    if isinstance(schema, Const):
+        constant = schema.value
+
+        def check_const(value):
+            if value == constant and type(value) is type(constant):
+                return None
+            return f"{where}: expected {constant!r}, got {value!r}"
+        return check_const
+
+    if isinstance(schema, OneOf):
+        allowed = schema.values
+
+        def check_one_of(value):
+            try:
+                if value in allowed:
+                    return None
+            except TypeError:  # Unhashable values are never in the set
+                pass
+            return f"{where}: {value!r} is not one of {sorted(allowed, key=repr)}"
+        return check_one_of
+
+    if isinstance(schema, list):
+        if len(schema) != 1:
+            raise ValueError(f"{where}: an array schema lists exactly one item schema")
+        check_item = compile_schema(schema[0], f"{path}[]")
+
+        def check_array(value):
+            if type(value) is not list:
+                return f"{where}: expected array, got {_kind(value)}"
+            for item in value:
+                problem = check_item(item)
+                if problem:
+                    return problem
+            return None
+        return check_array
+
+    if isinstance(schema, dict):
+        required = [key for key in schema if not key.endswith('?')]
+        fields = [(key.rstrip('?'), compile_schema(sub, f"{path}.{key.rstrip('?')}" if path else key.rstrip('?')))
+                  for key, sub in schema.items()]
+        missing_prefix = f"{path}: missing fields" if path else "Missing expected fields:"
+
+        def check_object(value):
+            if type(value) is not dict:
+                return f"{where}: expected object, got {_kind(value)}"
+            missing = [key for key in required if key not in value]
+            if missing:
+                return f"{missing_prefix} {missing}"
+            for key, check_field in fields:
+                if key in value:
+                    problem = check_field(value[key])
+                    if problem:
+                        return problem
+            return None
+        return check_object
+
+    raise ValueError(f"{where}: unsupported schema {schema!r}")
+
+
+def _schema_kind(schema: Any) -> Optional[str]:
+    """JSON kind a schema demands, or None if several kinds can match"""
+    if isinstance(schema, dict):
+        return 'object'
+    if isinstance(schema, list):
+        return 'array'
+    if schema == NUMBER:
+        return 'number'
+    if isinstance(schema, type):
+        return JSON_KINDS.get(schema)
+    if isinstance(schema, Const):
+        return _kind(schema.value)
+    return None
+
+
+class RouteSchema:
+    """Compiled schema of one route's success response"""
+
+    def __init__(self, route: str, schema: Dict[str, Any]):
+        self.route = route
+        self.schema = schema
+        self.validate = compile_schema(schema)
+        self.fields = [key for key in schema if not key.endswith('?')]
+        # Top-level fields small enough to decode when the body is streamed instead of parsed
+        self.scalar_fields = [key.rstrip('?') for key, sub in schema.items()
+                              if _schema_kind(sub) not in ('object', 'array')]
+        self._kinds = {key.rstrip('?'): _schema_kind(sub) for key, sub in schema.items()}
+        self._field_checks = {key.rstrip('?'): compile_schema(sub, key.rstrip('?')) for key, sub in schema.items()
+                              if key.rstrip('?') in self.scalar_fields}
+
+    def validate_top_level(self, kinds: Dict[str, str], values: Dict[str, Any]) -> Optional[str]:
+        """Check a streamed body: presence and kind of every field, and the full value of scalar ones
+
+        `kinds` maps each top-level key to the JSON kind of its value, `values` holds the decoded scalars.
+        Nested objects and arrays are not looked into.
+        """
+        missing = [key for key in self.fields if key not in kinds]
+        if missing:
+            return f"Missing expected fields: {missing}"
+        for key, kind in kinds.items():
+            expected = self._kinds.get(key)
+            if expected is not None and kind != expected:
+                return f"{key}: expected {expected}, got {kind}"
+            if key in self._field_checks and key in values:
+                problem = self._field_checks[key](values[key])
+                if problem:
+                    return problem
+        return None
+
+
+SUCCESS = Const(True)
+
+# Success responses, keyed by route (the path after /api/), as returned by src/app/api/<route>/route.ts.
+# Routes whose real and stubbed shapes differ (trinity, performance) are left out rather than
+# described loosely. A reality-fabricator cache hit spreads the bare fabrication object instead of this body
+# (route.ts, getCachedApiResponse) and is reported as a mismatch.
+SCHEMAS: Dict[str, Dict[str, Any]] = {
+    'health': {'success': SUCCESS, 'data': {'status': OneOf('healthy', 'degraded')}},
+    'auth/signin': {'user': {'id': str, 'email': str}, 'message?': str},
+    'auth/me': {'success': SUCCESS, 'data': {'id': str, 'email': str}},
+    'user/profile': {'id': str, 'email': str, 'subscription_tier': str},
+    'notifications': {'success': SUCCESS, 'data': {'notifications': [dict]}},
+    'learning/progress': {'success': SUCCESS, 'data': {'progress': [dict], 'certifications?': list,
+                                                       'statistics?': dict}},
+    'quantum-simulation': {'success': SUCCESS, 'simulation': dict, 'message': str},
+    'hipaa-compliance': {'success': SUCCESS, 'compliance': dict, 'message': str},
+    'reality-fabricator': {'success': SUCCESS, 'fabrication': dict, 'message': str, 'cached?': bool},
+    'auto-compliance': {'success': SUCCESS, 'compliance': dict, 'message': str},
+    'global-consciousness': {'success': SUCCESS, 'consciousness': dict, 'message': str, 'status': str},
+    'ai-prophet-certification': {'success': SUCCESS, 'certification': dict, 'message': str, 'divine_status': str},
+    'neuro-adaptive': {'success': SUCCESS, 'adaptation': dict, 'message': str, 'brain_status': str},
+    'fedramp-compliance': {'success': SUCCESS, 'compliance': dict, 'message': str, 'government_status': str},
+    'quantum-workflow-db': {'success': SUCCESS, 'database': dict, 'message': str, 'reality_status': str},
+    'god-tier/dashboard': {'success': SUCCESS, 'data': dict, 'divine_message': str},
+}
+
+REGISTRY: Dict[str, RouteSchema] = {route: RouteSchema(route, schema) for route, schema in SCHEMAS.items()}
+
+
+def schema_for(route: str) -> Optional[RouteSchema]:
+    return REGISTRY.get(route)
+
+
+def validate_response(route: str, data: Any) -> Optional[str]:
+    """Problem with `data` as a success response of `route`, or None (also for routes without a schema)"""
+    schema = REGISTRY.get(route)
+    return schema.validate(data) if schema is not None else None
+
+
+def route_fields(route: str) -> List[str]:
+    return list(REGISTRY[route].fields)
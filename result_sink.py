@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Buffered Result Sink for Kairo API Testing
+Takes log lines and result records off the hot path: a background thread writes NDJSON and the console
+
+emit() only stamps the record and appends it to a bounded buffer; serializing, file writes and terminal
+output happen in batches on the writer thread. A full buffer makes emit() wait for the writer, so memory
+stays bounded whatever the request rate. When the console falls behind, routine lines are dropped from the
+terminal (never from the file) while failures, warnings and results are always shown. Records are flushed
+by close(), which also runs at interpreter exit.
+"""
+
+import atexit
+import json
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+# Configuration
+MAX_BUFFERED = 10000      # Records held in memory before emit() waits for the writer
+CONSOLE_BACKLOG = 1000    # Above this many queued records, routine console lines are skipped
+FILE_BUFFER = 1 << 20
+ALWAYS_SHOWN = {'FAIL', 'ERROR', 'WARN', 'RESULT', 'START'}
+
+
+class ResultSink:
+    """Background NDJSON writer and console printer with a bounded in-memory buffer
+
+    Records carrying a `message` are printed as "[HH:MM:SS] LEVEL: message"; all records go to `path`
+    (one JSON object per line) when a path is given. `console_levels` limits which levels are printed.
+    """
+
+    def __init__(self, path: Optional[str] = None, console: bool = True, console_levels: Optional[set] = None,
+                 max_buffered: int = MAX_BUFFERED):
+        self.path = path
+        self.console = console
+        self.console_levels = console_levels
+        self.max_buffered = max_buffered
+        self.written = 0
+        self.console_dropped = 0
+        self._file = open(path, 'a', encoding='utf-8', buffering=FILE_BUFFER) if path else None
+        self._buffer: deque = deque()
+        self._condition = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._clock_second = None
+        self._clock_text = ''
+        self._thread = threading.Thread(target=self._write_loop, name='result-sink', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, record: Dict[str, Any]):
+        """Queue a record; waits only while the buffer is full"""
+        record.setdefault('ts', time.time())
+        with self._condition:
+            while len(self._buffer) >= self.max_buffered and not self._closed:
+                self._condition.wait()
+            if self._closed:
+                raise RuntimeError("ResultSink is closed")
+            self._buffer.append(record)
+            self._condition.notify_all()
+
+    def log(self, message: str, level: str = "INFO", **fields):
+        self.emit({'level': level, 'message': message, **fields})
+
+    def _clock(self, ts: float) -> str:
+        second = int(ts)
+        if second != self._clock_second:
+            self._clock_second = second
+            self._clock_text = time.strftime("%H:%M:%S", time.localtime(second))
+        return self._clock_text
+
+    def _write_batch(self, batch, backlog: int):
+        if self._file is not None:
+            self._file.write(''.join(json.dumps(record, default=str) + '\n' for record in batch))
+        if self.console:
+            lines = []
+            for record in batch:
+                if 'message' not in record:
+                    continue
+                level = record.get('level', 'INFO')
+                if self.console_levels is not None and level not in self.console_levels:
+                    continue
+                if backlog > CONSOLE_BACKLOG and level not in ALWAYS_SHOWN:
+                    self.console_dropped += 1
+                    continue
+                lines.append(f"[{self._clock(record['ts'])}] {level}: {record['message']}\n")
+            if lines:
+                sys.stdout.write(''.join(lines))
+                sys.stdout.flush()
+        self.written += len(batch)
+
+    def _write_loop(self):
+        while True:
+            with self._condition:
+                while not self._buffer and not self._closed:
+                    self._condition.wait()
+                if not self._buffer and self._closed:
+                    return
+                batch = list(self._buffer)
+                self._buffer.clear()
+                backlog = len(batch)
+                self._busy = True
+                self._condition.notify_all()  # Wake producers waiting on a full buffer
+            try:
+                self._write_batch(batch, backlog)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def flush(self):
+        """Block until every queued record has been written, and push it to disk and the terminal"""
+        with self._condition:
+            while (self._buffer or self._busy) and self._thread.is_alive():
+                self._condition.wait()
+        if self._file is not None:
+            self._file.flush()
+        sys.stdout.flush()
+
+    def close(self):
+        """Write everything still queued and close the file; safe to call more than once"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self._file is not None:
+            self._file.close()
+        sys.stdout.flush()
+        if self.console_dropped:
+            sys.stdout.write(f"({self.console_dropped} routine log lines skipped on the console while it "
+                             f"lagged behind{'; all are in ' + self.path if self.path else ''})\n")
+            sys.stdout.flush()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Weighted User-Journey Scenarios for Kairo API Testing
+Runs many virtual users through a weighted mix of multi-step journeys with think time between steps
+
+Usage: python scenarios.py journeys.json --users 50 --duration 60
+       python scenarios.py journeys.json --users 200 --ramp-up 20 --base-url http://localhost:3000
+
+Scenario file (JSON):
+  think_time      default think time, e.g. {"distribution": "exponential", "mean_ms": 1000}
+  journeys[]      name, weight, optional think_time, abort_on_failure (default true) and steps[]
+  steps[]         name, method, path, then payload (inline JSON) or payload_ref (a payload constant of
+                  comprehensive_backend_test.py or backend_test.py), and optional expect (status list)
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from http_client import create_session, shared_transport_session, warm_up
+from latency_histogram import LatencyHistogram, format_summary
+
+# Configuration
+BASE_URL = "http://localhost:3001"
+TIMEOUT = 30
+VIRTUAL_USERS = 10
+DURATION = 60.0
+THINK_TIME_DISTRIBUTIONS = ['none', 'fixed', 'uniform', 'exponential', 'lognormal']
+
+
+class ThinkTime:
+    """Pause a virtual user takes between steps, drawn from a configurable distribution"""
+
+    def __init__(self, spec: Optional[Dict[str, Any]] = None):
+        spec = spec or {'distribution': 'none'}
+        self.distribution = spec.get('distribution', 'fixed')
+        if self.distribution not in THINK_TIME_DISTRIBUTIONS:
+            raise ValueError(f"Unknown think time distribution: {self.distribution}")
+        self.mean_ms = float(spec.get('mean_ms', spec.get('median_ms', 0.0)))
+        self.min_ms = float(spec.get('min_ms', 0.0))
+        self.max_ms = float(spec.get('max_ms', self.min_ms))
+        self.sigma = float(spec.get('sigma', 0.5))
+
+    def sample(self) -> float:
+        """Seconds to pause"""
+        if self.distribution == 'none':
+            return 0.0
+        if self.distribution == 'uniform':
+            return random.uniform(self.min_ms, self.max_ms) / 1000.0
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.distribution == 'exponential':
+            return random.expovariate(1000.0 / self.mean_ms)
+        if self.distribution == 'lognormal':
+            return random.lognormvariate(math.log(self.mean_ms), self.sigma) / 1000.0
+        return self.mean_ms / 1000.0
+
+
+def resolve_payload_ref(name: str) -> Any:
+    """Look a payload constant up in the tester modules, so scenarios reuse the maintained payloads"""
+    import backend_test
+    import comprehensive_backend_test
+    for module in (comprehensive_backend_test, backend_test):
+        if hasattr(module, name):
+            return getattr(module, name)
+    raise ValueError(f"Unknown payload_ref: {name}")
+
+
+def load_scenario(path: str) -> Dict[str, Any]:
+    """Read and validate a scenario file, resolving payload references and think times"""
+    with open(path, encoding='utf-8') as f:
+        scenario = json.load(f)
+
+    journeys = scenario.get('journeys') or []
+    if not journeys:
+        raise ValueError("A scenario needs at least one journey")
+    default_think = scenario.get('think_time')
+    for journey in journeys:
+        if not journey.get('steps'):
+            raise ValueError(f"Journey {journey.get('name')!r} has no steps")
+        if journey.get('weight', 1) <= 0:
+            raise ValueError(f"Journey {journey.get('name')!r} needs a positive weight")
+        journey.setdefault('weight', 1)
+        journey.setdefault('abort_on_failure', True)
+        journey['think'] = ThinkTime(journey.get('think_time', default_think))
+        for step in journey['steps']:
+            if 'path' not in step:
+                raise ValueError(f"A step of journey {journey['name']!r} has no path")
+            step.setdefault('method', 'GET')
+            step.setdefault('name', f"{step['method']} {step['path']}")
+            step.setdefault('expect', [200, 201])
+            if 'payload_ref' in step:
+                step['payload'] = resolve_payload_ref(step['payload_ref'])
+    return scenario
+
+
+class JourneyStats:
+    """Per-journey and per-step latency histograms shared by all virtual users"""
+
+    def __init__(self, journeys: List[Dict[str, Any]]):
+        self.lock = threading.Lock()
+        self.journeys = {
+            journey['name']: {
+                'started': 0, 'completed': 0, 'failed': 0, 'cut': 0,
+                'latency': LatencyHistogram(),
+                'steps': {step['name']: {'histogram': LatencyHistogram(), 'failures': 0} for step in journey['steps']},
+            }
+            for journey in journeys
+        }
+
+    def record_journey(self, name: str, steps: List[tuple], outcome: str):
+        """Merge one journey's step timings; `outcome` is completed, failed or cut (stopped by the deadline)"""
+        with self.lock:
+            entry = self.journeys[name]
+            entry['started'] += 1
+            for step_name, latency, ok in steps:
+                step = entry['steps'][step_name]
+                step['histogram'].record(latency * 1000)
+                if not ok:
+                    step['failures'] += 1
+            if outcome == 'completed':
+                entry['completed'] += 1
+                # Journey latency is the time spent waiting on the API, excluding think time
+                entry['latency'].record(sum(latency for _, latency, _ in steps) * 1000)
+            else:
+                entry[outcome] += 1
+
+
+class ScenarioEngine:
+    """Virtual users pick journeys by weight and walk their steps with think time in between"""
+
+    def __init__(self, scenario: Dict[str, Any], base_url: str = BASE_URL, timeout: float = TIMEOUT):
+        self.scenario = scenario
+        self.journeys = scenario['journeys']
+        self.weights = [journey['weight'] for journey in self.journeys]
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def _step(self, session, step: Dict[str, Any]) -> tuple:
+        start_time = time.perf_counter()
+        try:
+            response = session.request(step['method'], f"{self.base_url}{step['path']}", json=step.get('payload'),
+                                       timeout=self.timeout)
+            ok = response.status_code in step['expect']
+        except requests.exceptions.RequestException:
+            ok = False
+        return step['name'], time.perf_counter() - start_time, ok
+
+    def _virtual_user(self, session, stats: JourneyStats, start_delay: float, deadline: float):
+        time.sleep(start_delay)
+        while time.perf_counter() < deadline:
+            journey = random.choices(self.journeys, weights=self.weights)[0]
+            session.cookies.clear()  # Every journey is a fresh visit with its own login
+            steps, outcome = [], 'completed'
+            for index, step in enumerate(journey['steps']):
+                if index:
+                    pause = journey['think'].sample()
+                    if time.perf_counter() + pause >= deadline:
+                        outcome = 'cut'
+                        break
+                    time.sleep(pause)
+                result = self._step(session, step)
+                steps.append(result)
+                if not result[2] and journey['abort_on_failure']:
+                    outcome = 'failed'
+                    break
+            else:
+                if any(not ok for _, _, ok in steps):
+                    outcome = 'failed'
+            stats.record_journey(journey['name'], steps, outcome)
+            if outcome == 'cut':
+                return  # The next think time would outlast the run
+
+    def run(self, virtual_users: int = VIRTUAL_USERS, duration: float = DURATION, ramp_up: float = 0.0) -> Dict[str, Any]:
+        """Run `virtual_users` users for `duration` seconds, starting them evenly over `ramp_up` seconds"""
+        if virtual_users <= 0 or duration <= 0:
+            raise ValueError("Virtual users and duration must be positive")
+        stats = JourneyStats(self.journeys)
+        transport = create_session(max_per_host=virtual_users)
+        warm_up(transport, self.base_url, connections=min(virtual_users, 32))
+
+        start = time.perf_counter()
+        deadline = start + duration
+        threads = [threading.Thread(target=self._virtual_user, daemon=True,
+                                    args=(shared_transport_session(transport), stats,
+                                          ramp_up * i / virtual_users, deadline))
+                   for i in range(virtual_users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_time = time.perf_counter() - start
+
+        requests_sent = sum(len(step['histogram']) for journey in stats.journeys.values()
+                            for step in journey['steps'].values())
+        return {
+            'virtual_users': virtual_users,
+            'wall_time_s': round(wall_time, 3),
+            'requests_per_s': round(requests_sent / wall_time, 2) if wall_time > 0 else 0.0,
+            'journeys_per_s': round(sum(j['completed'] for j in stats.journeys.values()) / wall_time, 2)
+                              if wall_time > 0 else 0.0,
+            'journeys': stats.journeys,
+        }
+
+
+def print_scenario_report(report: Dict[str, Any]):
+    print(f"{report['virtual_users']} virtual users for {report['wall_time_s']}s: "
+          f"{report['journeys_per_s']} journeys/s, {report['requests_per_s']} req/s")
+    for name, journey in report['journeys'].items():
+        print(f"\n  {name}: {journey['started']} started, {journey['completed']} completed, {journey['failed']} failed"
+              + (f", {journey['cut']} cut off by the deadline" if journey['cut'] else ""))
+        if len(journey['latency']):
+            print(f"    journey: {format_summary(journey['latency'].summary())}")
+        for step_name, step in journey['steps'].items():
+            if not len(step['histogram']):
+                continue
+            print(f"    {step_name}: {format_summary(step['histogram'].summary())}"
+                  + (f", {step['failures']} failed" if step['failures'] else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run weighted Kairo user journeys with virtual users")
+    parser.add_argument("scenario", help="Scenario JSON file")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--users", type=int, default=VIRTUAL_USERS, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=DURATION)
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="Seconds over which virtual users start")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+
+    print("=" * 80)
+    print("KAIRO USER JOURNEY SCENARIOS")
+    print("=" * 80)
+    print(f"Testing against: {args.base_url}")
+    total_weight = sum(journey['weight'] for journey in scenario['journeys'])
+    for journey in scenario['journeys']:
+        print(f"  {journey['weight'] / total_weight * 100:5.1f}%  {journey['name']} ({len(journey['steps'])} steps)")
+    print("-" * 80)
+
+    report = ScenarioEngine(scenario, args.base_url).run(args.users, args.duration, args.ramp_up)
+    print_scenario_report(report)
+    print("=" * 80)
+    return 0 if all(journey['failed'] == 0 for journey in report['journeys'].values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
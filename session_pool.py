@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Pre-Authenticated Session Pool for Kairo API Testing
+Signs up or signs in N synthetic users concurrently and spreads authenticated traffic across their cookies
+
+Usage: python session_pool.py --users 500 --rate 200 --duration 30
+       python session_pool.py --users 1000 --run-id nightly --compare
+"""
+
+import argparse
+import itertools
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from http_client import POOL_MAXSIZE, create_session, shared_transport_session
+from latency_histogram import LatencyHistogram, format_summary
+from load_engine import LoadTarget, OpenLoopLoadEngine, format_report
+
+# Configuration
+BASE_URL = "http://localhost:3001"
+TIMEOUT = 30
+BUILD_CONCURRENCY = 16
+EMAIL_DOMAIN = "kairo.test"
+SYNTHETIC_PASSWORD = "LoadTest2025!"
+SESSION_COOKIE = "session-token"
+
+
+def synthetic_credentials(count: int, run_id: str, prefix: str = "loaduser") -> List[Dict[str, str]]:
+    """Deterministic per-run users, so a rerun with the same run id signs the same users back in"""
+    return [{'email': f"{prefix}.{run_id}.{i}@{EMAIL_DOMAIN}", 'password': SYNTHETIC_PASSWORD,
+             'name': f"Load User {i}"}
+            for i in range(count)]
+
+
+class SessionPool:
+    """Logged-in sessions for many distinct users, usable wherever a single session is expected
+
+    Every user gets its own cookie jar, but all of them share one keep-alive connection pool, so a pool of
+    thousands of users does not open thousands of sockets. `request`/`get`/`post`/... hand each call to the
+    next user in round-robin order.
+    """
+
+    def __init__(self, base_url: str = BASE_URL, max_per_host: int = POOL_MAXSIZE):
+        self.base_url = base_url.rstrip('/')
+        self.transport = create_session(max_per_host)
+        self.sessions: List[Any] = []
+        self.users: List[Dict[str, str]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def _authenticate(self, credentials: Dict[str, str]) -> Dict[str, Any]:
+        """Sign one user up (which also logs them in) or, if they already exist, sign them in"""
+        session = shared_transport_session(self.transport)
+        outcome = {'credentials': credentials, 'session': None, 'signup_s': None, 'signin_s': None, 'error': None}
+        try:
+            start_time = time.perf_counter()
+            response = session.post(f"{self.base_url}/api/auth/signup", json=credentials, timeout=TIMEOUT)
+            outcome['signup_s'] = time.perf_counter() - start_time
+            if response.status_code == 200 and session.cookies.get(SESSION_COOKIE):
+                outcome['session'] = session
+                return outcome
+
+            start_time = time.perf_counter()
+            response = session.post(f"{self.base_url}/api/auth/signin",
+                                    json={'email': credentials['email'], 'password': credentials['password']},
+                                    timeout=TIMEOUT)
+            outcome['signin_s'] = time.perf_counter() - start_time
+            if response.status_code == 200 and session.cookies.get(SESSION_COOKIE):
+                outcome['session'] = session
+            else:
+                outcome['error'] = f"signin HTTP {response.status_code}"
+        except requests.exceptions.RequestException as e:
+            outcome['error'] = type(e).__name__
+        return outcome
+
+    def build(self, credentials: List[Dict[str, str]], concurrency: int = BUILD_CONCURRENCY) -> Dict[str, Any]:
+        """Authenticate every user `concurrency` at a time and keep the sessions that got a cookie"""
+        signup_histogram = LatencyHistogram()
+        signin_histogram = LatencyHistogram()
+        errors: Dict[str, int] = {}
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='auth') as executor:
+            outcomes = list(executor.map(self._authenticate, credentials))
+        elapsed = time.perf_counter() - start
+
+        for outcome in outcomes:
+            if outcome['signup_s'] is not None:
+                signup_histogram.record(outcome['signup_s'] * 1000)
+            if outcome['signin_s'] is not None:
+                signin_histogram.record(outcome['signin_s'] * 1000)
+            if outcome['session'] is not None:
+                self.sessions.append(outcome['session'])
+                self.users.append(outcome['credentials'])
+            else:
+                errors[outcome['error']] = errors.get(outcome['error'], 0) + 1
+
+        return {
+            'requested': len(credentials),
+            'ready': len(self.sessions),
+            'errors': errors,
+            'elapsed_s': round(elapsed, 3),
+            'logins_per_s': round(len(self.sessions) / elapsed, 2) if elapsed > 0 else 0.0,
+            'signup_ms': signup_histogram.summary(),
+            'signin_ms': signin_histogram.summary(),
+        }
+
+    def next_session(self):
+        if not self.sessions:
+            raise RuntimeError("The session pool is empty; call build() first")
+        with self._lock:
+            index = next(self._counter)
+        return self.sessions[index % len(self.sessions)]
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    # requests.Session look-alike, so the pool can be passed anywhere a session is
+    def request(self, method: str, url: str, **kwargs):
+        return self.next_session().request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def delete(self, url: str, **kwargs):
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self):
+        for session in self.sessions:
+            session.close()
+        self.transport.close()
+
+
+def build_session_pool(base_url: str, users: int, run_id: Optional[str] = None,
+                       concurrency: int = BUILD_CONCURRENCY) -> Tuple[SessionPool, Dict[str, Any]]:
+    """Create and authenticate a pool of `users` synthetic users"""
+    pool = SessionPool(base_url)
+    report = pool.build(synthetic_credentials(users, run_id or format(int(time.time()), 'x')), concurrency)
+    return pool, report
+
+
+def print_build_report(report: Dict[str, Any]):
+    print(f"  {report['ready']}/{report['requested']} users authenticated in {report['elapsed_s']}s "
+          f"({report['logins_per_s']} logins/s)")
+    if report['signup_ms']['count']:
+        print(f"  signup: {format_summary(report['signup_ms'])}")
+    if report['signin_ms']['count']:
+        print(f"  signin: {format_summary(report['signin_ms'])}")
+    if report['errors']:
+        print(f"  ⚠️  Failed logins: {report['errors']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load /api/auth/me across many distinct authenticated users")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--run-id", help="Reuse the users of an earlier run instead of signing up new ones")
+    parser.add_argument("--build-concurrency", type=int, default=BUILD_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=100.0, help="Open-loop arrival rate for /api/auth/me")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--compare", action="store_true", help="Repeat the load with a single hot session")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("KAIRO SESSION POOL LOAD")
+    print("=" * 80)
+    print(f"Testing against: {args.base_url}")
+
+    print(f"\n🔐 Authenticating {args.users} synthetic users ({args.build_concurrency} at a time)")
+    pool, build_report = build_session_pool(args.base_url, args.users, args.run_id, args.build_concurrency)
+    print_build_report(build_report)
+    if not len(pool):
+        print("❌ No users could be authenticated")
+        return 1
+
+    targets = [LoadTarget("GET /api/auth/me", "GET", f"{args.base_url}/api/auth/me")]
+    runs = [(f"{len(pool)} distinct sessions", lambda: pool)]
+    if args.compare:
+        hot_session = pool.sessions[0]
+        runs.append(("1 hot session", lambda: hot_session))
+
+    all_ok = True
+    for title, session_factory in runs:
+        print(f"\n🌊 {args.rate} req/s for {args.duration}s across {title}")
+        report = OpenLoopLoadEngine(session_factory=session_factory).run(targets, args.rate, args.duration)
+        for line in format_report(report):
+            print(line)
+        all_ok = all_ok and report['overall']['ok'] == report['overall']['requests']
+
+    pool.close()
+    print("=" * 80)
+    return 0 if all_ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
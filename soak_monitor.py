@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Soak Leak Detection for Kairo API Testing
+Polls the server's metrics routes on a fixed interval during a soak and flags metrics that keep growing
+
+Usage: python soak_monitor.py --duration 3600 --interval 10
+       python load_profiles.py soak --rate 50 --duration 14400 --monitor-interval 15
+
+Every numeric field of /api/monitoring/metrics and /api/performance/metrics becomes a time series (heap,
+RSS, external memory, connections and whatever custom metrics the routes add). Neither route reports
+event-loop delay, so the response time of each poll is kept as well: both handlers are trivially cheap, and
+a blocked or congested event loop shows up as their latency creeping up. Growth is tested with Mann-Kendall
+(a monotonic trend regardless of its shape) and sized with the Theil-Sen slope, both robust to the GC
+sawtooth a heap series has.
+
+/api/monitoring/metrics sits behind rateLimiters.general, which allows 100 requests per 15 minutes per IP and
+is shared with /api/health (src/lib/security.ts). The poller uses at most RATE_LIMIT_SHARE of that budget, so
+the route is polled every 15s at the most. A 429 is counted as rate-limited rather than as an error, and the
+route is left alone until its Retry-After has passed. /api/performance/metrics has no limiter and is polled on
+every tick.
+"""
+
+import argparse
+import math
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from http_client import create_session, warm_up
+
+# Configuration
+BASE_URL = "http://localhost:3001"
+TIMEOUT = 10
+INTERVAL = 10.0
+DURATION = 3600.0
+METRIC_ENDPOINTS = {'monitoring': 'monitoring/metrics', 'performance': 'performance/metrics'}
+RATE_LIMITED_ENDPOINTS = {'monitoring'}   # Behind rateLimiters.general, like /api/health
+RATE_LIMIT = 100                          # Requests per window per IP
+RATE_LIMIT_WINDOW = 900.0                 # Seconds
+RATE_LIMIT_SHARE = 0.6                    # The rest is left to health checks and circuit-breaker probes
+MIN_LIMITED_INTERVAL = RATE_LIMIT_WINDOW / (RATE_LIMIT * RATE_LIMIT_SHARE)
+ALPHA = 0.01                 # One-sided Mann-Kendall significance for an increasing trend
+MIN_GROWTH_PCT = 5.0         # Trends growing less than this over the whole run are not reported
+MIN_POINTS = 10
+EVENT_LOOP_MIN_GROWTH_MS = 10.0   # Poll latency drifting by less than this is network noise, not a blocked loop
+MAX_TREND_POINTS = 400       # Longer series are reduced to bucket medians before the O(n²) tests
+
+# Fields that only ever increase (counters and clocks), never a leak
+CUMULATIVE_FIELDS = ('uptime', 'cpu.user', 'cpu.system', 'throughput', 'requests', 'timestamp')
+
+# Kind of a series by its name, first match wins; growth in a leak kind fails the soak
+METRIC_KINDS = [('event_loop', ('eventloop', 'looplag', 'loopdelay', 'poll_ms')),
+                ('heap', ('heapused', 'heaptotal', 'memoryusage')),
+                ('rss', ('rss',)),
+                ('external', ('external', 'arraybuffers')),
+                ('connections', ('connections',))]
+LEAK_KINDS = {'event_loop', 'heap', 'rss', 'external'}
+
+
+def is_cumulative(name: str) -> bool:
+    return name.endswith(CUMULATIVE_FIELDS)
+
+
+def metric_kind(name: str) -> str:
+    lowered = name.lower()
+    for kind, patterns in METRIC_KINDS:
+        if any(pattern in lowered for pattern in patterns):
+            return kind
+    return 'custom'
+
+
+def flatten_metrics(data: Any, prefix: str) -> Dict[str, float]:
+    """Numeric leaves of nested objects as dotted names; arrays (history, recommendations) are skipped"""
+    metrics = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            name = f"{prefix}.{key}"
+            if isinstance(value, dict):
+                metrics.update(flatten_metrics(value, name))
+            elif type(value) is int or type(value) is float:
+                if math.isfinite(value):
+                    metrics[name] = float(value)
+    return metrics
+
+
+def _downsample(times: List[float], values: List[float], limit: int) -> Tuple[List[float], List[float]]:
+    """Medians of `limit` consecutive buckets, which keeps the trend and drops the sawtooth"""
+    if len(values) <= limit:
+        return times, values
+    out_times, out_values = [], []
+    for bucket in range(limit):
+        lo = bucket * len(values) // limit
+        hi = (bucket + 1) * len(values) // limit
+        chunk = sorted(values[lo:hi])
+        out_times.append(sum(times[lo:hi]) / (hi - lo))
+        out_values.append(chunk[len(chunk) // 2] if len(chunk) % 2 else (chunk[len(chunk) // 2 - 1] +
+                                                                         chunk[len(chunk) // 2]) / 2)
+    return out_times, out_values
+
+
+def mann_kendall(values: List[float]) -> Dict[str, float]:
+    """Mann-Kendall trend test: S statistic, tie-corrected normal score z and one-sided p for an increase"""
+    n = len(values)
+    s = 0
+    for i in range(n - 1):
+        current = values[i]
+        for later in values[i + 1:]:
+            s += (later > current) - (later < current)
+
+    ties: Dict[float, int] = {}
+    for value in values:
+        ties[value] = ties.get(value, 0) + 1
+    variance = (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in ties.values() if t > 1)) / 18.0
+
+    if variance <= 0 or s == 0:
+        z = 0.0
+    else:
+        z = (s - 1 if s > 0 else s + 1) / math.sqrt(variance)
+    return {'s': s, 'z': z, 'p_increasing': 0.5 * math.erfc(z / math.sqrt(2))}
+
+
+def theil_sen_slope(times: List[float], values: List[float]) -> Tuple[float, float]:
+    """Median of all pairwise slopes, and the matching intercept (median of value - slope * time)"""
+    slopes = sorted((values[j] - values[i]) / (times[j] - times[i])
+                    for i in range(len(values) - 1) for j in range(i + 1, len(values)) if times[j] != times[i])
+    if not slopes:
+        return 0.0, values[0] if values else 0.0
+    middle = len(slopes) // 2
+    slope = slopes[middle] if len(slopes) % 2 else (slopes[middle - 1] + slopes[middle]) / 2
+    offsets = sorted(value - slope * t for t, value in zip(times, values))
+    middle = len(offsets) // 2
+    intercept = offsets[middle] if len(offsets) % 2 else (offsets[middle - 1] + offsets[middle]) / 2
+    return slope, intercept
+
+
+def analyze_series(times: List[float], values: List[float], alpha: float = ALPHA,
+                   min_growth_pct: float = MIN_GROWTH_PCT) -> Optional[Dict[str, Any]]:
+    """Trend of one series; None while it is too short to test"""
+    if len(values) < MIN_POINTS:
+        return None
+    times, values = _downsample(times, values, MAX_TREND_POINTS)
+    test = mann_kendall(values)
+    slope, intercept = theil_sen_slope(times, values)
+    start_level = intercept + slope * times[0]
+    growth = slope * (times[-1] - times[0])
+    growth_pct = growth / abs(start_level) * 100 if start_level else (math.inf if growth > 0 else 0.0)
+    return {
+        'points': len(values),
+        'start': start_level,
+        'end': intercept + slope * times[-1],
+        'slope_per_hour': slope * 3600,
+        'growth_pct': growth_pct,
+        'z': round(test['z'], 2),
+        'p': test['p_increasing'],
+        'growing': test['p_increasing'] < alpha and slope > 0 and growth_pct >= min_growth_pct,
+    }
+
+
+class MetricsPoller:
+    """Background thread polling the metrics routes on a fixed schedule and keeping every numeric field"""
+
+    def __init__(self, base_url: str = BASE_URL, session: requests.Session = None, interval: float = INTERVAL,
+                 endpoints: Dict[str, str] = None, timeout: float = TIMEOUT):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.base_url = base_url.rstrip('/')
+        self.session = session or create_session()
+        self.interval = interval
+        self.endpoints = endpoints or METRIC_ENDPOINTS
+        self.timeout = timeout
+        self.series: Dict[str, Tuple[List[float], List[float]]] = {}
+        self.polls = 0
+        self.missed = 0
+        self.errors: Dict[str, int] = {name: 0 for name in self.endpoints}
+        self.rate_limited: Dict[str, int] = {name: 0 for name in self.endpoints}
+        # Rate-limited routes are polled no more often than the limiter's budget allows
+        self.limited_interval = {name: max(interval, MIN_LIMITED_INTERVAL)
+                                 for name in self.endpoints if name in RATE_LIMITED_ENDPOINTS}
+        self._next_allowed: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start = 0.0
+
+    def _record(self, name: str, offset: float, value: float):
+        times, values = self.series.setdefault(name, ([], []))
+        times.append(offset)
+        values.append(value)
+
+    def poll_once(self):
+        """One sample of every endpoint, stamped with seconds since the poller started"""
+        for name, endpoint in self.endpoints.items():
+            start_time = time.perf_counter()
+            if start_time < self._next_allowed.get(name, 0.0):
+                continue
+            if name in self.limited_interval:
+                self._next_allowed[name] = start_time + self.limited_interval[name]
+            try:
+                response = self.session.get(f"{self.base_url}/api/{endpoint}", timeout=self.timeout)
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                if response.status_code == 429:
+                    self._back_off(name, response, start_time)
+                    continue
+                data = response.json().get('data') if response.status_code == 200 else None
+            except (requests.exceptions.RequestException, ValueError, AttributeError):
+                data, elapsed_ms = None, None
+            offset = start_time - self._start
+            with self._lock:
+                if not isinstance(data, dict):
+                    self.errors[name] += 1
+                    continue
+                self._record(f"client.poll_ms.{name}", offset, elapsed_ms)
+                for metric, value in flatten_metrics(data, name).items():
+                    self._record(metric, offset, value)
+        self.polls += 1
+
+    def _back_off(self, name: str, response: requests.Response, now: float):
+        """Count a 429 and skip the route until the limiter's window has reset"""
+        try:
+            retry_after = float(response.headers.get('Retry-After', ''))
+        except ValueError:
+            retry_after = RATE_LIMIT_WINDOW
+        with self._lock:
+            self.rate_limited[name] += 1
+        self._next_allowed[name] = now + max(retry_after, self.limited_interval.get(name, self.interval))
+
+    def notes(self) -> List[str]:
+        """Why some polled series have gaps: polling slowed down for a rate limit, or 429s"""
+        lines = [f"{self.endpoints[name]} polled every {interval:g}s at most (server limit {RATE_LIMIT} requests "
+                 f"per {RATE_LIMIT_WINDOW / 60:g} min per IP, shared with /api/health)"
+                 for name, interval in self.limited_interval.items() if interval > self.interval]
+        with self._lock:
+            lines += [f"⚠️  {self.endpoints[name]} was rate-limited (HTTP 429) {count}x; its metrics are missing "
+                      f"until the limit resets" for name, count in self.rate_limited.items() if count]
+        return lines
+
+    def _run(self):
+        tick = 0
+        while not self._stop.is_set():
+            due = self._start + tick * self.interval
+            wait = due - time.perf_counter()
+            if wait > 0 and self._stop.wait(wait):
+                break
+            self.poll_once()
+            # Ticks that passed while a slow poll was in flight are skipped, not bunched together
+            next_tick = max(tick + 1, math.ceil((time.perf_counter() - self._start) / self.interval))
+            self.missed += next_tick - tick - 1
+            tick = next_tick
+
+    def start(self, origin: float = None) -> 'MetricsPoller':
+        """Start polling; sample times count from `origin` (a perf_counter value, default now)"""
+        self._start = time.perf_counter() if origin is None else origin
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def snapshot(self) -> Dict[str, Tuple[List[float], List[float]]]:
+        """Copy of every series as (seconds since origin, values), safe to read while polling continues"""
+        with self._lock:
+            return {name: (list(times), list(values)) for name, (times, values) in self.series.items()}
+
+    def analyze(self, alpha: float = ALPHA, min_growth_pct: float = MIN_GROWTH_PCT) -> Dict[str, Any]:
+        """Trend of every series; leak kinds that grow are suspects, other growing metrics are reported"""
+        series = self.snapshot()
+        trends = {}
+        for name, (times, values) in sorted(series.items()):
+            if is_cumulative(name):
+                continue
+            trend = analyze_series(times, values, alpha, min_growth_pct)
+            if trend is not None:
+                trend['kind'] = metric_kind(name)
+                if trend['kind'] == 'event_loop' and trend['end'] - trend['start'] < EVENT_LOOP_MIN_GROWTH_MS:
+                    trend['growing'] = False
+                trends[name] = trend
+        return {
+            'polls': self.polls,
+            'missed_polls': self.missed,
+            'errors': dict(self.errors),
+            'rate_limited': dict(self.rate_limited),
+            'notes': self.notes(),
+            'series': len(trends),
+            'trends': trends,
+            'suspects': [name for name, trend in trends.items() if trend['growing'] and trend['kind'] in LEAK_KINDS],
+            'growing': [name for name, trend in trends.items()
+                        if trend['growing'] and trend['kind'] not in LEAK_KINDS],
+        }
+
+
+# Fields process.memoryUsage() reports in bytes
+BYTE_FIELDS = ('heapUsed', 'heapTotal', 'rss', 'external', 'arrayBuffers')
+
+
+def _format_value(name: str, value: float) -> str:
+    if name.rsplit('.', 1)[-1] in BYTE_FIELDS:
+        return f"{value / (1024 * 1024):.1f}MB"
+    return f"{value:.2f}"
+
+
+def format_leak_report(analysis: Dict[str, Any]) -> List[str]:
+    lines = [f"{analysis['polls']} polls, {analysis['series']} series"
+             + (f", {analysis['missed_polls']} missed ticks" if analysis['missed_polls'] else "")
+             + "".join(f", {name} failed {count}x" for name, count in analysis['errors'].items() if count)]
+    lines.extend(f"  {note}" for note in analysis.get('notes', []))
+    if not analysis['trends']:
+        lines.append(f"  Not enough samples for a trend test (need {MIN_POINTS} polls)")
+        return lines
+
+    for name in analysis['suspects'] + analysis['growing']:
+        trend = analysis['trends'][name]
+        marker = "⚠️  Leak suspect" if name in analysis['suspects'] else "📈 Growing"
+        lines.append(f"  {marker}: {name} ({trend['kind']}) {_format_value(name, trend['start'])} -> "
+                     f"{_format_value(name, trend['end'])}, +{trend['growth_pct']:.1f}%, "
+                     f"{_format_value(name, trend['slope_per_hour'])}/h, z={trend['z']}, p={trend['p']:.2g}")
+    if not analysis['suspects'] and not analysis['growing']:
+        lines.append("  ✅ No metric shows monotonic growth")
+    watched = [name for name, trend in analysis['trends'].items() if trend['kind'] in LEAK_KINDS]
+    lines.append(f"  Watched for leaks: {', '.join(watched) if watched else 'none of the polled fields'}")
+    return lines
+
+
+def main():
+    from comprehensive_backend_test import DEMO_CREDENTIALS
+
+    parser = argparse.ArgumentParser(description="Watch Kairo server metrics for monotonic growth during a soak")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--interval", type=float, default=INTERVAL, help="Seconds between polls")
+    parser.add_argument("--duration", type=float, default=DURATION, help="Seconds to watch")
+    parser.add_argument("--alpha", type=float, default=ALPHA, help="Significance of the trend test")
+    parser.add_argument("--min-growth", type=float, default=MIN_GROWTH_PCT, help="Smallest growth (%%) reported")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("KAIRO SOAK LEAK DETECTION")
+    print("=" * 80)
+    print(f"Watching: {args.base_url} every {args.interval}s for {args.duration}s")
+    print("-" * 80)
+
+    session = create_session()
+    warm_up(session, args.base_url)
+    try:
+        # /api/performance/metrics needs a session
+        session.post(f"{args.base_url}/api/auth/signin", json=DEMO_CREDENTIALS, timeout=TIMEOUT)
+    except requests.exceptions.RequestException:
+        pass
+
+    poller = MetricsPoller(args.base_url, session, args.interval).start()
+    try:
+        time.sleep(args.duration)
+    except KeyboardInterrupt:
+        pass
+    poller.stop()
+
+    analysis = poller.analyze(args.alpha, args.min_growth)
+    for line in format_leak_report(analysis):
+        print(line)
+    print("=" * 80)
+    return 0 if not analysis['suspects'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Dependency-Aware Parallel Check Runner for Kairo API Testing
+Runs checks as soon as the checks they depend on have finished, so a suite takes as long as its critical path
+
+Checks are plain callables keyed by name. Independent ones share a thread pool; a check that raises is
+recorded as an error and its dependents still run, since the testers' own checks already skip themselves
+when what they need (e.g. the demo login) is missing.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List
+
+# Configuration
+MAX_WORKERS = 16          # Enough for every check that does not wait on the login to start at once
+
+
+class TaskGraph:
+    """Named checks and the checks each one has to wait for"""
+
+    def __init__(self):
+        self.tasks: Dict[str, Callable[[], Any]] = {}
+        self.depends_on: Dict[str, List[str]] = {}
+
+    def add(self, name: str, fn: Callable[[], Any], depends_on: Iterable[str] = ()):
+        if name in self.tasks:
+            raise ValueError(f"Duplicate check: {name}")
+        self.tasks[name] = fn
+        self.depends_on[name] = list(depends_on)
+
+    def order(self) -> List[str]:
+        """Names in an order that respects every dependency; raises on unknown names and cycles"""
+        for name, dependencies in self.depends_on.items():
+            unknown = [dependency for dependency in dependencies if dependency not in self.tasks]
+            if unknown:
+                raise ValueError(f"{name} depends on unknown checks: {unknown}")
+
+        ordered, state = [], {}
+
+        def visit(name: str, path: List[str]):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Dependency cycle: {' -> '.join(path + [name])}")
+            state[name] = 'visiting'
+            for dependency in self.depends_on[name]:
+                visit(dependency, path + [name])
+            state[name] = 'done'
+            ordered.append(name)
+
+        for name in self.tasks:
+            visit(name, [])
+        return ordered
+
+    def _timed(self, name: str, origin: float) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+        entry = {'result': None, 'error': None}
+        try:
+            entry['result'] = self.tasks[name]()
+        except Exception as e:
+            entry['error'] = f"{type(e).__name__}: {e}"
+        end_time = time.perf_counter()
+        entry.update({'start_s': start_time - origin, 'end_s': end_time - origin, 'duration_s': end_time - start_time})
+        return entry
+
+    def run(self, max_workers: int = MAX_WORKERS) -> Dict[str, Any]:
+        """Run every check, each once all its dependencies have finished; report timings and the critical path"""
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        order = self.order()
+        waiting = {name: set(self.depends_on[name]) for name in order}
+        dependents: Dict[str, List[str]] = {name: [] for name in order}
+        for name in order:
+            for dependency in self.depends_on[name]:
+                dependents[dependency].append(name)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        origin = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='check') as executor:
+            running = {}
+
+            def submit_ready():
+                for name in [name for name in order if name in waiting and not waiting[name]]:
+                    del waiting[name]
+                    running[executor.submit(self._timed, name, origin)] = name
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    for dependent in dependents[name]:
+                        waiting[dependent].discard(name)
+                submit_ready()
+        wall_time = time.perf_counter() - origin
+
+        # Longest chain of measured durations through the dependency graph
+        finish: Dict[str, float] = {}
+        via: Dict[str, str] = {}
+        for name in order:
+            before = max(self.depends_on[name], key=lambda dependency: finish[dependency], default=None)
+            finish[name] = results[name]['duration_s'] + (finish[before] if before else 0.0)
+            if before:
+                via[name] = before
+        path = []
+        name = max(finish, key=finish.get) if finish else None
+        while name:
+            path.append(name)
+            name = via.get(name)
+
+        return {
+            'workers': max_workers,
+            'wall_time_s': wall_time,
+            'serial_time_s': sum(entry['duration_s'] for entry in results.values()),
+            'critical_path': path[::-1],
+            'critical_path_s': finish[path[0]] if path else 0.0,
+            'tasks': results,
+        }
+
+
+def format_graph_report(report: Dict[str, Any]) -> List[str]:
+    serial, wall = report['serial_time_s'], report['wall_time_s']
+    lines = [f"{len(report['tasks'])} checks on {report['workers']} workers: {wall:.2f}s wall clock, "
+             f"{serial:.2f}s if run one after another ({serial / wall if wall > 0 else 0:.1f}x)",
+             f"Critical path {report['critical_path_s']:.2f}s: {' → '.join(report['critical_path'])}"]
+    for name, entry in report['tasks'].items():
+        if entry['error']:
+            lines.append(f"  ❌ {name} raised {entry['error']}")
+    return lines
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Traffic Record and Replay for Kairo API Testing
+Turns server request logs or NDJSON captures into a replayable trace and re-issues it with the original timing
+
+Usage: python traffic_replay.py record server.log -o trace.ndjson
+       python traffic_replay.py record capture.ndjson -o trace.ndjson
+       python traffic_replay.py replay trace.ndjson --base-url http://localhost:3001 --speed 2 --login
+
+Trace format: one JSON object per line with offset (seconds from the first request), method, path, payload,
+and the originally observed status and duration_ms when the source had them.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+from http_client import clone_session, create_session
+from load_engine import MAX_IN_FLIGHT, TIMEOUT, LoadTarget, OpenLoopLoadEngine, SampleStats, Send, format_report
+
+# Configuration
+BASE_URL = "http://localhost:3001"
+LOG_INTERVAL = 0.1       # Spacing given to server.log lines, which carry no timestamps of their own
+
+# Next.js request lines, e.g. " POST /api/quantum-simulation 200 in 812ms", optionally prefixed by a timestamp
+LOG_LINE = re.compile(r"^(?:\[?(?P<ts>\d{4}-\d{2}-\d{2}[T ][\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)\]?\s*)?\s*"
+                      r"(?P<method>GET|POST|PUT|PATCH|DELETE)\s+(?P<path>/\S*)\s+(?P<status>\d{3})"
+                      r"(?:\s+in\s+(?P<duration>[\d.]+)ms)?")
+
+TraceEntry = Dict[str, Any]
+
+
+def _parse_timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds from epoch seconds, epoch milliseconds or an ISO-8601 string"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value / 1000.0 if value > 1e11 else float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def catalog_payloads() -> Dict[str, Dict[str, Any]]:
+    """Known request bodies by route, used for POSTs whose source log did not capture the body"""
+    import comprehensive_backend_test
+    payloads = {f"/api/{endpoint}": payload
+                for _, method, endpoint, payload, _ in comprehensive_backend_test.ENDPOINT_CATALOG if payload}
+    import backend_test
+    for endpoint, payload, _ in backend_test.GOD_TIER_ENDPOINTS:
+        payloads.setdefault(f"/api/{endpoint}", payload)
+    return payloads
+
+
+def parse_server_log(lines: Iterable[str], interval: float = LOG_INTERVAL) -> List[TraceEntry]:
+    """Trace entries from Next.js server output; lines without a timestamp are spaced `interval` apart"""
+    payloads = catalog_payloads()
+    entries = []
+    clock = 0.0
+    for line in lines:
+        match = LOG_LINE.match(line)
+        if not match or not match.group('path').startswith('/api/'):
+            continue  # Page loads, compile messages and app logging
+        timestamp = _parse_timestamp(match.group('ts'))
+        if timestamp is None:
+            timestamp = clock
+            clock += interval
+        path = match.group('path')
+        method = match.group('method')
+        entries.append({
+            'timestamp': timestamp,
+            'method': method,
+            'path': path,
+            'payload': payloads.get(path.split('?', 1)[0]) if method != 'GET' else None,
+            'status': int(match.group('status')),
+            'duration_ms': float(match.group('duration')) if match.group('duration') else None,
+        })
+    return entries
+
+
+def parse_ndjson(lines: Iterable[str]) -> List[TraceEntry]:
+    """Trace entries from an NDJSON capture with ts/timestamp, method, path or url, and body/payload per line"""
+    entries = []
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise ValueError(f"Line {number} is not valid JSON")
+        path = record.get('path') or record.get('url')
+        timestamp = _parse_timestamp(record.get('ts', record.get('timestamp')))
+        if not path or timestamp is None:
+            raise ValueError(f"Line {number} needs a path (or url) and a ts (or timestamp)")
+        if '://' in path:
+            path = '/' + path.split('://', 1)[1].split('/', 1)[-1]
+        entries.append({
+            'timestamp': timestamp,
+            'method': record.get('method', 'GET').upper(),
+            'path': path,
+            'payload': record.get('body', record.get('payload')),
+            'status': record.get('status'),
+            'duration_ms': record.get('duration_ms'),
+        })
+    return entries
+
+
+def build_trace(entries: List[TraceEntry]) -> List[TraceEntry]:
+    """Order entries by time and replace absolute timestamps with offsets from the first request"""
+    entries = sorted(entries, key=lambda entry: entry['timestamp'])
+    if not entries:
+        return []
+    origin = entries[0]['timestamp']
+    trace = []
+    for entry in entries:
+        entry = dict(entry)
+        entry['offset'] = round(entry.pop('timestamp') - origin, 6)
+        trace.append(entry)
+    return trace
+
+
+def record(source: str, output: str, fmt: str = 'auto', interval: float = LOG_INTERVAL) -> List[TraceEntry]:
+    """Convert a request log or NDJSON capture into a trace file"""
+    with open(source, encoding='utf-8', errors='replace') as f:
+        lines = f.readlines()
+    if fmt == 'auto':
+        first = next((line for line in lines if line.strip()), '')
+        fmt = 'ndjson' if first.lstrip().startswith('{') else 'log'
+    entries = parse_ndjson(lines) if fmt == 'ndjson' else parse_server_log(lines, interval)
+    trace = build_trace(entries)
+    save_trace(trace, output)
+    return trace
+
+
+def save_trace(trace: List[TraceEntry], path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        for entry in trace:
+            f.write(json.dumps(entry) + "\n")
+
+
+def load_trace(path: str) -> List[TraceEntry]:
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def route_label(entry: TraceEntry) -> str:
+    return f"{entry['method']} {entry['path'].split('?', 1)[0]}"
+
+
+class TraceReplayer(OpenLoopLoadEngine):
+    """Open-loop engine that takes its send times from a recorded trace instead of a fixed rate"""
+
+    def __init__(self, base_url: str = BASE_URL, speed: float = 1.0, **kwargs):
+        if speed <= 0:
+            raise ValueError("Speed factor must be positive")
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip('/')
+        self.speed = speed
+
+    def _target(self, entry: TraceEntry) -> LoadTarget:
+        # A replayed request is fine if it succeeds or reproduces a client error production answered;
+        # a recorded 5xx is never accepted, so a server failure that reproduces still counts as an error
+        recorded = entry.get('status')
+        expected = [200, 201] + ([recorded] if recorded and recorded < 500 else [])
+        return LoadTarget(route_label(entry), entry['method'], f"{self.base_url}{entry['path']}",
+                          entry.get('payload'), expected_status=expected)
+
+    def _sends(self, trace: Iterable[TraceEntry]) -> Iterator[Send]:
+        for entry in trace:
+            yield entry['offset'] / self.speed, self._target(entry), None
+
+    def replay(self, trace: List[TraceEntry]) -> Dict[str, Any]:
+        """Re-issue every request in the trace at its original offset divided by the speed factor"""
+        if not trace:
+            raise ValueError("The trace is empty")
+
+        stats = SampleStats()
+        wall_start = time.perf_counter()
+        asyncio.run(self._dispatch(self._sends(trace), lambda sample, _: stats.record(sample),
+                                   thread_name_prefix='replay'))
+        wall_time = time.perf_counter() - wall_start
+
+        span = trace[-1]['offset'] / self.speed
+        offered = round(len(trace) / span, 2) if span > 0 else float(len(trace))
+        report = stats.report(offered, wall_time)
+        report['speed'] = self.speed
+        report['max_start_lag_ms'] = round(stats.max_start_lag * 1000, 2)
+        return report
+
+
+def login_session(base_url: str) -> requests.Session:
+    """Pooled session signed in with the demo account, for traces that hit authenticated routes"""
+    from comprehensive_backend_test import DEMO_CREDENTIALS
+    session = create_session()
+    try:
+        session.post(f"{base_url}/api/auth/signin", json=DEMO_CREDENTIALS, timeout=TIMEOUT)
+    except requests.exceptions.RequestException:
+        pass  # Authenticated routes will show up as errors in the report
+    return session
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay Kairo API traffic")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help="Convert a request log into a trace")
+    record_parser.add_argument('source', help="server.log or an NDJSON capture")
+    record_parser.add_argument('-o', '--output', default='trace.ndjson')
+    record_parser.add_argument('--format', choices=['auto', 'log', 'ndjson'], default='auto')
+    record_parser.add_argument('--log-interval', type=float, default=LOG_INTERVAL,
+                               help="Seconds between server.log lines that have no timestamp")
+
+    replay_parser = subparsers.add_parser('replay', help="Re-issue a trace against a base URL")
+    replay_parser.add_argument('trace')
+    replay_parser.add_argument('--base-url', default=BASE_URL)
+    replay_parser.add_argument('--speed', type=float, default=1.0, help="2 replays twice as fast, 0.5 at half speed")
+    replay_parser.add_argument('--max-in-flight', type=int, default=MAX_IN_FLIGHT)
+    replay_parser.add_argument('--login', action='store_true', help="Sign in with the demo account first")
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        trace = record(args.source, args.output, args.format, args.log_interval)
+        if not trace:
+            print(f"No API requests found in {args.source}; {args.output} is empty")
+            return 1
+        routes = sorted({route_label(entry) for entry in trace})
+        span = trace[-1]['offset']
+        print(f"Recorded {len(trace)} requests over {span:.1f}s across {len(routes)} routes to {args.output}")
+        for route in routes:
+            print(f"  {route}: {sum(1 for entry in trace if route_label(entry) == route)}")
+        return 0
+
+    if args.speed <= 0:
+        parser.error("--speed must be positive")
+    trace = load_trace(args.trace)
+    if not trace:
+        print(f"{args.trace} has no requests to replay; record a trace from a log with /api requests first")
+        return 1
+    print("=" * 80)
+    print("KAIRO TRAFFIC REPLAY")
+    print("=" * 80)
+    print(f"Replaying {len(trace)} requests from {args.trace} against {args.base_url} at {args.speed}x")
+
+    if args.login:
+        login = login_session(args.base_url)
+        session_factory = lambda: clone_session(login)
+    else:
+        session_factory = create_session
+    replayer = TraceReplayer(args.base_url, args.speed, session_factory=session_factory,
+                             max_in_flight=args.max_in_flight)
+    report = replayer.replay(trace)
+
+    print("-" * 80)
+    for line in format_report(report):
+        print(line)
+    print(f"Timing fidelity: sends started at most {report['max_start_lag_ms']}ms after their recorded offset")
+    print("=" * 80)
+    overall = report['overall']
+    return 0 if overall['ok'] == overall['requests'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
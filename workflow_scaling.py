@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Workflow-Size Scaling Benchmark for Kairo API Testing
+Sends generated workflows of growing size to the workflow routes and fits linear, n log n and quadratic latency curves
+
+Usage: python workflow_scaling.py
+       python workflow_scaling.py --sizes 10,100,1000,10000 --repeats 7 --routes quantum-simulation
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from backend_test import BASE_URL, HIPAA_COMPLIANCE_PAYLOAD, QUANTUM_SIMULATION_PAYLOAD
+from http_client import create_session, warm_up
+from latency_histogram import LatencyHistogram
+
+# Configuration
+TIMEOUT = 120
+SIZES = [10, 100, 1000, 10000]
+REPEATS = 5
+EXTRA_EDGE_RATIO = 0.3       # Edges beyond the spanning tree, as a fraction of the node count
+FLAT_GROWTH = 1.5            # Less than 1.5x latency growth across all sizes counts as size-independent
+SUPERLINEAR_EXPONENT = 1.3   # A log-log slope above this between the two largest sizes is flagged
+MAX_FAILURE_SHARE = 0.5      # Sizes where more than half the requests fail are left out of the fit
+
+NODE_TYPES = [('data_input', 'healthcare'), ('data_processor', 'quantum'), ('ml_predictor', 'ai'),
+              ('data_transform', 'healthcare'), ('compliance', 'security'), ('api_call', 'integration'),
+              ('condition', 'logic'), ('result_aggregator', 'output')]
+
+# Complexity models: name -> g(n), fitted as latency = a + b * g(n)
+MODELS: Dict[str, Callable[[float], float]] = {
+    'linear': lambda n: n,
+    'n log n': lambda n: n * math.log2(n),
+    'quadratic': lambda n: n * n,
+}
+
+
+def generate_workflow(node_count: int, seed: int = 0, workflow_id: str = None) -> Dict[str, Any]:
+    """Connected DAG of `node_count` nodes: a random spanning tree plus extra forward edges"""
+    rng = random.Random(seed)
+    nodes = []
+    for i in range(node_count):
+        node_type, category = NODE_TYPES[rng.randrange(len(NODE_TYPES))]
+        nodes.append({
+            'id': f"node_{i}",
+            'type': node_type,
+            'category': category,
+            'data': {'label': f"{node_type.replace('_', ' ').title()} {i}"},
+            'position': {'x': (i % 50) * 220, 'y': (i // 50) * 140},
+            'config': {'contains_phi': category == 'healthcare'},
+        })
+
+    edges = [{'id': f"edge_{i}", 'source': f"node_{rng.randrange(i)}", 'target': f"node_{i}", 'type': 'default'}
+             for i in range(1, node_count)]
+    for _ in range(int(node_count * EXTRA_EDGE_RATIO) if node_count > 2 else 0):
+        source = rng.randrange(node_count - 1)
+        target = rng.randrange(source + 1, node_count)
+        edges.append({'id': f"edge_{len(edges) + 1}", 'source': f"node_{source}", 'target': f"node_{target}",
+                      'type': 'default'})
+
+    return {'id': workflow_id or f"workflow_scale_{node_count}_{seed}", 'name': f"Scaling Workflow {node_count}",
+            'nodes': nodes, 'edges': edges}
+
+
+# How each route takes its workflow
+ROUTE_PAYLOADS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    'quantum-simulation': lambda workflow: {'workflowData': workflow,
+                                            'simulationParams': QUANTUM_SIMULATION_PAYLOAD['simulationParams']},
+    'hipaa-compliance': lambda workflow: {'workflowData': workflow,
+                                          'complianceLevel': HIPAA_COMPLIANCE_PAYLOAD['complianceLevel']},
+    'reality-fabricator': lambda workflow: {'workflowData': workflow,
+                                            'fabricationParams': {'scenario_count': 5, 'timeline_depth': 3}},
+}
+
+
+def fit_model(sizes: List[float], latencies: List[float], g: Callable[[float], float]) -> Dict[str, float]:
+    """Least-squares fit of latency = a + b * g(n), with its coefficient of determination"""
+    xs = [g(n) for n in sizes]
+    count = len(xs)
+    mean_x = sum(xs) / count
+    mean_y = sum(latencies) / count
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, latencies))
+    slope = sxy / sxx if sxx else 0.0
+    intercept = mean_y - slope * mean_x
+    ss_res = sum((y - (intercept + slope * x)) ** 2 for x, y in zip(xs, latencies))
+    ss_tot = sum((y - mean_y) ** 2 for y in latencies)
+    return {'intercept_ms': intercept, 'slope': slope, 'r2': 1.0 - ss_res / ss_tot if ss_tot else 1.0}
+
+
+def classify_growth(sizes: List[int], latencies: List[float]) -> Dict[str, Any]:
+    """Fit every complexity model and pick the one that explains the measured curve best"""
+    fits = {name: fit_model(sizes, latencies, g) for name, g in MODELS.items()}
+    growth = latencies[-1] / latencies[0] if latencies[0] > 0 else float('inf')
+    # Empirical exponent between the two largest sizes, where fixed per-request overhead matters least
+    exponent = (math.log(latencies[-1] / latencies[-2]) / math.log(sizes[-1] / sizes[-2])
+                if len(sizes) >= 2 and latencies[-2] > 0 and latencies[-1] > 0 else None)
+
+    if growth < FLAT_GROWTH:
+        best = 'flat'
+    else:
+        # A negative slope cannot describe a growing curve, whatever its R² says
+        candidates = {name: fit for name, fit in fits.items() if fit['slope'] > 0}
+        best = max(candidates, key=lambda name: candidates[name]['r2']) if candidates else 'flat'
+    return {
+        'fits': fits,
+        'best_fit': best,
+        'growth': round(growth, 2),
+        'exponent': round(exponent, 2) if exponent is not None else None,
+        'superlinear': best == 'quadratic' or (exponent is not None and exponent > SUPERLINEAR_EXPONENT),
+    }
+
+
+class WorkflowScalingBenchmark:
+    def __init__(self, base_url: str = BASE_URL, session: requests.Session = None, timeout: float = TIMEOUT):
+        self.base_url = base_url
+        self.session = session or create_session()
+        self.timeout = timeout
+
+    def time_route(self, route: str, size: int, repeats: int) -> Dict[str, Any]:
+        """Median latency of the successful requests among `repeats` carrying distinct `size`-node workflows
+
+        Failed requests (timeouts, 413s, dropped connections) are only counted: a timeout measures the client's
+        limit and a rejection measures how fast the server says no, neither how long the workflow took.
+        """
+        histogram = LatencyHistogram()
+        failures = 0
+        request_bytes = 0
+        for repeat in range(repeats):
+            # A fresh workflow every time, so response caches (reality-fabricator) cannot answer
+            workflow = generate_workflow(size, seed=repeat, workflow_id=f"workflow_scale_{size}_{repeat}_{time.time_ns()}")
+            # Serialize before starting the clock: multi-megabyte bodies would otherwise time the client's encoder
+            body = json.dumps(ROUTE_PAYLOADS[route](workflow)).encode('utf-8')
+            request_bytes = len(body)
+            start_time = time.perf_counter()
+            try:
+                response = self.session.post(f"{self.base_url}/api/{route}", data=body,
+                                             headers={'Content-Type': 'application/json'}, timeout=self.timeout)
+                ok = response.status_code == 200
+            except requests.exceptions.RequestException:
+                ok = False
+            if ok:
+                histogram.record((time.perf_counter() - start_time) * 1000)
+            else:
+                failures += 1
+        return {'size': size, 'p50_ms': histogram.percentile(50) if histogram else None,
+                'max_ms': histogram.max_us / 1000.0 if histogram else None, 'failures': failures,
+                'request_bytes': request_bytes, 'usable': failures <= repeats * MAX_FAILURE_SHARE and bool(histogram)}
+
+    def run(self, routes: List[str], sizes: List[int] = SIZES, repeats: int = REPEATS,
+            on_point: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        results = {}
+        for route in routes:
+            points = []
+            for size in sizes:
+                point = self.time_route(route, size, repeats)
+                points.append(point)
+                if on_point:
+                    on_point(route, point)
+            usable = [point for point in points if point['usable']]
+            analysis = (classify_growth([p['size'] for p in usable], [p['p50_ms'] for p in usable])
+                        if len(usable) >= 3 else None)
+            results[route] = {'points': points, 'analysis': analysis}
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kairo workflow-size scaling benchmark")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES), help="Comma-separated node counts")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="Requests per route and size")
+    parser.add_argument("--routes", default=",".join(ROUTE_PAYLOADS), help="Comma-separated routes")
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+    routes = [route.strip() for route in args.routes.split(',')]
+    unknown = [route for route in routes if route not in ROUTE_PAYLOADS]
+    if unknown:
+        parser.error(f"Unknown routes: {', '.join(unknown)}")
+
+    print("=" * 80)
+    print("KAIRO WORKFLOW-SIZE SCALING BENCHMARK")
+    print("=" * 80)
+    print(f"Testing against: {args.base_url}")
+    print(f"Sizes: {sizes} nodes, {args.repeats} requests each")
+
+    benchmark = WorkflowScalingBenchmark(args.base_url)
+    warm_up(benchmark.session, args.base_url)
+
+    def on_point(route, point):
+        timing = (f"p50 {point['p50_ms']:>10.2f}ms, max {point['max_ms']:>10.2f}ms" if point['p50_ms'] is not None
+                  else f"{'no successful requests':<34}")
+        print(f"  {route:<22} {point['size']:>7} nodes: {timing}, request {point['request_bytes'] / 1024:>9.1f}KB"
+              + (f", {point['failures']} failed" if point['failures'] else "")
+              + ("" if point['usable'] else " (mostly failures, left out of the fit)"))
+
+    results = benchmark.run(routes, sizes, args.repeats, on_point)
+
+    print("-" * 80)
+    superlinear = []
+    for route, result in results.items():
+        analysis = result['analysis']
+        if analysis is None:
+            print(f"  {route}: not enough successful sizes to fit a curve")
+            continue
+        fits = ", ".join(f"{name} R²={fit['r2']:.3f}" for name, fit in analysis['fits'].items())
+        print(f"  {route}: best fit {analysis['best_fit']} ({fits}), {analysis['growth']}x growth, "
+              f"exponent {analysis['exponent']}")
+        if analysis['superlinear']:
+            superlinear.append(route)
+    if superlinear:
+        print(f"  ⚠️  Superlinear latency growth: {', '.join(superlinear)}")
+    print("=" * 80)
+    return 0 if not superlinear else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())